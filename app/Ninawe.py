@@ -7,26 +7,104 @@
 
 import os
 import ctypes
+import time
 
-os.system("mode con cols=128 lines=30")
-ctypes.windll.kernel32.SetConsoleTitleW(f"Ninawe Is Not A Windows Explorer - Shell")
+# Process start (startup stage times are counted from here)
+startupTime = time.perf_counter()
+
+# Widget processes (spawn) import this file again as __mp_main__, the console belongs to the shell
+if __name__ == "__main__":
+    os.system("mode con cols=128 lines=30")
+    ctypes.windll.kernel32.SetConsoleTitleW(f"Ninawe Is Not A Windows Explorer - Shell")
 
 import sys
+import importlib
+import multiprocessing
 from PyQt6.QtWidgets import QApplication
-from ui.desktop import DesktopWindow
-from ui.taskbar import Taskbar
-from ui.powermenu import PowerMenu
-from core.config import config as cfg
+from PyQt6.QtCore import QTimer
+from core.profiler import profiler
+from core.logger import GetLogger
+
+log = GetLogger("Startup")
+hotkeysLog = GetLogger("Hotkeys")
+
+# Windows/components created on first use: name -> (module, class)
+LAZY_COMPONENTS = {
+    "powerMenu": ("ui.powermenu", "PowerMenu"),
+    "profilerOverlay": ("ui.profilerOverlay", "ProfilerOverlay"),
+}
+
+# ***info***
+# Startup timing per stage, like -X importtime but for the shell:
+# import - modules imported by the stage (already imported ones cost nothing), build - creating/showing windows
+# **********
+class StartupTimer:
+    def __init__(self, startTime):
+        self.startTime = startTime
+        # (stage, import ms, build ms, ms since start)
+        self.stages = []
+        self.firstPaintMs = None
+
+    def SinceStart(self):
+        return (time.perf_counter() - self.startTime) * 1000
+
+    # Imports modules of a stage, returns them in the same order
+    def Import(self, stage, moduleNames):
+        modules = []
+        for moduleName in moduleNames:
+            cached = moduleName in sys.modules
+            importStart = time.perf_counter()
+            modules.append(importlib.import_module(moduleName))
+            if not cached:
+                GetLogger(f"Startup.{stage}").Debug(f"import {moduleName}: {(time.perf_counter() - importStart) * 1000:.1f} ms")
+        return modules
+
+    # stage - name, moduleNames - modules imported first, build(*modules) - creates the stage
+    def Run(self, stage, moduleNames, build):
+        importStart = time.perf_counter()
+        modules = self.Import(stage, moduleNames)
+        buildStart = time.perf_counter()
+        result = build(*modules)
+        buildEnd = time.perf_counter()
+
+        importMs = (buildStart - importStart) * 1000
+        buildMs = (buildEnd - buildStart) * 1000
+        sinceStart = (buildEnd - self.startTime) * 1000
+        self.stages.append((stage, importMs, buildMs, sinceStart))
+        profiler.AddTime(f"startup.{stage}", importMs + buildMs)
+        GetLogger(f"Startup.{stage}").Info(f"import {importMs:.1f} ms, build {buildMs:.1f} ms (+{sinceStart:.1f} ms since start)")
+        return result
+
+    def Report(self):
+        log.Info("Stage            import ms   build ms   since start ms")
+        for stage, importMs, buildMs, sinceStart in self.stages:
+            log.Info(f"{stage:<16} {importMs:>9.1f} {buildMs:>10.1f} {sinceStart:>16.1f}")
+        if self.firstPaintMs is not None:
+            log.Info(f"Taskbar time-to-first-paint: {self.firstPaintMs:.1f} ms")
 
 class NinaweShell:
     def __init__(self):
-        self.app = QApplication(sys.argv)
+        self.timer = StartupTimer(startupTime)
+        self.app = self.timer.Run("qt", [], lambda: QApplication(sys.argv))
+        # --startup-benchmark: print the stage report and quit when startup is done
+        self.benchmark = "--startup-benchmark" in sys.argv
         
         # Links to the windows
         self.desktop = None
         self.taskbar = None
-        self.powerMenu = None
+        self.hotkeys = None
+        self.cfg = None
+        # Lazy components (LAZY_COMPONENTS name -> object)
+        self.components = {}
+        self.iconsStarted = False
 
+    # ***info***
+    # Stages:
+    # 1. config, taskbar, wallpaper (desktop window without icons) - what has to be on screen first
+    # 2. desktop icons - after the taskbar was painted for the first time
+    # 3. hotkeys, theme preloading - background stuff
+    # PowerMenu (and launchpad later) are created by GetComponent on first use
+    # **********
     def start(self):
         print('''
                                                                                              ---:::+++#####+++:::---  
@@ -39,18 +117,101 @@ class NinaweShell:
                 ### ## #  ###    #### ########### ###    #### ###     ###   ###   ###   ##########          
     ---:::+++#####+++:::---                                                                
 ''')
-        
-        self.desktop = DesktopWindow()
-        self.desktop.show()
-        
-        self.taskbar = Taskbar()
-        self.taskbar.show()
 
-        # self.powerMenu = PowerMenu()
-        # self.powerMenu.show()
+        self.cfg = self.timer.Run("config", ["core.config"], lambda configModule: configModule.GetConfig())
+
+        self.taskbar = self.timer.Run("taskbar", ["ui.taskbar"], self.CreateTaskbar)
+        self.desktop = self.timer.Run("wallpaper", ["ui.desktop"], self.CreateDesktop)
+
+        # Icons after the first taskbar frame (fallback if the taskbar is never painted, hidden/no screen)
+        QTimer.singleShot(1000, self.StartIconStage)
 
         sys.exit(self.app.exec())
 
+    def CreateTaskbar(self, taskbarModule):
+        taskbar = taskbarModule.Taskbar()
+        taskbar.firstPainted.connect(self.OnTaskbarFirstPaint)
+        taskbar.show()
+        return taskbar
+
+    def CreateDesktop(self, desktopModule):
+        desktop = desktopModule.DesktopWindow(deferIcons = True)
+        desktop.show()
+        return desktop
+
+    def OnTaskbarFirstPaint(self):
+        self.timer.firstPaintMs = self.timer.SinceStart()
+        profiler.AddTime("startup.taskbar_first_paint", self.timer.firstPaintMs)
+        log.Info(f"Taskbar time-to-first-paint: {self.timer.firstPaintMs:.1f} ms")
+        # Leaving the paint event first
+        QTimer.singleShot(0, self.StartIconStage)
+
+    def StartIconStage(self):
+        if self.iconsStarted:
+            return
+        self.iconsStarted = True
+
+        self.timer.Run("icons", [], self.desktop.ScanDesktop)
+        # Background stage after the icons are on screen
+        QTimer.singleShot(0, self.StartServiceStage)
+
+    def StartServiceStage(self):
+        self.timer.Run("services", ["core.hotkeys"], self.StartServices)
+        self.timer.Report()
+
+        if self.benchmark:
+            self.app.quit()
+
+    def StartServices(self, hotkeysModule):
+        # Shell hotkeys ([Hotkeys.Ninawe] in config.ini)
+        self.hotkeys = hotkeysModule.HotkeyManager()
+        self.hotkeys.RegisterSection(self.cfg.app, "Hotkeys.Ninawe")
+        self.hotkeys.triggered.connect(self.OnHotkey)
+        self.app.aboutToQuit.connect(self.hotkeys.UnregisterAll)
+
+        # Neighbour themes are ready before the first theme_next/theme_prev
+        self.cfg.PreloadNeighbours()
+
+    # Creates LAZY_COMPONENTS[name] on first use
+    def GetComponent(self, name):
+        component = self.components.get(name)
+        if component is None:
+            moduleName, className = LAZY_COMPONENTS[name]
+            component = self.timer.Run(name, [moduleName], lambda module: getattr(module, className)())
+            self.components[name] = component
+        return component
+
+    def TogglePowerMenu(self):
+        powerMenu = self.GetComponent("powerMenu")
+        if powerMenu.isVisible():
+            powerMenu.close()
+        else:
+            powerMenu.show()
+
+    def ToggleProfilerOverlay(self):
+        overlay = self.GetComponent("profilerOverlay")
+        overlay.setVisible(not overlay.isVisible())
+
+    # JSON into [Profiler] dump_dir (spans, counters, recent frame timings)
+    def DumpProfile(self):
+        profiler.Dump(self.cfg.app.GetPath(self.cfg.app.snapshot.Profiler.dump_dir))
+
+    def OnHotkey(self, name):
+        if name == "theme_next":
+            self.cfg.SwitchToNeighbourTheme(1)
+        elif name == "theme_prev":
+            self.cfg.SwitchToNeighbourTheme(-1)
+        elif name == "power_menu":
+            self.TogglePowerMenu()
+        elif name == "profiler_overlay":
+            self.ToggleProfilerOverlay()
+        elif name == "profiler_dump":
+            self.DumpProfile()
+        else:
+            hotkeysLog.Info(f"No action for {name} yet")
+
 if __name__ == "__main__":
+    # Frozen builds start sandboxed widget processes through this executable
+    multiprocessing.freeze_support()
     shell = NinaweShell()
-    shell.start()
\ No newline at end of file
+    shell.start()
@@ -0,0 +1,494 @@
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+import numpy as np
+import threading
+import wave
+import time
+import os
+from core.profiler import profiler
+from core.logger import GetLogger, WIDGET_PROCESS_ENV
+
+log = GetLogger("Audio")
+
+# System output capture is optional (soundcard package, WASAPI loopback on Windows)
+try:
+    import soundcard
+except Exception:
+    soundcard = None
+
+# Samples per backend read (~10 ms at 48 kHz)
+CAPTURE_BLOCK = 512
+# Backend errors -> next Open() after this delay
+REOPEN_DELAY_S = 2.0
+# Stop() waits this long for the capture thread (device calls can block longer)
+STOP_TIMEOUT_S = 1.0
+
+# ==========[> Ring buffer
+
+# ***info***
+# Mono float32 ring buffer, one writer (capture thread) and any number of readers (GUI thread)
+# No locks: the writer copies the samples first and advances "written" after, readers take "written" once
+# and copy the samples behind it. Capacity is much larger than a read (1 s vs one FFT window),
+# the writer can't reach the copied part during one read.
+# **********
+class AudioRingBuffer:
+    def __init__(self, capacity):
+        self.capacity = max(1, capacity)
+        self.data = np.zeros(self.capacity, np.float32)
+        # Samples written since start (only the writer changes it)
+        self.written = 0
+
+    def Write(self, samples):
+        count = len(samples)
+        if count > self.capacity:
+            samples = samples[-self.capacity:]
+            count = self.capacity
+
+        start = self.written % self.capacity
+        end = start + count
+        if end <= self.capacity:
+            self.data[start:end] = samples
+        else:
+            first = self.capacity - start
+            self.data[start:] = samples[:first]
+            self.data[:count - first] = samples[first:]
+        self.written += count
+
+    # Last count samples into out (zeros before the first written sample), returns "written" of the copy
+    def Latest(self, out):
+        written = self.written
+        count = min(len(out), self.capacity)
+        available = min(written, count)
+        if available < len(out):
+            out[:len(out) - available] = 0.0
+        if not available:
+            return written
+
+        end = written % self.capacity
+        start = end - available
+        target = out[len(out) - available:]
+        if start >= 0:
+            target[:] = self.data[start:end]
+        else:
+            target[:-start] = self.data[start:]
+            target[-start:] = self.data[:end]
+        return written
+
+# ==========[> Backends
+
+# ***info***
+# Audio source: Open() -> Read(frames) as mono float32 (-1..1) -> Close()
+# Read() blocks until the samples are there (real time), sampleRate is known after Open()
+# **********
+class AudioBackend:
+    name = "none"
+
+    def __init__(self, sampleRate):
+        self.sampleRate = sampleRate
+
+    def Open(self):
+        pass
+
+    def Read(self, frames):
+        raise NotImplementedError
+
+    def Close(self):
+        pass
+
+# Generated/decoded audio is handed out at the real-time rate (same timing as a capture device)
+class PacedBackend(AudioBackend):
+    def Open(self):
+        self.startTime = time.perf_counter()
+        self.produced = 0
+
+    def WaitFor(self, frames):
+        readyTime = self.startTime + (self.produced + frames) / self.sampleRate
+        delay = readyTime - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        # Long stall (sleeping laptop, debugger) -> no burst of old samples
+        elif delay < -1.0:
+            self.startTime = time.perf_counter() - self.produced / self.sampleRate
+        self.produced += frames
+
+# ***info***
+# Test signal for machines without audio devices (headless Linux, CI)
+# Two sweeping tones + a kick-like burst twice per second + a bit of noise
+# **********
+class SyntheticBackend(PacedBackend):
+    name = "synthetic"
+
+    def __init__(self, sampleRate, beatHz = 2.0):
+        super().__init__(sampleRate)
+        self.beatHz = beatHz
+        self.random = np.random.default_rng(0)
+
+    def Read(self, frames):
+        self.WaitFor(frames)
+        t = (np.arange(frames) + (self.produced - frames)) / self.sampleRate
+
+        sweep = 220.0 * 2 ** (2 * (0.5 + 0.5 * np.sin(2 * np.pi * 0.05 * t)))
+        signal = 0.25 * np.sin(2 * np.pi * sweep * t) + 0.1 * np.sin(2 * np.pi * 3 * sweep * t)
+
+        beatPhase = (t * self.beatHz) % 1.0
+        signal += 0.5 * np.exp(-beatPhase * 30) * np.sin(2 * np.pi * 60 * t)
+        signal += 0.02 * self.random.standard_normal(frames)
+        return signal.astype(np.float32)
+
+# WAV file played in a loop (PCM 8/16/24/32 bit, any channel count, own sample rate)
+class WavFileBackend(PacedBackend):
+    name = "wav"
+
+    def __init__(self, sampleRate, path, loop = True):
+        super().__init__(sampleRate)
+        self.path = path
+        self.loop = loop
+        self.samples = None
+        self.position = 0
+
+    def Open(self):
+        with wave.open(self.path, "rb") as wavFile:
+            channels = wavFile.getnchannels()
+            sampleWidth = wavFile.getsampwidth()
+            self.sampleRate = wavFile.getframerate()
+            raw = wavFile.readframes(wavFile.getnframes())
+
+        self.samples = DecodePcm(raw, sampleWidth, channels)
+        if not len(self.samples):
+            raise ValueError(f"{self.path} has no samples")
+        self.position = 0
+        super().Open()
+
+    def Read(self, frames):
+        self.WaitFor(frames)
+        out = np.zeros(frames, np.float32)
+        filled = 0
+        while filled < frames:
+            if self.position >= len(self.samples):
+                if not self.loop:
+                    break
+                self.position = 0
+            chunk = self.samples[self.position:self.position + frames - filled]
+            out[filled:filled + len(chunk)] = chunk
+            filled += len(chunk)
+            self.position += len(chunk)
+        return out
+
+    def Close(self):
+        self.samples = None
+
+# Interleaved PCM bytes -> mono float32
+def DecodePcm(raw, sampleWidth, channels):
+    if sampleWidth == 1:
+        data = (np.frombuffer(raw, np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif sampleWidth == 2:
+        data = np.frombuffer(raw, "<i2").astype(np.float32) / 32768.0
+    elif sampleWidth == 3:
+        bytes3 = np.frombuffer(raw, np.uint8).reshape(-1, 3).astype(np.int32)
+        values = bytes3[:, 0] | (bytes3[:, 1] << 8) | (bytes3[:, 2] << 16)
+        values = np.where(values & 0x800000, values - 0x1000000, values)
+        data = values.astype(np.float32) / 8388608.0
+    elif sampleWidth == 4:
+        data = np.frombuffer(raw, "<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported sample width: {sampleWidth} bytes")
+
+    frames = len(data) // channels
+    return data[:frames * channels].reshape(frames, channels).mean(axis = 1, dtype = np.float32)
+
+# ***info***
+# Click track for checking beat detection offline or through the wav backend
+# Short decaying 1 kHz clicks every 60 / bpm seconds (every 4th one accented) + optional white noise
+# Returns the click times in seconds
+# **********
+def WriteClickTrack(path, bpm = 120.0, seconds = 30.0, sampleRate = 44100, offset = 0.5, noise = 0.0):
+    signal = np.zeros(int(seconds * sampleRate), np.float32)
+    t = np.arange(int(0.03 * sampleRate)) / sampleRate
+    click = (np.sin(2 * np.pi * 1000 * t) * np.exp(-t * 200)).astype(np.float32)
+
+    times = np.arange(offset, seconds - 0.05, 60.0 / bpm)
+    for index, start in enumerate((times * sampleRate).astype(int)):
+        part = signal[start:start + len(click)]
+        part += click[:len(part)] * (0.9 if index % 4 == 0 else 0.6)
+    if noise:
+        signal += noise * np.random.default_rng(0).standard_normal(len(signal)).astype(np.float32)
+
+    with wave.open(path, "wb") as wavFile:
+        wavFile.setnchannels(1)
+        wavFile.setsampwidth(2)
+        wavFile.setframerate(sampleRate)
+        wavFile.writeframes((np.clip(signal, -1.0, 1.0) * 32767).astype("<i2").tobytes())
+    return times
+
+# What is playing on the default output device (soundcard package)
+class LoopbackBackend(AudioBackend):
+    name = "loopback"
+
+    def __init__(self, sampleRate):
+        super().__init__(sampleRate)
+        self.recorder = None
+
+    @staticmethod
+    def IsAvailable():
+        return soundcard is not None
+
+    def Open(self):
+        if soundcard is None:
+            raise RuntimeError("soundcard package is not installed")
+        speaker = soundcard.default_speaker()
+        microphone = soundcard.get_microphone(speaker.name, include_loopback = True)
+        self.recorder = microphone.recorder(samplerate = self.sampleRate, blocksize = CAPTURE_BLOCK)
+        self.recorder.__enter__()
+
+    def Read(self, frames):
+        data = self.recorder.record(numframes = frames)
+        return np.asarray(data, np.float32).mean(axis = 1, dtype = np.float32)
+
+    def Close(self):
+        if self.recorder is not None:
+            self.recorder.__exit__(None, None, None)
+            self.recorder = None
+
+# ***info***
+# [Audio] backend key -> backend
+# auto - loopback capture if the soundcard package works, synthetic signal otherwise
+# wav - wav_path (relative to the Ninawe folder or absolute)
+# **********
+def CreateBackend(audioConfig, basePath = ""):
+    name = audioConfig.backend.strip().lower()
+    sampleRate = audioConfig.sample_rate
+
+    if name == "wav":
+        path = audioConfig.wav_path
+        if path and not os.path.isabs(path):
+            path = os.path.join(basePath, path)
+        return WavFileBackend(sampleRate, path)
+    if name == "synthetic":
+        return SyntheticBackend(sampleRate)
+    if name == "loopback" or (name == "auto" and LoopbackBackend.IsAvailable()):
+        return LoopbackBackend(sampleRate)
+
+    if name != "auto":
+        log.Warning(f"Unknown audio backend \"{name}\", using the synthetic signal")
+    return SyntheticBackend(sampleRate)
+
+# ==========[> Analysis
+
+# ***info***
+# One analysis result shared by all visualizers (arrays are read-only, never copy them per widget)
+# samples - last fft_size samples (oldest first), spectrum - magnitudes of the rfft bins (full-scale sine ~ 1.0)
+# frequencies - Hz of the spectrum bins, rms/peak - of the samples, sequence - counts published frames
+# **********
+class AudioFrame:
+    __slots__ = ("sequence", "time", "sampleRate", "samples", "spectrum", "frequencies", "rms", "peak")
+
+    def __init__(self, sequence, frameTime, sampleRate, samples, spectrum, frequencies, rms, peak):
+        self.sequence = sequence
+        self.time = frameTime
+        self.sampleRate = sampleRate
+        self.samples = samples
+        self.spectrum = spectrum
+        self.frequencies = frequencies
+        self.rms = rms
+        self.peak = peak
+
+class AudioAnalyzer:
+    def __init__(self, fftSize, sampleRate):
+        self.fftSize = fftSize
+        self.sampleRate = sampleRate
+        self.window = np.hanning(fftSize).astype(np.float32)
+        # Hann window halves the amplitude, full-scale sine -> 1.0
+        self.scale = np.float32(2.0 / self.window.sum())
+        self.frequencies = np.fft.rfftfreq(fftSize, 1.0 / sampleRate).astype(np.float32)
+        self.frequencies.setflags(write = False)
+        self.windowed = np.empty(fftSize, np.float32)
+
+    def Analyse(self, samples, sequence):
+        np.multiply(samples, self.window, out = self.windowed)
+        spectrum = np.abs(np.fft.rfft(self.windowed)).astype(np.float32)
+        spectrum *= self.scale
+
+        samples = samples.copy()
+        rms = float(np.sqrt(np.dot(samples, samples) / len(samples)))
+        peak = float(np.max(np.abs(samples)))
+
+        samples.setflags(write = False)
+        spectrum.setflags(write = False)
+        return AudioFrame(sequence, time.monotonic(), self.sampleRate, samples, spectrum, self.frequencies, rms, peak)
+
+# ***info***
+# Audio pipeline shared by the visualizer widgets:
+# backend (capture thread) -> AudioRingBuffer -> one AudioAnalyzer pass per frame (GUI thread timer) -> frameReady
+# Capture runs only while there are subscribers, frames are published only when new samples came in
+# (silence is still published - it is new samples, a stopped/paused backend is not)
+# Usage in a widget: GetAudioService().Subscribe(self.OnAudioFrame, owner = self)
+# **********
+class AudioService(QObject):
+    frameReady = pyqtSignal(object)
+
+    def __init__(self, audioConfig, basePath = "", parent = None):
+        super().__init__(parent)
+        self.basePath = basePath
+        self.audioConfig = audioConfig
+
+        self.subscribers = []
+        self.backend = None
+        self.ringBuffer = None
+        self.analyzer = None
+        self.samples = None
+        self.frame = None
+        self.sequence = 0
+        self.lastWritten = 0
+
+        # Every capture thread gets its own stop event (a restart never revives a stopping thread)
+        self.captureThread = None
+        self.stopEvent = None
+        # Stopped threads still blocked in the backend, they exit on their own
+        self.stoppingThreads = []
+        # Ring buffer/analyzer are published under this lock, only by a thread that is not stopped
+        self.lock = threading.Lock()
+
+        self.analysisTimer = QTimer(self)
+        self.analysisTimer.timeout.connect(self.Analyse)
+
+    # ==========[> Subscribers
+
+    def Subscribe(self, callback, owner = None):
+        if callback in self.subscribers:
+            return
+        self.subscribers.append(callback)
+        self.frameReady.connect(callback)
+
+        # Subscription ends together with the owner widget (widgets reloaded by WidgetManager)
+        if owner is not None:
+            owner.destroyed.connect(lambda *args, callback = callback: self.Unsubscribe(callback))
+
+        if len(self.subscribers) == 1:
+            self.Start()
+
+    def Unsubscribe(self, callback):
+        if callback not in self.subscribers:
+            return
+        self.subscribers.remove(callback)
+        try:
+            self.frameReady.disconnect(callback)
+        # Not connected / service already deleted on exit
+        except (TypeError, RuntimeError):
+            pass
+
+        if not self.subscribers:
+            self.Stop()
+
+    # ==========[> Capture
+
+    def Configure(self, audioConfig):
+        self.audioConfig = audioConfig
+        if self.captureThread is not None:
+            self.Stop()
+            self.Start()
+
+    def Start(self):
+        if self.captureThread is not None:
+            return
+        audioConfig = self.audioConfig
+
+        self.stoppingThreads = [thread for thread in self.stoppingThreads if thread.is_alive()]
+        if self.stoppingThreads:
+            log.Warning(f"{len(self.stoppingThreads)} stopped capture thread(s) still running")
+
+        self.backend = CreateBackend(audioConfig, self.basePath)
+        self.stopEvent = threading.Event()
+        # Backend opens on the capture thread (devices can take a while), sample rate comes with the first block
+        self.ringBuffer = None
+        self.analyzer = None
+        self.samples = np.zeros(max(64, audioConfig.fft_size), np.float32)
+        self.lastWritten = 0
+
+        self.captureThread = threading.Thread(target = self.Capture, args = (self.backend, self.stopEvent, len(self.samples), audioConfig.buffer_ms), name = "NinaweAudio", daemon = True)
+        self.captureThread.start()
+
+        self.analysisTimer.setInterval(max(1, round(1000 / max(1, audioConfig.analysis_fps))))
+        self.analysisTimer.start()
+        log.Info(f"Started ({self.backend.name}, FFT {len(self.samples)}, {audioConfig.analysis_fps} FPS)")
+
+    def Stop(self):
+        self.analysisTimer.stop()
+        if self.captureThread is None:
+            return
+        with self.lock:
+            self.stopEvent.set()
+        self.captureThread.join(STOP_TIMEOUT_S)
+        if self.captureThread.is_alive():
+            log.Warning(f"Capture thread did not stop in {STOP_TIMEOUT_S} s ({self.backend.name} backend), it exits on its own")
+            self.stoppingThreads.append(self.captureThread)
+        self.captureThread = None
+        self.stopEvent = None
+        self.backend = None
+        self.frame = None
+        log.Info("Stopped")
+
+    # Capture thread: writes only into its own ring buffer, stopEvent belongs to this thread alone
+    def Capture(self, backend, stopEvent, windowSize, bufferMs):
+        ringBuffer = analyzer = None
+        while not stopEvent.is_set():
+            try:
+                backend.Open()
+            except Exception as e:
+                log.Error(f"Can't open {backend.name} backend: {e}", every = 60)
+                stopEvent.wait(REOPEN_DELAY_S)
+                continue
+
+            try:
+                if ringBuffer is None or analyzer.sampleRate != backend.sampleRate:
+                    analyzer = AudioAnalyzer(windowSize, backend.sampleRate)
+                    ringBuffer = AudioRingBuffer(max(windowSize * 2, backend.sampleRate * bufferMs // 1000))
+                    with self.lock:
+                        if stopEvent.is_set():
+                            break
+                        self.ringBuffer, self.analyzer = ringBuffer, analyzer
+
+                while not stopEvent.is_set():
+                    ringBuffer.Write(backend.Read(CAPTURE_BLOCK))
+            except Exception as e:
+                log.Error(f"{backend.name} backend failed: {e}", every = 60)
+                stopEvent.wait(REOPEN_DELAY_S)
+            finally:
+                backend.Close()
+
+    # Last len(out) raw samples for widgets that need more than the analysis window (oscilloscopes)
+    # Returns the sample rate, None before the first captured block
+    def ReadSamples(self, out):
+        ringBuffer, analyzer = self.ringBuffer, self.analyzer
+        if ringBuffer is None or analyzer is None:
+            return None
+        ringBuffer.Latest(out)
+        return analyzer.sampleRate
+
+    # ==========[> Analysis (GUI thread)
+
+    def Analyse(self):
+        ringBuffer = self.ringBuffer
+        if ringBuffer is None or ringBuffer.written == self.lastWritten:
+            return
+
+        with profiler.Span("audio.analyse"):
+            self.lastWritten = ringBuffer.Latest(self.samples)
+            self.sequence += 1
+            self.frame = self.analyzer.Analyse(self.samples, self.sequence)
+
+        with profiler.Span("audio.publish"):
+            self.frameReady.emit(self.frame)
+
+audioService = None
+
+# Shared service (created on first use), follows the [Audio] section of config.ini
+# Shared per process: a sandboxed audio widget runs its own capture + analysis next to the shell's
+def GetAudioService():
+    global audioService
+    if audioService is None:
+        from core.config import config
+        widgetProcess = os.environ.get(WIDGET_PROCESS_ENV)
+        if widgetProcess:
+            log.Info(f"Widget process {widgetProcess} captures and analyses audio on its own")
+        audioService = AudioService(config.app.snapshot.Audio, config.app.GetPath())
+        config.Subscribe("app", "Audio", None, lambda changes: audioService.Configure(config.app.snapshot.Audio))
+    return audioService
@@ -1,8 +1,21 @@
-from PyQt6.QtCore import QObject, pyqtSignal, QFileSystemWatcher
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtWidgets import QApplication
 import configparser
 import os
 import sys
-import hashlib
+import time
+from collections import namedtuple
+from core.configSnapshot import BuildSnapshot, THEME_SCHEMA, APP_SCHEMA
+from core.fileWatcher import GetFileWatchService
+from core.themeBundle import ThemeBundleLoader
+from core.utils import LoadFont
+from core.profiler import profiler
+from core.logger import GetLogger, LogSettings, ParseLevel, logService, WIDGET_PROCESS_ENV
+
+log = GetLogger("Config")
+themeLog = GetLogger("ThemeConfig")
+appLog = GetLogger("AppConfig")
+managerLog = GetLogger("ConfigManager")
 
 # Absolute path to files
 if getattr(sys, "frozen", False):
@@ -11,12 +24,22 @@ else:
     # from config.py to default directory (.. x 3)
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-print(f"[Log] [Config] | Default path: {BASE_DIR}")
+log.Debug(f"Default path: {BASE_DIR}")
+
+# One changed key (old/new are raw strings, None if the key was added/removed)
+ConfigChange = namedtuple("ConfigChange", ["section", "key", "old", "new"])
 
 # Base class for convenient data retrieval
 class ConfigWrapper:
     def __init__(self):
         self.parser = configparser.ConfigParser(interpolation = None)
+        # Raw values of the last load (section -> {key: value}) and what changed in it
+        self.values = {}
+        self.lastChanges = []
+        # Typed read-only view of the parser data (rebuilt on load, see configSnapshot.py)
+        self.snapshot = None
+        # Increased on every change of the data (caches and consumers compare it)
+        self.revision = 0
 
     def Get(self, section, option, fallback = None):
         try:
@@ -58,26 +81,35 @@ class ConfigWrapper:
     def GetPath(self, path = ""):
         return os.path.join(BASE_DIR, path)
 
-    # I'm too dumb to do this properly, so the hash variable must be called "hashes" in any case
-    def SectionHashCheck(self, dataClaimer = None):
-        if dataClaimer == None:
-            print("[Log] [ConfigWrapper] [SectionHashCheck] | Data not set")
-            return
-
-        changedSections = []
-        allSections = dataClaimer.parser.sections()
-
-        for section in allSections:
-            items = sorted(dataClaimer.parser.items(section))
-            rawData = str(items).encode("utf-8")
-            currentHash = hashlib.md5(rawData).hexdigest()
-            oldHash = dataClaimer.hashes.get(section)
-
-            if currentHash != oldHash:
-                dataClaimer.hashes[section] = currentHash
-                changedSections.append(section)
-
-        return changedSections
+    # ***info***
+    # Compares parser data with the data of the previous load (key by key)
+    # Returns list of ConfigChange, remembers the new data for the next call
+    # **********
+    def DiffValues(self):
+        newValues = {section: dict(self.parser.items(section, raw = True)) for section in self.parser.sections()}
+        changes = []
+
+        # New and changed keys (file order), then removed ones
+        for section, newItems in newValues.items():
+            oldItems = self.values.get(section, {})
+            for key, newValue in newItems.items():
+                oldValue = oldItems.get(key)
+                if oldValue != newValue:
+                    changes.append(ConfigChange(section, key, oldValue, newValue))
+            for key in oldItems.keys() - newItems.keys():
+                changes.append(ConfigChange(section, key, oldItems[key], None))
+
+        for section in self.values.keys() - newValues.keys():
+            for key, oldValue in self.values[section].items():
+                changes.append(ConfigChange(section, key, oldValue, None))
+
+        self.values = newValues
+        self.lastChanges = changes
+        return changes
+
+    # Changed section names, what configUpdated carries
+    def ChangedSections(self, changes):
+        return list(dict.fromkeys(change.section for change in changes))
 
 # Theme [Global] properties (and defaults)
 class GlobalThemeConfigData:
@@ -94,38 +126,100 @@ class ThemeConfig(ConfigWrapper):
         self.currentThemePath = ""
         self.themeInitFile = ""
 
-        self.hashes = {}
         self.globals = GlobalThemeConfigData()
 
-    def Load(self, themeName):
-        # Getting theme by name
-        self.currentThemePath = self.GetThemePath(themeName)
-        self.themeInitFile = os.path.join(self.currentThemePath, "themeconfig.ini")
+        # Preloaded theme data (fonts, first wallpaper, icons), see themeBundle.py
+        self.bundleLoader = ThemeBundleLoader(BASE_DIR)
+        self.bundle = None
+
+    # Theme folder, rolling back to default if the theme has no themeconfig.ini
+    def ResolveTheme(self, themeName):
+        themePath = self.GetThemePath(themeName)
 
         # Checking if theme in folder is exists
-        if not os.path.exists(self.themeInitFile):
+        if not os.path.exists(os.path.join(themePath, "themeconfig.ini")):
             if themeName != "default":
                 # fallback to default theme
-                print(f"[Log] [ThemeConfig] | No theme with name {themeName} detected. Rolling back to default.")
-                self.currentThemePath = self.GetThemePath("default")
-                self.themeInitFile = os.path.join(self.currentThemePath, "themeconfig.ini")
-        
-        self.parser.clear()
-        self.parser.read(self.themeInitFile)
-
-        changedSections = self.SectionHashCheck(self)
-
-        self.ParseGlobals()
+                themeLog.Warning(f"No theme with name {themeName} detected. Rolling back to default.")
+                themePath = self.GetThemePath("default")
 
-        print(f"[Log] [ThemeConfig] | Theme loaded: {themeName}")
+        return themePath
 
-        return changedSections
+    # Reading themeconfig.ini again (startup, theme file edits)
+    def Load(self, themeName):
+        themePath = self.ResolveTheme(themeName)
+        parser = configparser.ConfigParser(interpolation = None)
+        with profiler.Span("config.theme.read"):
+            parser.read(os.path.join(themePath, "themeconfig.ini"))
+
+        # Fonts/icons of the bundle stay valid while it is the same theme
+        bundle = self.bundle if self.bundle is not None and self.bundle.path == themePath else None
+        changes = self.Apply(parser, themePath, bundle)
+
+        themeLog.Info(f"Theme loaded: {themeName} ({len(changes)} keys changed)")
+
+        return self.ChangedSections(changes)
+
+    # ***info***
+    # Switching to another theme through a preloaded bundle (read right here if it is not ready)
+    # Returns (changed sections, True if the bundle was preloaded)
+    # **********
+    def SwitchTo(self, themeName):
+        themePath = self.ResolveTheme(themeName)
+        bundle, preloaded = self.bundleLoader.Get(themeName, themePath)
+        changes = self.Apply(bundle.parser, themePath, bundle)
+
+        themeLog.Info(f"Theme switched: {themeName} ({len(changes)} keys changed, {'preloaded' if preloaded else 'loaded now'})")
+
+        return self.ChangedSections(changes), preloaded
+
+    def Preload(self, themeName):
+        self.bundleLoader.Preload(themeName, self.ResolveTheme(themeName))
+
+    # Swapping all theme data at once (parser is replaced, never modified in place)
+    def Apply(self, parser, themePath, bundle = None):
+        self.currentThemePath = themePath
+        self.themeInitFile = os.path.join(themePath, "themeconfig.ini")
+        self.parser = parser
+        self.bundle = bundle
+        self.bundleLoader.SetActive(themePath)
+
+        with profiler.Span("config.theme.parse"):
+            changes = self.DiffValues()
+            if changes or self.snapshot is None:
+                self.revision += 1
+                self.snapshot = BuildSnapshot(self.parser, THEME_SCHEMA, self.revision)
+
+            self.ParseGlobals()
+        return changes
+
+    # Theme names from userdata/themes and app/themes (sorted, for theme_next/theme_prev)
+    def ListThemes(self):
+        themes = set()
+        for themesDir in (self.GetPath(os.path.join("userdata", "themes")), self.GetPath(os.path.join("app", "themes"))):
+            if not os.path.isdir(themesDir):
+                continue
+            for name in os.listdir(themesDir):
+                if os.path.exists(os.path.join(themesDir, name, "themeconfig.ini")):
+                    themes.add(name)
+        return sorted(themes)
+
+    def GetNeighbourTheme(self, currentTheme, step):
+        themes = self.ListThemes()
+        if not themes:
+            return currentTheme
+        if currentTheme not in themes:
+            return themes[0]
+        return themes[(themes.index(currentTheme) + step) % len(themes)]
 
     def ParseGlobals(self):
-        print("[Log] [ThemeConfig] | Caching theme global properties...")
+        themeLog.Debug("Caching theme global properties...")
         rawFont = self.Get("Global", "font_family", fallback =  "Segoe UI")
         if rawFont.lower().endswith((".ttf", ".otf")):
-             self.globals.fontFamily = self.GetResource(rawFont)
+             fontPath = self.GetResource(rawFont)
+             # Family name from the font registry (registered once per file version),
+             # path until there is an application object (widgets call LoadFont with it later)
+             self.globals.fontFamily = LoadFont(fontPath, owner = self.currentThemePath) if QApplication.instance() else fontPath
         else:
              self.globals.fontFamily = rawFont
         self.globals.fontSize = self.GetInt("Global", "font_size", fallback = 12)
@@ -136,21 +230,20 @@ class ThemeConfig(ConfigWrapper):
         # Theme folder paths
         userPath = os.path.join(self.GetPath(f"userdata\\themes\\{themeName}"))
         appPath = os.path.join(self.GetPath(f"app\\themes\\{themeName}"))
-        print(userPath)
-        print(appPath)
+        themeLog.Debug(f"Theme paths: {userPath}, {appPath}")
         
         # User theme (high priority)
         if os.path.exists(os.path.join(userPath, "themeconfig.ini")):
-            print(f"[Log] [ThemeConfig] | Loading user theme: \"{themeName}\"")
+            themeLog.Debug(f"Loading user theme: \"{themeName}\"")
             return userPath
 
         # Default build-in theme
         if os.path.exists(os.path.join(appPath, "themeconfig.ini")):
-            print(f"[Log] [ThemeConfig] | Loading system theme: \"{themeName}\"")
+            themeLog.Debug(f"Loading system theme: \"{themeName}\"")
             return appPath
 
         # Not found anything
-        print(f"[Log] [ThemeConfig] | Theme \"{themeName}\" not found! Fallback to default.")
+        themeLog.Warning(f"Theme \"{themeName}\" not found! Fallback to default.")
         return os.path.join(appPath, "default")
 
     def GetResource(self, relativePath):
@@ -162,19 +255,68 @@ class ThemeConfig(ConfigWrapper):
 class AppConfig(ConfigWrapper):
     def __init__(self):
         super().__init__()
+        # Schema defaults until the file is read
+        self.snapshot = BuildSnapshot(self.parser, APP_SCHEMA, self.revision)
         self.configFilePath = os.path.join(BASE_DIR, "userdata", "preferences",  "program", "config.ini")
-        self.hashes = {}
         self.Load()
 
     def Load(self):
         if not os.path.exists(self.configFilePath):
-            print(f"[Log] [AppConfig] | Config file on directory {self.configFilePath} not found.")
+            appLog.Warning(f"Config file on directory {self.configFilePath} not found.")
+            self.lastChanges = []
             return []
 
-        self.parser.read(self.configFilePath)
-        changedSections = self.SectionHashCheck(self)
-        print(f"[Log] [AppConfig] | {self.configFilePath} loaded.")
-        return changedSections
+        with profiler.Span("config.app.load"):
+            self.parser.read(self.configFilePath)
+            changes = self.DiffValues()
+            if changes:
+                self.revision += 1
+                self.snapshot = BuildSnapshot(self.parser, APP_SCHEMA, self.revision)
+        appLog.Info(f"{self.configFilePath} loaded ({len(changes)} keys changed).")
+        return self.ChangedSections(changes)
+
+    # ***info***
+    # Writes one value into config.ini keeping the rest of the file as is (atomic replace)
+    # The file watcher picks the change up like any other edit
+    # **********
+    def SetValue(self, section, option, value):
+        try:
+            with open(self.configFilePath, "r", encoding = "utf-8") as configFile:
+                lines = configFile.read().splitlines()
+        except OSError as e:
+            appLog.Warning(f"Failed to read {self.configFilePath}: {e}")
+            return
+
+        sectionIndex = None
+        insertIndex = None
+        for index, line in enumerate(lines):
+            stripped = line.strip()
+            if stripped.startswith("[") and stripped.endswith("]"):
+                if sectionIndex is not None:
+                    break
+                if stripped[1:-1] == section:
+                    sectionIndex = insertIndex = index + 1
+                continue
+            if sectionIndex is None:
+                continue
+            if stripped:
+                insertIndex = index + 1
+            if "=" in stripped and stripped.split("=", 1)[0].strip() == option:
+                lines[index] = f"{option} = {value}"
+                break
+        else:
+            if sectionIndex is None:
+                lines += ["", f"[{section}]", f"{option} = {value}"]
+            else:
+                lines.insert(insertIndex, f"{option} = {value}")
+
+        tempPath = self.configFilePath + ".tmp"
+        try:
+            with open(tempPath, "w", encoding = "utf-8") as configFile:
+                configFile.write("\n".join(lines) + "\n")
+            os.replace(tempPath, self.configFilePath)
+        except OSError as e:
+            appLog.Warning(f"Failed to save {self.configFilePath}: {e}")
 
 # All-in-one config manager
 class ConfigManager(QObject):
@@ -184,62 +326,218 @@ class ConfigManager(QObject):
     def __init__(self):
         super().__init__()
         self.app = AppConfig()
+        # Profiler/logger settings are needed before the theme is parsed
+        profiler.Configure(self.app.snapshot.Profiler)
+        self.ConfigureLogging()
         self.theme = ThemeConfig()
 
-        self.currentTheme = self.app.Get("Theme", "current_theme", fallback = "default")
+        self.currentTheme = self.app.snapshot.Theme.current_theme
         self.theme.Load(self.currentTheme)
 
-        self.watcher = QFileSystemWatcher()
-        self.watcher.fileChanged.connect(self.OnFileChanged)
+        # Key level subscriptions: [(source, section, keys or None, callback)]
+        self.subscriptions = []
+        # Time of the last detected file change (theme edit -> repaint latency logs)
+        self.lastChangeTime = None
+        # True while SwitchTheme runs: subscribers that also handle configUpdated ["ALL"] leave the work to it
+        self.switchingTheme = False
+        self.Subscribe("app", "Profiler", None, lambda changes: profiler.Configure(self.app.snapshot.Profiler))
+        self.Subscribe("app", "Logging", None, lambda changes: self.ConfigureLogging())
+        self.Subscribe("app", "Logging.Levels", None, lambda changes: self.ConfigureLogging())
+
+        # Debounced watcher (one reload per save, see fileWatcher.py)
+        self.fileWatcher = GetFileWatchService()
+        self.watchedFiles = set()
         self.UpdateWatchList()
 
+    # ***info***
+    # [Logging] - default level, console/file output, rotation
+    # [Logging.Levels] - per subsystem levels (ConfigManager = debug, Taskbar.Clock = warning, ...)
+    # Logger itself knows nothing about config.ini (core.logger is imported by config.py)
+    # Sandboxed widget processes write ninawe.<widget>.log, a log file is appended to and rotated by one process only
+    # **********
+    def ConfigureLogging(self):
+        logConfig = self.app.snapshot.Logging
+        filePath = self.app.GetPath(logConfig.file_path) if logConfig.file else None
+        widgetProcess = os.environ.get(WIDGET_PROCESS_ENV)
+        if filePath and widgetProcess:
+            root, extension = os.path.splitext(filePath)
+            filePath = f"{root}.{widgetProcess}{extension}"
+        levels = {}
+        if self.app.GetSectionStatus("Logging.Levels"):
+            levels = {name.lower(): ParseLevel(value) for name, value in self.app.parser.items("Logging.Levels")}
+
+        logService.Configure(LogSettings(
+            level = ParseLevel(logConfig.level),
+            levels = levels,
+            console = logConfig.console,
+            filePath = filePath,
+            maxBytes = max(1, logConfig.max_file_kb) * 1024,
+            backups = max(0, logConfig.backups)
+        ))
+
     # Updating watching files list
     def UpdateWatchList(self):
-        files = self.watcher.files()
-
-        if self.app.configFilePath and self.app.configFilePath not in files:
-            if os.path.exists(self.app.configFilePath):
-                self.watcher.addPath(self.app.configFilePath)
-                print(f"[Log] [ConfigWatcher] [UpdateWatchList] | Added: {self.app.configFilePath}")
-
-        if self.theme.themeInitFile and self.theme.themeInitFile not in files:
-            if os.path.exists(self.theme.themeInitFile):
-                self.watcher.addPath(self.theme.themeInitFile)
-                print(f"[Log] [ConfigWatcher] [UpdateWatchList] | Added: {self.theme.themeInitFile}")
-
-    # One updater for config/themeconfig
-    def OnFileChanged(self, path):
-        if path == self.app.configFilePath:
-            print("[Log] [ConfigManager] [Config] | App config changes detected.")
+        wantedFiles = {os.path.abspath(path) for path in (self.app.configFilePath, self.theme.themeInitFile) if path}
+
+        for path in self.watchedFiles - wantedFiles:
+            self.fileWatcher.Unwatch(path, self.OnFilesChanged)
+            managerLog.Debug(f"Removed: {path}")
+
+        for path in wantedFiles - self.watchedFiles:
+            self.fileWatcher.Watch(path, self.OnFilesChanged)
+            managerLog.Debug(f"Added: {path}")
+
+        self.watchedFiles = wantedFiles
+
+    # ***info***
+    # Calls callback(changes) when keys of the section are changed
+    # source - "app" (config.ini) / "theme" (themeconfig.ini)
+    # keys - iterable of key names, None for any key of the section
+    # owner - QObject the subscription ends with (windows/widgets), None for subscriptions that live as long as the app
+    # Subscribers are called before configUpdated is emitted (once per load, with all their changes)
+    # Returns handle for Unsubscribe
+    # **********
+    def Subscribe(self, source, section, keys, callback, owner = None):
+        subscription = (source, section, frozenset(keys) if keys is not None else None, callback)
+        self.subscriptions.append(subscription)
+
+        if owner is not None:
+            owner.destroyed.connect(lambda *args, subscription = subscription: self.Unsubscribe(subscription))
+        return subscription
+
+    def Unsubscribe(self, subscription):
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+
+    def Dispatch(self, source, changes):
+        if not changes:
+            return
+
+        startTime = time.perf_counter()
+        calls = 0
+        # Copy: callbacks can subscribe/unsubscribe
+        for subSource, section, keys, callback in list(self.subscriptions):
+            if subSource != source:
+                continue
+            matched = [change for change in changes if change.section == section and (keys is None or change.key in keys)]
+            if not matched:
+                continue
+            # One failing subscriber doesn't stop the others (called from a Qt slot)
+            try:
+                callback(matched)
+                calls += 1
+            except Exception as e:
+                managerLog.Exception(f"{source} [{section}] subscriber failed: {e}")
+
+        elapsed = (time.perf_counter() - startTime) * 1000
+        profiler.AddTime("config.dispatch", elapsed)
+        managerLog.Info(f"{source}: {len(changes)} changed keys -> {calls} subscribers ({elapsed:.2f} ms)")
+
+    # Milliseconds since the last config file change (None if nothing changed yet)
+    def SinceLastChange(self):
+        if self.lastChangeTime is None:
+            return None
+        return (time.perf_counter() - self.lastChangeTime) * 1000
+
+    # One updater for config/themeconfig (called once per quiet period with all changed files)
+    def OnFilesChanged(self, paths):
+        self.lastChangeTime = time.perf_counter()
+        paths = {os.path.abspath(path) for path in paths}
+        themeSwitched = False
+
+        if os.path.abspath(self.app.configFilePath) in paths:
+            managerLog.Info("App config changes detected.")
             changes = self.app.Load()
-            newTheme = self.app.Get("Theme", "current_theme", fallback = "default")
+            self.Dispatch("app", self.app.lastChanges)
+            newTheme = self.app.snapshot.Theme.current_theme
             
             # If theme in config.ini switched
             if self.currentTheme != newTheme:
-                print(f"[Log] [ConfigManager] [Config] | Theme switch detected: {self.currentTheme} -> {newTheme}")
-                if self.theme.themeInitFile in self.watcher.files():
-                    self.watcher.removePath(self.theme.themeInitFile)
-                
-                self.theme.Load(newTheme)
-                self.currentTheme = newTheme
-                self.UpdateWatchList()
-                
-                self.configUpdated.emit("theme", ["ALL"]) 
+                managerLog.Info(f"Theme switch detected: {self.currentTheme} -> {newTheme}")
+                self.SwitchTheme(newTheme, persist = False)
+                themeSwitched = True
             # If other props is changed
-            else:
+            elif changes:
                 self.configUpdated.emit("app", changes)
 
-        elif path == self.theme.themeInitFile:
-            print("[Log] [ConfigManager] [Config] | Theme config changes detected.")
-            changes = self.theme.Load(self.app.Get("Theme", "current_theme"))
+        # Theme file saved (skipped if the whole theme was just reloaded)
+        if not themeSwitched and os.path.abspath(self.theme.themeInitFile) in paths:
+            managerLog.Info("Theme config changes detected.")
+            changes = self.theme.Load(self.currentTheme)
+            self.Dispatch("theme", self.theme.lastChanges)
             if changes:
                 self.configUpdated.emit("theme", changes)
         
         self.UpdateWatchList()
 
+    # ***info***
+    # Applies another theme in one step: preloaded bundle is swapped in, subscribers and
+    # configUpdated listeners update while window repaints are held, then every window repaints once
+    # persist - write current_theme into config.ini (hotkeys), False if it came from config.ini
+    # **********
+    def SwitchTheme(self, themeName, persist = True):
+        startTime = time.perf_counter()
+        self.lastChangeTime = startTime
+
+        # Holding repaints until everything is updated (no half-applied theme on screen)
+        windows = [window for window in QApplication.topLevelWidgets() if window.isVisible() and window.updatesEnabled()] if QApplication.instance() else []
+        for window in windows:
+            window.setUpdatesEnabled(False)
+
+        self.switchingTheme = True
+        try:
+            changedSections, preloaded = self.theme.SwitchTo(themeName)
+            self.currentTheme = themeName
+            self.UpdateWatchList()
+            self.Dispatch("theme", self.theme.lastChanges)
+            self.configUpdated.emit("theme", ["ALL"])
+        finally:
+            self.switchingTheme = False
+            # One batched repaint per window
+            for window in windows:
+                window.setUpdatesEnabled(True)
+
+        elapsed = (time.perf_counter() - startTime) * 1000
+        profiler.AddTime("config.theme.switch", elapsed)
+        managerLog.Info(f"{themeName} applied in {elapsed:.1f} ms ({'preloaded' if preloaded else 'not preloaded'}, {len(changedSections)} sections changed)")
+
+        if persist:
+            self.app.SetValue("Theme", "current_theme", themeName)
+
+        self.PreloadNeighbours()
+
+    # theme_next / theme_prev
+    def SwitchToNeighbourTheme(self, step):
+        nextTheme = self.theme.GetNeighbourTheme(self.currentTheme, step)
+        if nextTheme != self.currentTheme:
+            self.SwitchTheme(nextTheme)
+
+    # Themes next to the current one are read in the background, so hotkey switches don't wait for disk
+    def PreloadNeighbours(self):
+        for step in (1, -1):
+            neighbour = self.theme.GetNeighbourTheme(self.currentTheme, step)
+            if neighbour != self.currentTheme:
+                self.theme.Preload(neighbour)
+
     def Reload(self):
         self.app.Load()
-        self.theme.Load()
+        self.theme.Load(self.currentTheme)
         self.UpdateWatchList()
 
-config = ConfigManager()
\ No newline at end of file
+# ***info***
+# Shared ConfigManager, created on first use instead of on import
+# (both ini files are parsed and watched only when someone needs them, after QApplication exists
+# theme fonts are registered right away). `from core.config import config` still works through __getattr__
+# **********
+def GetConfig():
+    global config
+    if "config" not in globals():
+        startTime = time.perf_counter()
+        config = ConfigManager()
+        managerLog.Info(f"Loaded in {(time.perf_counter() - startTime) * 1000:.1f} ms")
+    return config
+
+def __getattr__(name):
+    if name == "config":
+        return GetConfig()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
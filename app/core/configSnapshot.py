@@ -0,0 +1,252 @@
+from PyQt6.QtGui import QColor
+from collections import namedtuple
+from types import MappingProxyType
+from core.logger import GetLogger
+
+log = GetLogger("ConfigSnapshot")
+
+# ==========[> Value types
+
+# Size that can be relative to the screen ("80%") or absolute ("30px", "30")
+class Length(namedtuple("Length", ["value", "unit"])):
+    __slots__ = ()
+
+    def Resolve(self, total):
+        if self.unit == "%":
+            return round(total * (self.value / 100))
+        return int(self.value)
+
+# Color parsed once: original string (stylesheets, blur API), QColor (painting), ARGB int
+class Color(namedtuple("Color", ["raw", "qcolor", "argb"])):
+    __slots__ = ()
+
+def StripUnits(raw):
+    return raw.replace("px", "").replace("%", "").strip()
+
+def ParseInt(raw):
+    return int(float(StripUnits(raw)))
+
+def ParseFloat(raw):
+    return float(StripUnits(raw))
+
+def ParseBool(raw):
+    value = raw.strip().lower()
+    if value in ("1", "yes", "true", "on"):
+        return True
+    if value in ("0", "no", "false", "off"):
+        return False
+    raise ValueError(f"Not a boolean: {raw}")
+
+def ParseLength(raw):
+    raw = str(raw).strip()
+    if raw.endswith("%"):
+        return Length(float(StripUnits(raw)), "%")
+    return Length(float(StripUnits(raw)), "px")
+
+def ParseColor(raw):
+    raw = str(raw).strip()
+    qcolor = QColor(raw)
+    if not qcolor.isValid():
+        raise ValueError(f"Not a color: {raw}")
+    return Color(raw, qcolor, qcolor.rgba())
+
+PARSERS = {
+    "str": lambda raw: raw,
+    "int": ParseInt,
+    "float": ParseFloat,
+    "bool": ParseBool,
+    "length": ParseLength,
+    "color": ParseColor,
+}
+
+# ==========[> Schemas
+# section -> {key: (type, default)}
+# Defaults are the fallbacks the consumers used before (None = consumer decides, e.g. theme globals)
+# Widgets keep their own schemas next to their code
+
+THEME_SCHEMA = {
+    "Global": {
+        "font_family": ("str", "Segoe UI"),
+        "font_color": ("color", "#FFFFFF"),
+        "font_size": ("int", 12),
+        "font_shadow": ("bool", True),
+    },
+    "Desktop": {
+        "wallpaper_path": ("str", ""),
+        "wallpaper_mode": ("str", "cover"),
+        "wallpaper_carousel": ("bool", True),
+        "carousel_interval_min": ("float", 15),
+        "carousel_shuffle": ("bool", False),
+        "wallpaper_transition_ms": ("int", 500),
+        "active_widgets": ("str", ""),
+        "sandboxed_widgets": ("str", ""),
+    },
+    "Taskbar": {
+        "orientation": ("str", "horizontal"),
+        "width": ("length", "90"),
+        "height": ("length", "30"),
+        "position_x": ("int", 98),
+        "position_y": ("int", 2),
+        "anchor_x": ("int", 50),
+        "anchor_y": ("int", 100),
+        "border_radius_px": ("int", 10),
+        "border_width_px": ("int", 1),
+        "argb_border_color": ("color", "#FFFFFF33"),
+        "argb_color": ("color", "#000000"),
+        "blur_enabled": ("bool", False),
+        "blur_mode": ("int", 4),
+        "active_widgets": ("str", ""),
+        "sandboxed_widgets": ("str", ""),
+    },
+    "PowerMenu": {
+        "fullscreen": ("bool", True),
+        "use_bg_color": ("bool", False),
+        "menu_layout": ("str", "horizontal"),
+        "width": ("int", 600),
+        "height": ("int", 200),
+        "argb_container_color": ("color", "#00000080"),
+        "double_container_bg": ("bool", False),
+        "double_container_bg_accent": ("str", "bg"),
+        "argb_background_color": ("color", "#00000080"),
+        "blur_enabled": ("bool", True),
+        "blur_mode": ("int", 0),
+        "margins": ("int", 0),
+        "paddings": ("int", 10),
+        "button_size": ("int", 80),
+        "argb_border_color": ("color", "#00000080"),
+        "border_radius": ("int", 10),
+        "border_width_px": ("int", 1),
+        "spacing": ("int", 50),
+        "icons_dir": ("str", ""),
+        "button_color": ("str", "transparent"),
+        "hover_color": ("str", "#FFFFFF20"),
+        "pressed_color": ("str", "#FFFFFF40"),
+        "button_border": ("int", 0),
+    },
+}
+
+APP_SCHEMA = {
+    "App": {
+        "language": ("str", "uk"),
+        "version": ("str", ""),
+    },
+    "Performance": {
+        "use_gpu": ("bool", True),
+        "msaa_samples": ("int", 0),
+        "target_fps": ("int", 60),
+        "global_effects_enabled": ("bool", True),
+        "wallpaper_disk_cache_mb": ("int", 512),
+        "wallpaper_cache_mb": ("int", 128),
+    },
+    "Widgets": {
+        "load_workers": ("int", 4),
+        "load_budget_ms": ("int", 250),
+        "defer_slow": ("bool", True),
+    },
+    "Desktop": {
+        "grid_cell_size": ("int", 80),
+        "grid_gap": ("int", 10),
+        "icon_size": ("int", 48),
+        "show_grid_hints": ("bool", True),
+        "icon_render_mode": ("str", "widgets"),
+    },
+    "Animation": {
+        "duration_ms": ("int", 300),
+        "easing_curve": ("str", "out_cubic"),
+    },
+    "Theme": {
+        "current_theme": ("str", "default"),
+    },
+    "Audio": {
+        "backend": ("str", "auto"),
+        "wav_path": ("str", ""),
+        "sample_rate": ("int", 48000),
+        "fft_size": ("int", 2048),
+        "analysis_fps": ("int", 60),
+        "buffer_ms": ("int", 1000),
+    },
+    "Profiler": {
+        "enabled": ("bool", False),
+        "frame_buffer": ("int", 240),
+        "dump_dir": ("str", "userdata\\logs\\profiles"),
+    },
+    "Logging": {
+        "level": ("str", "info"),
+        "console": ("bool", True),
+        "file": ("bool", True),
+        "file_path": ("str", "userdata\\logs\\ninawe.log"),
+        "max_file_kb": ("int", 1024),
+        "backups": ("int", 3),
+    },
+}
+
+# ==========[> Snapshot
+
+# Section value types (namedtuple per schema section: immutable, plain attribute access)
+sectionTypes = {}
+
+def GetSectionType(section, keys):
+    cacheKey = (section, tuple(keys))
+    sectionType = sectionTypes.get(cacheKey)
+    if sectionType is None:
+        sectionType = namedtuple(section.replace(".", "_") + "Config", keys)
+        sectionTypes[cacheKey] = sectionType
+    return sectionType
+
+# Immutable typed view of a config file, rebuilt on every load
+# Sections are attributes (snapshot.Taskbar.argb_color), see Section() for dotted names
+class ConfigSnapshot:
+    def __init__(self, revision, sections, presentSections):
+        object.__setattr__(self, "revision", revision)
+        object.__setattr__(self, "sections", MappingProxyType(sections))
+        object.__setattr__(self, "presentSections", frozenset(presentSections))
+        for name, values in sections.items():
+            if name.isidentifier():
+                object.__setattr__(self, name, values)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("Config snapshot is read-only")
+
+    def __delattr__(self, key):
+        raise AttributeError("Config snapshot is read-only")
+
+    def Section(self, name):
+        return self.sections[name]
+
+    # Section exists in the file (not only schema defaults)
+    def HasSection(self, name):
+        return name in self.presentSections
+
+# ***info***
+# Parses every schema key once
+# parser - configparser with loaded data
+# schema - THEME_SCHEMA / APP_SCHEMA
+# revision - number consumers compare to skip re-applying the same data
+# Broken values fall back to the schema default (with a log line)
+# **********
+def BuildSnapshot(parser, schema, revision):
+    sections = {}
+    presentSections = []
+
+    for section, keys in schema.items():
+        present = parser.has_section(section)
+        if present:
+            presentSections.append(section)
+        values = []
+
+        for key, (valueType, default) in keys.items():
+            parse = PARSERS[valueType]
+            value = parse(default) if isinstance(default, str) else default
+
+            if present and parser.has_option(section, key):
+                raw = parser.get(section, key)
+                try:
+                    value = parse(raw)
+                except (ValueError, TypeError):
+                    log.Warning(f"Invalid {valueType} value [{section}] {key} = {raw}, using default.")
+
+            values.append(value)
+
+        sections[section] = GetSectionType(section, keys)(*values)
+
+    return ConfigSnapshot(revision, sections, presentSections)
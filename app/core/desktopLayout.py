@@ -0,0 +1,115 @@
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtWidgets import QApplication
+import json
+import os
+from core.logger import GetLogger
+
+log = GetLogger("DesktopLayout")
+
+# In-memory owner of desktopdata.json.
+# Changes are coalesced over a short debounce window and written atomically (temp file + rename),
+# and only if the serialized content is really different from what is on disk.
+class DesktopLayoutStore(QObject):
+    def __init__(self, jsonPath, debounceMs = 500, parent = None):
+        super().__init__(parent)
+        self.jsonPath = jsonPath
+        self.data = {"desktop": []}
+        # path -> item data
+        self.itemsByPath = {}
+        # Last content written to (or read from) disk
+        self.savedText = None
+
+        self.saveTimer = QTimer(self)
+        self.saveTimer.setSingleShot(True)
+        self.saveTimer.setInterval(debounceMs)
+        self.saveTimer.timeout.connect(self.Flush)
+
+        # Pending changes must not be lost on exit
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.Flush)
+
+    def Serialize(self):
+        return json.dumps(self.data, indent = 4, ensure_ascii = False)
+
+    def Load(self):
+        self.data = {"desktop": []}
+        if os.path.exists(self.jsonPath):
+            try:
+                with open(self.jsonPath, "r", encoding = "utf-8") as f:
+                    self.data = json.load(f)
+            except Exception as e:
+                log.Warning(f"Failed to read JSON: {e}")
+
+        self.data.setdefault("desktop", [])
+        self.RebuildIndex()
+        self.savedText = self.Serialize()
+        return self.data
+
+    def RebuildIndex(self):
+        self.itemsByPath = {item["path"]: item for item in self.data["desktop"] if "path" in item}
+
+    def Items(self):
+        return self.data["desktop"]
+
+    def Get(self, path):
+        return self.itemsByPath.get(path)
+
+    def SetItems(self, items):
+        self.data["desktop"] = items
+        self.RebuildIndex()
+        self.ScheduleSave()
+
+    def Add(self, item):
+        self.data["desktop"].append(item)
+        self.itemsByPath[item["path"]] = item
+        self.ScheduleSave()
+
+    def Remove(self, path):
+        item = self.itemsByPath.pop(path, None)
+        if item is None:
+            return
+        self.data["desktop"].remove(item)
+        self.ScheduleSave()
+
+    def Rename(self, oldPath, newPath):
+        item = self.itemsByPath.pop(oldPath, None)
+        if item is None:
+            return
+        item["path"] = newPath
+        item["name"] = os.path.basename(newPath)
+        self.itemsByPath[newPath] = item
+        self.ScheduleSave()
+
+    def SetPosition(self, path, gridX, gridY):
+        item = self.itemsByPath.get(path)
+        if item is None:
+            return
+        item["position"] = [gridX, gridY]
+        self.ScheduleSave()
+
+    def ScheduleSave(self):
+        # Restarting timer -> one write after the last change of a burst
+        self.saveTimer.start()
+
+    def Flush(self):
+        self.saveTimer.stop()
+
+        text = self.Serialize()
+        if text == self.savedText:
+            return
+
+        tempPath = self.jsonPath + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.jsonPath), exist_ok = True)
+            with open(tempPath, "w", encoding = "utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tempPath, self.jsonPath)
+        except OSError as e:
+            log.Warning(f"Failed to save {self.jsonPath}: {e}")
+            return
+
+        self.savedText = text
+        log.Debug(f"Saved {len(self.data['desktop'])} items.")
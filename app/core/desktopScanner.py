@@ -0,0 +1,63 @@
+import os
+from core.logger import GetLogger
+
+log = GetLogger("DesktopScanner")
+
+# Files that never appear on the desktop
+IGNORED_NAMES = ("desktop.ini",)
+
+# ***info***
+# Reads directory entries with the stat data that os.scandir already has
+# Returns dict: full path -> (file id, mtime_ns, is directory)
+# File id (inode / NTFS file index) + mtime is used to detect renames
+# **********
+def ScanDirectory(path):
+    entries = {}
+    try:
+        with os.scandir(path) as iterator:
+            for entry in iterator:
+                if entry.name.startswith(".") or entry.name.lower() in IGNORED_NAMES:
+                    continue
+                try:
+                    stat = entry.stat(follow_symlinks = False)
+                    fileID = entry.inode() or None
+                except OSError:
+                    continue
+                entries[entry.path] = (fileID, stat.st_mtime_ns, entry.is_dir(follow_symlinks = False))
+    except OSError as e:
+        log.Warning(f"Failed to scan {path}: {e}")
+    return entries
+
+# ***info***
+# Compares two ScanDirectory results
+# Returns (added paths, removed paths, renamed [(old path, new path)], modified paths)
+# Modified - same path with a new mtime or file id (edited, or replaced by another file)
+# **********
+def DiffEntries(oldEntries, newEntries):
+    added = [path for path in newEntries if path not in oldEntries]
+    removed = [path for path in oldEntries if path not in newEntries]
+    modified = [path for path in newEntries if path in oldEntries and newEntries[path][:2] != oldEntries[path][:2]]
+
+    # Same file id and mtime on both sides -> rename, not remove + add
+    # (mtime check protects from file ids reused by a new file right after a delete)
+    removedByID = {}
+    for path in removed:
+        fileID, mtime, _ = oldEntries[path]
+        if fileID is not None:
+            removedByID[(fileID, mtime)] = path
+
+    renamed = []
+    for path in added:
+        fileID, mtime, _ = newEntries[path]
+        if fileID is None:
+            continue
+        oldPath = removedByID.pop((fileID, mtime), None)
+        if oldPath is not None:
+            renamed.append((oldPath, path))
+
+    renamedOld = {oldPath for oldPath, _ in renamed}
+    renamedNew = {newPath for _, newPath in renamed}
+    added = [path for path in added if path not in renamedNew]
+    removed = [path for path in removed if path not in renamedOld]
+
+    return added, removed, renamed, modified
@@ -0,0 +1,169 @@
+from PyQt6.QtCore import QObject, QTimer, QFileSystemWatcher, pyqtSignal
+import os
+from core.logger import GetLogger
+
+log = GetLogger("FileWatcher")
+
+# Quiet period after the last event before changes are dispatched
+DEBOUNCE_MS = 150
+
+# ***info***
+# One watcher for all config-like files (config.ini, themeconfig.ini, widget configs, powermenudata.json)
+# - bursts of events (truncate + write, several writes per save) are merged into one update per quiet period
+# - atomic saves (write temp + rename over) drop the path from QFileSystemWatcher, it is re-armed
+#   (through the parent directory if the file is missing for a moment)
+# - files are compared by (mtime, size), events without a real change are skipped
+# Callbacks get the list of their changed paths, once per quiet period
+# **********
+class FileWatchService(QObject):
+    # All changed paths of one quiet period
+    filesChanged = pyqtSignal(list)
+
+    def __init__(self, debounceMs = DEBOUNCE_MS, parent = None):
+        super().__init__(parent)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.OnPathEvent)
+        self.watcher.directoryChanged.connect(self.OnDirectoryEvent)
+
+        # path -> [callbacks]
+        self.callbacks = {}
+        # path -> (mtime_ns, size) or None if missing
+        self.signatures = {}
+        # paths with events in the current burst
+        self.pendingPaths = set()
+        # directory -> number of watched files inside it
+        self.directories = {}
+
+        self.debounceTimer = QTimer(self)
+        self.debounceTimer.setSingleShot(True)
+        self.debounceTimer.setInterval(debounceMs)
+        self.debounceTimer.timeout.connect(self.Flush)
+
+        self.eventCount = 0
+        self.dispatchCount = 0
+
+    def Watch(self, path, callback, owner = None):
+        path = os.path.abspath(path)
+        callbacks = self.callbacks.setdefault(path, [])
+        if callback not in callbacks:
+            callbacks.append(callback)
+
+        if path not in self.signatures:
+            self.signatures[path] = self.GetSignature(path)
+            self.Arm(path)
+
+            directory = os.path.dirname(path)
+            self.directories[directory] = self.directories.get(directory, 0) + 1
+            if os.path.isdir(directory) and directory not in self.watcher.directories():
+                self.watcher.addPath(directory)
+
+        # Watch ends together with the owner object (widgets reloaded by WidgetManager)
+        if owner is not None:
+            owner.destroyed.connect(lambda *args, path = path, callback = callback: self.Unwatch(path, callback))
+
+        log.Debug(f"Watching: {path}")
+
+    def Unwatch(self, path, callback = None):
+        path = os.path.abspath(path)
+        callbacks = self.callbacks.get(path)
+        if callbacks is None:
+            return
+
+        if callback is not None and callback in callbacks:
+            callbacks.remove(callback)
+        if callback is not None and callbacks:
+            return
+
+        del self.callbacks[path]
+        self.signatures.pop(path, None)
+        self.pendingPaths.discard(path)
+        if path in self.watcher.files():
+            self.watcher.removePath(path)
+
+        directory = os.path.dirname(path)
+        self.directories[directory] = self.directories.get(directory, 1) - 1
+        if self.directories[directory] <= 0:
+            del self.directories[directory]
+            if directory in self.watcher.directories():
+                self.watcher.removePath(directory)
+
+    def GetSignature(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    # (Re)adding the file to the watcher (it is dropped after delete/rename)
+    def Arm(self, path):
+        if path not in self.watcher.files() and os.path.exists(path):
+            self.watcher.addPath(path)
+
+    def OnPathEvent(self, path):
+        path = os.path.abspath(path)
+        if path not in self.callbacks:
+            return
+
+        self.eventCount += 1
+        self.pendingPaths.add(path)
+        self.Arm(path)
+        # Restarting timer -> one dispatch after the last event of a burst
+        self.debounceTimer.start()
+
+    # Atomic saves: file replaced by rename shows up as a directory change
+    def OnDirectoryEvent(self, directory):
+        for path in self.callbacks:
+            if os.path.dirname(path) != directory:
+                continue
+            if self.GetSignature(path) != self.signatures.get(path):
+                self.OnPathEvent(path)
+
+    def Flush(self):
+        changedPaths = []
+        for path in sorted(self.pendingPaths):
+            self.Arm(path)
+            signature = self.GetSignature(path)
+
+            # Missing file: save is still in progress, waiting for the directory event
+            if signature is None:
+                continue
+            if signature == self.signatures.get(path):
+                continue
+
+            self.signatures[path] = signature
+            changedPaths.append(path)
+        self.pendingPaths.clear()
+
+        if not changedPaths:
+            return
+
+        self.dispatchCount += 1
+        log.Info(f"{len(changedPaths)} files changed ({self.eventCount} events, {self.dispatchCount} dispatches so far)")
+
+        # Each callback once, with all of its changed paths
+        calls = {}
+        for path in changedPaths:
+            for callback in self.callbacks.get(path, ()):
+                calls.setdefault(callback, []).append(path)
+
+        for callback, paths in calls.items():
+            try:
+                callback(paths)
+            except RuntimeError:
+                # Owner widget was deleted
+                for path in paths:
+                    self.Unwatch(path, callback)
+            except Exception as e:
+                # One failing subscriber must not cost the others (and filesChanged) their reload
+                log.Exception(f"Callback for {paths} failed: {e}")
+
+        self.filesChanged.emit(changedPaths)
+
+fileWatchService = None
+
+# Shared service (created on first use)
+def GetFileWatchService():
+    global fileWatchService
+    if fileWatchService is None:
+        fileWatchService = FileWatchService()
+    return fileWatchService
@@ -0,0 +1,125 @@
+from PyQt6.QtCore import QObject, QAbstractNativeEventFilter, pyqtSignal
+from PyQt6.QtWidgets import QApplication
+import ctypes
+import os
+from core.logger import GetLogger
+
+log = GetLogger("Hotkeys")
+
+WM_HOTKEY = 0x0312
+
+MODIFIERS = {
+    "alt": 0x0001,
+    "ctrl": 0x0002,
+    "control": 0x0002,
+    "shift": 0x0004,
+    "win": 0x0008,
+}
+MOD_NOREPEAT = 0x4000
+
+# Named keys (letters/digits are their ASCII codes, F1-F24 are calculated)
+VIRTUAL_KEYS = {
+    "left": 0x25, "up": 0x26, "right": 0x27, "down": 0x28,
+    "space": 0x20, "enter": 0x0D, "tab": 0x09, "esc": 0x1B, "escape": 0x1B,
+    "backspace": 0x08, "delete": 0x2E, "insert": 0x2D,
+    "home": 0x24, "end": 0x23, "pageup": 0x21, "pagedown": 0x22,
+}
+
+# ***info***
+# "Win+Alt+Right" -> (modifiers, virtual key) or None
+# Modifier-only sequences ("Win") can't be registered as system hotkeys
+# **********
+def ParseHotkey(sequence):
+    modifiers = 0
+    virtualKey = None
+
+    for part in sequence.replace(" ", "").lower().split("+"):
+        if part in MODIFIERS:
+            modifiers |= MODIFIERS[part]
+        elif part in VIRTUAL_KEYS:
+            virtualKey = VIRTUAL_KEYS[part]
+        elif len(part) == 1 and part.isalnum():
+            virtualKey = ord(part.upper())
+        elif part.startswith("f") and part[1:].isdigit() and 1 <= int(part[1:]) <= 24:
+            virtualKey = 0x6F + int(part[1:])
+        else:
+            return None
+
+    if virtualKey is None:
+        return None
+    return modifiers, virtualKey
+
+# Receives WM_HOTKEY from the Qt event loop
+class HotkeyEventFilter(QAbstractNativeEventFilter):
+    def __init__(self, manager):
+        super().__init__()
+        self.manager = manager
+
+    def nativeEventFilter(self, eventType, message):
+        if eventType == b"windows_generic_MSG":
+            from ctypes.wintypes import MSG
+            msg = MSG.from_address(int(message))
+            if msg.message == WM_HOTKEY:
+                self.manager.OnHotkey(msg.wParam)
+                return True, 0
+        return False, 0
+
+# ***info***
+# System-wide hotkeys (RegisterHotKey), names come from config.ini [Hotkeys.*] sections
+# triggered(name) is emitted on the GUI thread. Does nothing on non-Windows platforms.
+# **********
+class HotkeyManager(QObject):
+    triggered = pyqtSignal(str)
+
+    def __init__(self, parent = None):
+        super().__init__(parent)
+        # hotkey id -> name
+        self.hotkeys = {}
+        self.nextID = 1
+        self.enabled = os.name == "nt"
+        self.eventFilter = None
+
+        if self.enabled:
+            self.user32 = ctypes.windll.user32
+            self.eventFilter = HotkeyEventFilter(self)
+            QApplication.instance().installNativeEventFilter(self.eventFilter)
+        else:
+            log.Warning("System hotkeys are available only on Windows.")
+
+    def Register(self, name, sequence):
+        parsed = ParseHotkey(sequence)
+        if parsed is None:
+            log.Warning(f"Can't register {name} = {sequence} (unsupported key combination)")
+            return False
+        if not self.enabled:
+            return False
+
+        modifiers, virtualKey = parsed
+        hotkeyID = self.nextID
+        # Thread-level hotkey (no window), WM_HOTKEY goes to the GUI thread queue
+        if not self.user32.RegisterHotKey(None, hotkeyID, modifiers | MOD_NOREPEAT, virtualKey):
+            log.Warning(f"{name} = {sequence} is already taken by another program")
+            return False
+
+        self.nextID += 1
+        self.hotkeys[hotkeyID] = name
+        log.Debug(f"Registered: {name} = {sequence}")
+        return True
+
+    # All keys of the section (config - AppConfig)
+    def RegisterSection(self, config, section):
+        if not config.GetSectionStatus(section):
+            return
+        for name, sequence in config.parser.items(section):
+            self.Register(name, sequence)
+
+    def UnregisterAll(self):
+        if self.enabled:
+            for hotkeyID in self.hotkeys:
+                self.user32.UnregisterHotKey(None, hotkeyID)
+        self.hotkeys.clear()
+
+    def OnHotkey(self, hotkeyID):
+        name = self.hotkeys.get(hotkeyID)
+        if name is not None:
+            self.triggered.emit(name)
@@ -0,0 +1,208 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, QFileInfo, pyqtSignal
+from PyQt6.QtGui import QImage, QPixmap
+from PyQt6.QtWidgets import QFileIconProvider
+from core.config import config as themeConfig
+from core.logger import GetLogger
+import threading
+import hashlib
+import os
+
+log = GetLogger("IconProvider")
+
+ICON_SIZE = 48
+# Icons processed per GUI tick (QFileIconProvider is GUI thread only)
+ICONS_PER_TICK = 8
+# Files with their own icons, everything else shares icon by extension
+PER_FILE_ICON_EXTENSIONS = (".exe", ".ico", ".lnk", ".url", ".cur", ".ani", ".msc", ".scr", ".cpl", ".dll")
+
+# ==========[> Shortcut resolvers
+
+comThreads = threading.local()
+
+# Default resolver (Windows only), returns target path or None
+def ResolveShortcutWin32(path):
+    import win32com.client
+
+    # COM has to be initialized once per worker thread
+    if not getattr(comThreads, "initialized", False):
+        import pythoncom
+        pythoncom.CoInitialize()
+        comThreads.initialized = True
+
+    shell = win32com.client.Dispatch("WScript.Shell")
+    target = shell.CreateShortCut(path).Targetpath
+    return target or None
+
+# Stub resolver for platforms without COM (icons of .lnk files are used as is)
+def ResolveShortcutStub(path):
+    return None
+
+shortcutResolver = ResolveShortcutWin32 if os.name == "nt" else ResolveShortcutStub
+
+def SetShortcutResolver(resolver):
+    global shortcutResolver
+    shortcutResolver = resolver
+
+# ==========[> Icon keys
+
+# Returns (cache key, path that should be asked for the icon)
+# Per-file icons and folders are keyed on the mtime of the icon path (shortcut target, not the .lnk),
+# so an edited target gets a new memory/disk cache entry instead of the old icon
+def GetIconKey(filepath):
+    iconPath = filepath
+
+    if filepath.lower().endswith(".lnk"):
+        try:
+            target = shortcutResolver(filepath)
+            if target and os.path.exists(target):
+                iconPath = target
+        except Exception as exc:
+            log.Warning(f"Failed to resolve shortcut {filepath}: {exc}")
+
+    try:
+        stat = os.stat(iconPath)
+    except OSError:
+        return f"missing|{os.path.splitext(iconPath)[1].lower()}", iconPath
+
+    if os.path.isdir(iconPath):
+        return f"dir|{iconPath}|{stat.st_mtime_ns}", iconPath
+
+    extension = os.path.splitext(iconPath)[1].lower()
+    if extension in PER_FILE_ICON_EXTENSIONS:
+        return f"file|{iconPath}|{stat.st_mtime_ns}", iconPath
+
+    return f"ext|{extension}", iconPath
+
+# ==========[> Worker side
+
+class IconTaskSignals(QObject):
+    finished = pyqtSignal(str, str, str, QImage)
+
+class IconTask(QRunnable):
+    def __init__(self, filepath, cacheDir):
+        super().__init__()
+        self.filepath = filepath
+        self.cacheDir = cacheDir
+        self.signals = IconTaskSignals()
+
+    def run(self):
+        key, iconPath = GetIconKey(self.filepath)
+
+        # Disk cache hit can be loaded right here, QImage is thread safe
+        image = QImage()
+        cacheFile = GetIconCacheFile(self.cacheDir, key)
+        if os.path.exists(cacheFile):
+            image.load(cacheFile)
+
+        self.signals.finished.emit(self.filepath, key, iconPath, image)
+
+def GetIconCacheFile(cacheDir, key):
+    return os.path.join(cacheDir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".png")
+
+# ==========[> Service
+
+# Asynchronous icon resolution with memory + disk cache.
+# Request() returns placeholder (or cached icon) immediately, callback gets the real icon later.
+class IconService(QObject):
+    def __init__(self, parent = None):
+        super().__init__(parent)
+        self.cacheDir = themeConfig.app.GetPath("userdata\\cache\\icons")
+
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+
+        self.provider = QFileIconProvider()
+        self.placeholder = self.provider.icon(QFileIconProvider.IconType.File).pixmap(ICON_SIZE, ICON_SIZE)
+
+        # cache key -> pixmap
+        self.icons = {}
+        # filepath -> cache key (last resolved)
+        self.keys = {}
+        # filepath -> [callbacks]
+        self.waiting = {}
+        # running tasks (keeping signals alive)
+        self.tasks = {}
+        # (filepath, key, icon path) waiting for QFileIconProvider
+        self.providerQueue = []
+
+        self.providerTimer = QTimer(self)
+        self.providerTimer.setInterval(0)
+        self.providerTimer.timeout.connect(self.ProcessProviderQueue)
+
+    def Request(self, filepath, callback):
+        key = self.keys.get(filepath)
+        if key is not None and key in self.icons:
+            return self.icons[key]
+
+        self.waiting.setdefault(filepath, []).append(callback)
+
+        if filepath not in self.tasks:
+            task = IconTask(filepath, self.cacheDir)
+            task.signals.finished.connect(self.OnTaskFinished)
+            self.tasks[filepath] = task
+            self.pool.start(task)
+
+        return self.placeholder
+
+    # File changed (renamed, edited), next Request resolves it again (desktop folder sync)
+    def Invalidate(self, filepath):
+        self.keys.pop(filepath, None)
+
+    def OnTaskFinished(self, filepath, key, iconPath, image):
+        self.tasks.pop(filepath, None)
+        self.keys[filepath] = key
+
+        if key in self.icons:
+            self.Deliver(filepath, self.icons[key])
+            return
+
+        if not image.isNull():
+            pixmap = QPixmap.fromImage(image)
+            self.icons[key] = pixmap
+            self.Deliver(filepath, pixmap)
+            return
+
+        self.providerQueue.append((filepath, key, iconPath))
+        if not self.providerTimer.isActive():
+            self.providerTimer.start()
+
+    def ProcessProviderQueue(self):
+        batch = self.providerQueue[:ICONS_PER_TICK]
+        del self.providerQueue[:ICONS_PER_TICK]
+
+        for filepath, key, iconPath in batch:
+            pixmap = self.icons.get(key)
+            if pixmap is None:
+                pixmap = self.provider.icon(QFileInfo(iconPath)).pixmap(ICON_SIZE, ICON_SIZE)
+                self.icons[key] = pixmap
+                self.SaveToDisk(key, pixmap)
+            self.Deliver(filepath, pixmap)
+
+        if not self.providerQueue:
+            self.providerTimer.stop()
+
+    def SaveToDisk(self, key, pixmap):
+        if pixmap.isNull():
+            return
+        try:
+            os.makedirs(self.cacheDir, exist_ok = True)
+            pixmap.save(GetIconCacheFile(self.cacheDir, key), "PNG")
+        except OSError as e:
+            log.Warning(f"Failed to save icon cache: {e}")
+
+    def Deliver(self, filepath, pixmap):
+        for callback in self.waiting.pop(filepath, []):
+            try:
+                callback(pixmap)
+            except RuntimeError:
+                # Widget was deleted while icon was loading
+                pass
+
+iconService = None
+
+# Shared service (created on first use, QApplication must exist)
+def GetIconService():
+    global iconService
+    if iconService is None:
+        iconService = IconService()
+    return iconService
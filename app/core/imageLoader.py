@@ -0,0 +1,117 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QSize, Qt, pyqtSignal
+from PyQt6.QtGui import QImage, QImageReader, QPixmap
+from core.logger import GetLogger
+
+log = GetLogger("ImageLoader")
+
+# Wallpaper modes -> Qt aspect ratio modes
+ASPECT_MODES = {
+    "cover": Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+    "contain": Qt.AspectRatioMode.KeepAspectRatio,
+}
+
+# ***info***
+# Decodes and scales image in one step. Safe to call from any thread (QImage only, no QPixmap).
+# path - image file
+# targetSize - QSize of the workspace
+# mode - cover / contain / anything else = stretch
+# **********
+def ScaleImage(path, targetSize, mode):
+    reader = QImageReader(path)
+    sourceSize = reader.size()
+
+    # Letting the decoder scale while decoding (JPEG can skip most of the work this way)
+    if sourceSize.isValid() and not targetSize.isEmpty():
+        aspectMode = ASPECT_MODES.get(mode, Qt.AspectRatioMode.IgnoreAspectRatio)
+        reader.setScaledSize(sourceSize.scaled(targetSize, aspectMode))
+
+    image = reader.read()
+    if image.isNull():
+        log.Warning(f"Failed to decode {path}: {reader.errorString()}")
+        return image
+
+    # Premultiplied format makes QPixmap.fromImage and blitting cheap on the GUI thread
+    return image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+
+# Same as ScaleImage, but going through the on-disk cache of scaled wallpapers first (if it is set)
+def LoadScaledImage(path, targetSize, mode, cache = None):
+    if cache is not None:
+        image = cache.Get(path, targetSize, mode)
+        if image is not None:
+            return image
+
+    image = ScaleImage(path, targetSize, mode)
+
+    if cache is not None:
+        cache.Put(path, targetSize, mode, image)
+
+    return image
+
+class ScaleTaskSignals(QObject):
+    finished = pyqtSignal(object, QImage)
+
+class ScaleTask(QRunnable):
+    def __init__(self, key, cache = None):
+        super().__init__()
+        self.key = key
+        self.cache = cache
+        self.signals = ScaleTaskSignals()
+
+    def run(self):
+        path, width, height, mode = self.key
+        image = LoadScaledImage(path, QSize(width, height), mode, self.cache)
+        self.signals.finished.emit(self.key, image)
+
+# Background decode/scale pipeline for the wallpapers
+class WallpaperLoader(QObject):
+    # Signals
+    wallpaperReady = pyqtSignal(str, QPixmap)
+
+    def __init__(self, parent = None, cache = None):
+        super().__init__(parent)
+        self.pool = QThreadPool.globalInstance()
+        self.cache = cache
+
+        # key -> running task (keeping the signals object alive)
+        self.pending = {}
+        # key -> finished pixmap
+        self.ready = {}
+
+    def MakeKey(self, path, size, mode):
+        return (path, size.width(), size.height(), mode)
+
+    def Prefetch(self, path, size, mode):
+        key = self.MakeKey(path, size, mode)
+        if key in self.pending or key in self.ready:
+            return
+
+        task = ScaleTask(key, self.cache)
+        task.signals.finished.connect(self.OnTaskFinished)
+        self.pending[key] = task
+        self.pool.start(task)
+
+    def IsPending(self, path, size, mode):
+        return self.MakeKey(path, size, mode) in self.pending
+
+    # Returns prefetched pixmap (and forgets it) or None if it is not ready yet
+    def Take(self, path, size, mode):
+        return self.ready.pop(self.MakeKey(path, size, mode), None)
+
+    def Clear(self):
+        # Running tasks can't be cancelled, their results are just dropped
+        self.pending.clear()
+        self.ready.clear()
+
+    def OnTaskFinished(self, key, image):
+        # Result of a cleared request
+        if self.pending.pop(key, None) is None:
+            return
+
+        # Failed decode still reports back (as null pixmap) so nobody waits for it forever
+        if image.isNull():
+            self.wallpaperReady.emit(key[0], QPixmap())
+            return
+
+        pixmap = QPixmap.fromImage(image)
+        self.ready[key] = pixmap
+        self.wallpaperReady.emit(key[0], pixmap)
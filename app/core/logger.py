@@ -0,0 +1,312 @@
+import threading
+import traceback
+import queue
+import atexit
+import json
+import time
+import sys
+import os
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR}
+LEVEL_KEYS = {value: key for key, value in LEVELS.items()}
+# Console tags (info keeps the old [Log] look)
+LEVEL_NAMES = {DEBUG: "Debug", INFO: "Log", WARNING: "Warning", ERROR: "Error"}
+
+# Records waiting for the writer thread, everything above is dropped (and counted) instead of blocking
+LOG_QUEUE_SIZE = 4096
+# Records written per console/file write
+LOG_BATCH_SIZE = 256
+# Records kept for the log file until its path is known (config.ini is read after the first messages)
+EARLY_RECORDS = 1024
+# Set to the widget name in sandboxed widget processes (see widgetHost.RunWidgetProcess)
+WIDGET_PROCESS_ENV = "NINAWE_WIDGET_PROCESS"
+
+# ***info***
+# Settings of the writer (values of [Logging] in config.ini)
+# level - default level, levels - subsystem -> level ("ConfigManager", "Taskbar.Clock", ...)
+# filePath - log file (None = console only), maxBytes/backups - rotation
+# **********
+class LogSettings:
+    def __init__(self, level = INFO, levels = None, console = True, filePath = None, maxBytes = 1024 * 1024, backups = 3):
+        self.level = level
+        self.levels = levels or {}
+        self.console = console
+        self.filePath = filePath
+        self.maxBytes = maxBytes
+        self.backups = backups
+
+def ParseLevel(value, fallback = INFO):
+    return LEVELS.get(str(value).strip().lower(), fallback)
+
+# ***info***
+# Console + rotating file output on a background thread
+# - Logger calls only put a tuple into a bounded queue (no console/file writes on the GUI thread)
+# - full queue drops records, the number of dropped ones is written with the next batch
+# - console gets the old "[Log] [Subsystem] | message" lines, the file gets JSON lines
+# **********
+class LogService:
+    def __init__(self, queueSize = LOG_QUEUE_SIZE):
+        self.queue = queue.Queue(queueSize)
+        self.settings = LogSettings()
+        self.loggers = {}
+        self.loggersLock = threading.Lock()
+
+        self.thread = None
+        self.threadLock = threading.Lock()
+        self.dropped = 0
+
+        # Writer thread state
+        self.logFile = None
+        self.logFileSize = 0
+        self.earlyRecords = []
+        self.configured = False
+
+    # ==========[> Loggers
+
+    def GetLogger(self, name):
+        logger = self.loggers.get(name)
+        if logger is None:
+            with self.loggersLock:
+                logger = self.loggers.get(name)
+                if logger is None:
+                    logger = Logger(self, name)
+                    self.loggers[name] = logger
+        return logger
+
+    # Most specific configured level: "Taskbar.Clock" -> "Taskbar" -> default
+    # (names are compared in lower case, configparser keys are lower case)
+    def GetLevel(self, name):
+        levels = self.settings.levels
+        name = name.lower()
+        while name:
+            if name in levels:
+                return levels[name]
+            name = name.rpartition(".")[0]
+        return self.settings.level
+
+    def Configure(self, settings):
+        self.settings = settings
+        with self.loggersLock:
+            for logger in self.loggers.values():
+                logger.level = self.GetLevel(logger.name)
+        # File changes are applied by the writer thread (in order with the records before them)
+        self.Put(("configure", settings), block = True)
+
+    # ==========[> Queue
+
+    def Put(self, item, block = False):
+        if self.thread is None:
+            self.Start()
+        try:
+            self.queue.put(item, block, 1.0 if block else None)
+        except queue.Full:
+            self.dropped += 1
+
+    def Start(self):
+        with self.threadLock:
+            if self.thread is not None:
+                return
+            self.thread = threading.Thread(target = self.Run, name = "NinaweLog", daemon = True)
+            self.thread.start()
+            atexit.register(self.Close)
+
+    # Writes everything that is queued and stops the thread (exit)
+    def Close(self):
+        if self.thread is None or not self.thread.is_alive():
+            return
+        try:
+            self.queue.put(None, True, 1.0)
+        except queue.Full:
+            return
+        self.thread.join(2.0)
+
+    # ==========[> Writer thread
+
+    def Run(self):
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            while len(batch) < LOG_BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            records = []
+            for item in batch:
+                if item is None:
+                    running = False
+                elif item[0] == "configure":
+                    self.Write(records)
+                    records = []
+                    self.ApplySettings(item[1])
+                else:
+                    records.append(item)
+
+            if self.dropped:
+                dropped, self.dropped = self.dropped, 0
+                records.append(("record", time.time(), WARNING, "Logger", f"{dropped} messages dropped (queue is full)", threading.current_thread().name, None))
+
+            self.Write(records)
+
+        if self.logFile is not None:
+            self.logFile.close()
+            self.logFile = None
+
+    def Write(self, records):
+        if not records:
+            return
+        settings = self.settings
+
+        if settings.console and sys.stdout is not None:
+            try:
+                sys.stdout.write("".join(self.FormatConsole(record) for record in records))
+                sys.stdout.flush()
+            except (OSError, ValueError):
+                pass
+
+        if self.logFile is not None:
+            self.WriteFile(records)
+        elif not self.configured and len(self.earlyRecords) < EARLY_RECORDS:
+            self.earlyRecords.extend(records[:EARLY_RECORDS - len(self.earlyRecords)])
+
+    def FormatConsole(self, record):
+        kind, stamp, level, name, message, threadName, where = record
+        tags = "] [".join(name.split("."))
+        return f"[{LEVEL_NAMES.get(level, 'Log')}] [{tags}] | {message}\n"
+
+    def FormatFile(self, record):
+        kind, stamp, level, name, message, threadName, where = record
+        data = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(stamp)) + f".{int(stamp % 1 * 1000):03d}",
+            "level": LEVEL_KEYS.get(level, "info"),
+            "subsystem": name,
+            "message": message,
+            "thread": threadName,
+        }
+        if where is not None:
+            data["where"] = where
+        return json.dumps(data, ensure_ascii = False) + "\n"
+
+    def ApplySettings(self, settings):
+        self.configured = True
+        if self.logFile is not None and self.logFile.name != settings.filePath:
+            self.logFile.close()
+            self.logFile = None
+
+        if settings.filePath and self.logFile is None:
+            try:
+                os.makedirs(os.path.dirname(settings.filePath), exist_ok = True)
+                self.logFile = open(settings.filePath, "a", encoding = "utf-8")
+                self.logFileSize = self.logFile.tell()
+            except OSError as e:
+                self.logFile = None
+                if sys.stdout is not None:
+                    sys.stdout.write(f"[Warning] [Logger] | Can't open log file {settings.filePath}: {e}\n")
+
+        # Messages from before the config was read
+        if self.logFile is not None and self.earlyRecords:
+            self.WriteFile(self.earlyRecords)
+        self.earlyRecords = []
+
+    def WriteFile(self, records):
+        data = "".join(self.FormatFile(record) for record in records)
+        size = len(data.encode("utf-8"))
+        if self.logFileSize + size > self.settings.maxBytes and self.logFileSize > 0:
+            self.Rotate()
+
+        try:
+            self.logFile.write(data)
+            self.logFile.flush()
+            self.logFileSize += size
+        except (OSError, ValueError):
+            pass
+
+    # ninawe.log -> ninawe.log.1 -> ... -> ninawe.log.<backups> (oldest is removed)
+    def Rotate(self):
+        path = self.logFile.name
+        self.logFile.close()
+
+        backups = self.settings.backups
+        try:
+            if backups > 0:
+                for index in range(backups - 1, 0, -1):
+                    source = f"{path}.{index}"
+                    if os.path.exists(source):
+                        os.replace(source, f"{path}.{index + 1}")
+                os.replace(path, f"{path}.1")
+            else:
+                os.remove(path)
+        except OSError:
+            pass
+
+        self.logFile = open(path, "a", encoding = "utf-8")
+        self.logFileSize = 0
+
+# ***info***
+# Logger of one subsystem, GetLogger("ConfigManager") / GetLogger("Taskbar.Clock")
+# Messages below the subsystem level return after one comparison
+# every - seconds between messages from the same line (paint handlers, per-frame code),
+#         skipped ones are counted and reported with the next one (their records carry the call site)
+# **********
+class Logger:
+    def __init__(self, service, name):
+        self.service = service
+        self.name = name
+        self.level = service.GetLevel(name)
+        # call site -> [last time, suppressed count]
+        self.limits = {}
+
+    def IsEnabled(self, level):
+        return level >= self.level
+
+    def Log(self, level, message, every = None, where = None, depth = 1):
+        if level < self.level:
+            return
+
+        # Only rate limited messages look up their call site (key of the limit, "where" in the log file)
+        if every is not None:
+            frame = sys._getframe(depth)
+            site = (frame.f_code.co_filename, frame.f_lineno)
+            now = time.monotonic()
+            limit = self.limits.get(site)
+            if limit is not None and now - limit[0] < every:
+                limit[1] += 1
+                return
+            if limit is not None and limit[1]:
+                message = f"{message} ({limit[1]} similar messages skipped)"
+            self.limits[site] = [now, 0]
+            where = where or f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno} {frame.f_code.co_name}"
+
+        self.service.Put(("record", time.time(), level, self.name, message, threading.current_thread().name, where))
+
+    def Debug(self, message, every = None):
+        if DEBUG >= self.level:
+            self.Log(DEBUG, message, every, depth = 2)
+
+    def Info(self, message, every = None):
+        if INFO >= self.level:
+            self.Log(INFO, message, every, depth = 2)
+
+    def Warning(self, message, every = None):
+        if WARNING >= self.level:
+            self.Log(WARNING, message, every, depth = 2)
+
+    def Error(self, message, every = None):
+        if ERROR >= self.level:
+            self.Log(ERROR, message, every, depth = 2)
+
+    # Error with the traceback of the exception being handled
+    def Exception(self, message):
+        if ERROR >= self.level:
+            self.Log(ERROR, f"{message}\n{traceback.format_exc().rstrip()}", depth = 2)
+
+logService = LogService()
+
+def GetLogger(name):
+    return logService.GetLogger(name)
@@ -0,0 +1,195 @@
+from collections import deque
+import functools
+import threading
+import json
+import time
+import os
+from core.logger import GetLogger
+
+log = GetLogger("Profiler")
+
+# Frame timings kept per source (desktop.wallpaper, taskbar, ...)
+FRAME_BUFFER_SIZE = 240
+# Environment switch for profiling the startup (config.ini is read only after the first stages)
+PROFILER_ENV = "NINAWE_PROFILE"
+
+# Shared do-nothing span (disabled profiler allocates nothing)
+class NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+NULL_SPAN = NullSpan()
+
+class ProfileSpan:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.startTime = 0.0
+
+    def __enter__(self):
+        self.startTime = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.profiler.AddTime(self.name, (time.perf_counter() - self.startTime) * 1000)
+        return False
+
+# ***info***
+# Timed spans, counters and recent frame timings for production installs (no profiler attached)
+# Disabled by default: Span() returns a shared no-op object, Count()/AddTime() return right away,
+# paint handlers call StartFrame() (None when disabled) and EndFrame() which does nothing for None
+# Usage:
+#   with profiler.Span("widget.taskbar.defaultClock"): ...  /  @profiler.Timed("desktop.scan")
+#   frameStart = profiler.StartFrame(); ...paint...; profiler.EndFrame("taskbar", frameStart)
+# **********
+class Profiler:
+    def __init__(self, frameBufferSize = FRAME_BUFFER_SIZE):
+        self.enabled = os.environ.get(PROFILER_ENV, "") not in ("", "0")
+        self.frameBufferSize = frameBufferSize
+        self.startTime = time.perf_counter()
+
+        # Spans/counters come from worker threads too (theme bundles, icon loading)
+        self.lock = threading.Lock()
+        # name -> [calls, total ms, max ms, last ms]
+        self.spans = {}
+        # name -> value
+        self.counters = {}
+        # source -> deque of (seconds since start, ms)
+        self.frames = {}
+
+    def SetEnabled(self, enabled):
+        enabled = bool(enabled)
+        if enabled != self.enabled:
+            log.Info(f"{'Enabled' if enabled else 'Disabled'}")
+        self.enabled = enabled
+
+    def SetFrameBufferSize(self, size):
+        size = max(1, size)
+        if size == self.frameBufferSize:
+            return
+        with self.lock:
+            self.frameBufferSize = size
+            self.frames = {source: deque(frames, maxlen = size) for source, frames in self.frames.items()}
+
+    # [Profiler] section of config.ini (environment switch wins, startup may be profiled without config edits)
+    def Configure(self, profilerConfig):
+        self.SetFrameBufferSize(profilerConfig.frame_buffer)
+        self.SetEnabled(profilerConfig.enabled or os.environ.get(PROFILER_ENV, "") not in ("", "0"))
+
+    def Span(self, name):
+        if not self.enabled:
+            return NULL_SPAN
+        return ProfileSpan(self, name)
+
+    def AddTime(self, name, ms):
+        if not self.enabled:
+            return
+        with self.lock:
+            span = self.spans.get(name)
+            if span is None:
+                self.spans[name] = [1, ms, ms, ms]
+                return
+            span[0] += 1
+            span[1] += ms
+            if ms > span[2]:
+                span[2] = ms
+            span[3] = ms
+
+    # Decorator: whole call timed as one span (one flag check when disabled)
+    def Timed(self, name):
+        def Decorator(function):
+            @functools.wraps(function)
+            def Wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                startTime = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.AddTime(name, (time.perf_counter() - startTime) * 1000)
+            return Wrapper
+        return Decorator
+
+    def Count(self, name, value = 1):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    # ==========[> Frames (GUI thread)
+
+    def StartFrame(self):
+        return time.perf_counter() if self.enabled else None
+
+    def EndFrame(self, source, frameStart):
+        if frameStart is None:
+            return
+        now = time.perf_counter()
+        ms = (now - frameStart) * 1000
+
+        frames = self.frames.get(source)
+        if frames is None:
+            frames = self.frames[source] = deque(maxlen = self.frameBufferSize)
+        frames.append((now - self.startTime, ms))
+        self.AddTime(f"paint.{source}", ms)
+
+    def FrameStats(self, source):
+        timings = sorted(ms for stamp, ms in self.frames.get(source, ()))
+        if not timings:
+            return None
+        return {
+            "frames": len(timings),
+            "avg_ms": round(sum(timings) / len(timings), 3),
+            "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+            "max_ms": round(timings[-1], 3),
+        }
+
+    # ==========[> Reports
+
+    def Snapshot(self):
+        with self.lock:
+            spans = {
+                name: {
+                    "calls": calls,
+                    "total_ms": round(totalMs, 3),
+                    "avg_ms": round(totalMs / calls, 3),
+                    "max_ms": round(maxMs, 3),
+                    "last_ms": round(lastMs, 3),
+                }
+                for name, (calls, totalMs, maxMs, lastMs) in self.spans.items()
+            }
+            counters = dict(self.counters)
+            frameSources = list(self.frames)
+
+        return {
+            "uptime_s": round(time.perf_counter() - self.startTime, 3),
+            "enabled": self.enabled,
+            "spans": spans,
+            "counters": counters,
+            "frames": {source: self.FrameStats(source) for source in frameSources},
+            "recent_frames": {source: [(round(stamp, 3), round(ms, 3)) for stamp, ms in self.frames[source]] for source in frameSources},
+        }
+
+    # Writes Snapshot() as JSON into directory, returns the file path (None on failure)
+    def Dump(self, directory):
+        path = os.path.join(directory, time.strftime("profile-%Y%m%d-%H%M%S.json"))
+        try:
+            os.makedirs(directory, exist_ok = True)
+            with open(path, "w", encoding = "utf-8") as dumpFile:
+                json.dump(self.Snapshot(), dumpFile, indent = 4)
+        except OSError as e:
+            log.Warning(f"Failed to write {path}: {e}")
+            return None
+        log.Info(f"Profile saved: {path}")
+        return path
+
+    def Reset(self):
+        with self.lock:
+            self.spans.clear()
+            self.counters.clear()
+            self.frames.clear()
+
+profiler = Profiler()
@@ -0,0 +1,129 @@
+from PyQt6.QtGui import QImage, QPixmap, QPainter, QColor, QFontMetrics, QTextOption
+from PyQt6.QtCore import Qt, QRectF
+from core.config import config as themeConfig
+from collections import OrderedDict
+
+# Pre-rendered text images kept in memory
+MAX_TEXT_PIXMAPS = 1024
+
+# Theme-derived stylesheets built once per theme revision + polish/apply counters
+class StyleCache:
+    def __init__(self):
+        self.revision = None
+        # (name, params...) -> stylesheet
+        self.styles = {}
+        self.builds = self.hits = self.applies = self.skippedApplies = self.polishes = 0
+
+    # builder(*params) is called only if the style is not built for the current theme revision yet
+    def Get(self, name, builder, *params):
+        if themeConfig.theme.revision != self.revision:
+            self.styles.clear()
+            self.revision = themeConfig.theme.revision
+
+        key = (name,) + params
+        style = self.styles.get(key)
+        if style is None:
+            style = builder(*params)
+            self.styles[key] = style
+            self.builds += 1
+        else:
+            self.hits += 1
+        return style
+
+    # setStyleSheet re-polishes the whole widget tree even for the same string, so it's skipped
+    def Apply(self, widget, style):
+        if widget.styleSheet() == style:
+            self.skippedApplies += 1
+            return
+        widget.setStyleSheet(style)
+        self.applies += 1
+
+    def Repolish(self, widget):
+        widget.style().unpolish(widget)
+        widget.style().polish(widget)
+        self.polishes += 1
+
+    def Stats(self):
+        return {
+            "revision": self.revision,
+            "styles": len(self.styles),
+            "builds": self.builds,
+            "hits": self.hits,
+            "applies": self.applies,
+            "skipped_applies": self.skippedApplies,
+            "polishes": self.polishes,
+        }
+
+styleCache = StyleCache()
+
+# ==========[> Text shadows
+
+textPixmaps = OrderedDict()
+
+# Cheap blur: downscale + smooth upscale of the image
+def BlurImage(image, radius):
+    if radius <= 1:
+        return image
+    factor = max(1, round(radius / 2))
+    small = image.scaled(max(1, image.width() // factor), max(1, image.height() // factor), Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
+    return small.scaled(image.width(), image.height(), Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
+
+# ***info***
+# Renders text with drop shadow into a pixmap (replacement for QGraphicsDropShadowEffect)
+# width - wrap width (0 = single line, width from the text)
+# maxLines - wrapped text height limit
+# shadowColor / blurRadius / offsetX / offsetY - same meaning as in QGraphicsDropShadowEffect
+# Result is cached, same text with the same look is rendered only once
+# **********
+def RenderShadowedText(text, font, color, shadowColor = QColor(0, 0, 0, 255), blurRadius = 5, offsetX = 0, offsetY = 0, width = 0, maxLines = 1, alignment = Qt.AlignmentFlag.AlignHCenter):
+    key = (text, font.key(), QColor(color).rgba(), QColor(shadowColor).rgba(), blurRadius, offsetX, offsetY, width, maxLines, alignment.value)
+    pixmap = textPixmaps.get(key)
+    if pixmap is not None:
+        textPixmaps.move_to_end(key)
+        return pixmap
+
+    metrics = QFontMetrics(font)
+    padding = blurRadius + max(abs(offsetX), abs(offsetY))
+
+    option = QTextOption(alignment | Qt.AlignmentFlag.AlignTop)
+    if width > 0:
+        textWidth = width - padding * 2
+        option.setWrapMode(QTextOption.WrapMode.WrapAtWordBoundaryOrAnywhere)
+        textHeight = metrics.lineSpacing() * maxLines
+    else:
+        textWidth = metrics.horizontalAdvance(text) + 1
+        option.setWrapMode(QTextOption.WrapMode.NoWrap)
+        textHeight = metrics.height()
+    imageWidth = textWidth + padding * 2
+    imageHeight = textHeight + padding * 2
+
+    # Text glyphs
+    textImage = QImage(imageWidth, imageHeight, QImage.Format.Format_ARGB32_Premultiplied)
+    textImage.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(textImage)
+    painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+    painter.setFont(font)
+    painter.setPen(QColor(color))
+    painter.drawText(QRectF(padding, padding, textWidth, textHeight), text, option)
+    painter.end()
+
+    # Shadow = glyphs recolored and blurred
+    shadowImage = QImage(textImage)
+    painter = QPainter(shadowImage)
+    painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceIn)
+    painter.fillRect(shadowImage.rect(), QColor(shadowColor))
+    painter.end()
+    shadowImage = BlurImage(shadowImage, blurRadius)
+
+    image = QImage(imageWidth, imageHeight, QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(image)
+    painter.drawImage(offsetX, offsetY, shadowImage)
+    painter.drawImage(0, 0, textImage)
+    painter.end()
+
+    pixmap = QPixmap.fromImage(image)
+    textPixmaps[key] = pixmap
+    if len(textPixmaps) > MAX_TEXT_PIXMAPS:
+        textPixmaps.popitem(last = False)
+    return pixmap
@@ -0,0 +1,233 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+from PyQt6.QtGui import QImage, QPainter, QGuiApplication
+from PyQt6.QtSvg import QSvgRenderer
+from core.configSnapshot import BuildSnapshot, THEME_SCHEMA
+from core.imageLoader import LoadScaledImage
+from core.utils import fontRegistry
+from core.logger import GetLogger
+import configparser
+import time
+import os
+
+log = GetLogger("ThemeBundle")
+
+WALLPAPER_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+FONT_EXTENSIONS = (".ttf", ".otf")
+# Preloaded bundles kept in memory (current theme + neighbours)
+MAX_BUNDLES = 3
+
+def GetFileSignature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+# ***info***
+# Everything a theme needs before it can be shown:
+# parsed themeconfig.ini, font files, first wallpaper (decoded + scaled), power menu SVG icons
+# Read() is safe to call from a worker thread, RegisterFonts() must run on the GUI thread
+# **********
+class ThemeBundle:
+    def __init__(self, name, path):
+        self.name = name
+        self.path = path
+        self.initFile = os.path.join(path, "themeconfig.ini")
+        # (mtime, size) of themeconfig.ini at read time, stale bundles are read again
+        self.signature = None
+
+        self.parser = configparser.ConfigParser(interpolation = None)
+        # font path -> file data (None if the font registry already has this file version)
+        self.fontData = {}
+        # (path, width, height, mode) -> QImage (same key as desktop wallpaper cache)
+        self.wallpapers = {}
+        # svg path -> QImage
+        self.icons = {}
+
+        self.loadMs = 0
+
+    def GetResource(self, relativePath):
+        if os.path.isabs(relativePath):
+            return relativePath
+        return os.path.join(self.path, relativePath)
+
+    def IsFresh(self):
+        return self.signature is not None and self.signature == GetFileSignature(self.initFile)
+
+    # ***info***
+    # screenSize - QSize for wallpaper scaling (None = skip wallpapers, no screen yet)
+    # basePath - Ninawe root (power menu icon paths are relative to it)
+    # **********
+    def Read(self, screenSize = None, basePath = ""):
+        startTime = time.perf_counter()
+
+        self.signature = GetFileSignature(self.initFile)
+        self.parser.read(self.initFile)
+        snapshot = BuildSnapshot(self.parser, THEME_SCHEMA, 0)
+
+        self.ReadFonts()
+        if screenSize is not None:
+            self.ReadWallpaper(snapshot.Desktop, screenSize)
+        self.ReadIcons(snapshot.PowerMenu, basePath)
+
+        self.loadMs = (time.perf_counter() - startTime) * 1000
+        return self
+
+    def ReadFonts(self):
+        for section in self.parser.sections():
+            for key, value in self.parser.items(section, raw = True):
+                if not value.lower().endswith(FONT_EXTENSIONS):
+                    continue
+                fontPath = self.GetResource(value)
+                if fontPath in self.fontData or not os.path.exists(fontPath):
+                    continue
+                if fontRegistry.IsLoaded(fontPath):
+                    self.fontData[fontPath] = None
+                    continue
+                try:
+                    with open(fontPath, "rb") as fontFile:
+                        self.fontData[fontPath] = fontFile.read()
+                except OSError as e:
+                    log.Warning(f"Failed to read font {fontPath}: {e}")
+
+    # Only the wallpaper shown first (carousel frames are prefetched by the desktop itself)
+    def ReadWallpaper(self, desktopConfig, screenSize):
+        wallpaperPath = self.GetResource(desktopConfig.wallpaper_path)
+
+        if os.path.isdir(wallpaperPath):
+            if desktopConfig.carousel_shuffle:
+                return
+            images = sorted(os.path.join(wallpaperPath, name) for name in os.listdir(wallpaperPath) if name.lower().endswith(WALLPAPER_EXTENSIONS))
+            if not images:
+                return
+            wallpaperPath = images[0]
+        elif not os.path.isfile(wallpaperPath):
+            return
+
+        image = LoadScaledImage(wallpaperPath, screenSize, desktopConfig.wallpaper_mode)
+        if not image.isNull():
+            self.wallpapers[(wallpaperPath, screenSize.width(), screenSize.height(), desktopConfig.wallpaper_mode)] = image
+
+    def ReadIcons(self, menuConfig, basePath):
+        iconSize = max(1, menuConfig.button_size // 2)
+        iconDirs = [os.path.join(basePath, "app", "assets", "powermenuicons")]
+        if menuConfig.icons_dir:
+            iconDirs.append(os.path.join(basePath, menuConfig.icons_dir))
+
+        for iconDir in iconDirs:
+            if not os.path.isdir(iconDir):
+                continue
+            for name in os.listdir(iconDir):
+                if not name.lower().endswith(".svg"):
+                    continue
+                iconPath = os.path.normpath(os.path.join(iconDir, name))
+                renderer = QSvgRenderer(iconPath)
+                if not renderer.isValid():
+                    continue
+                image = QImage(iconSize, iconSize, QImage.Format.Format_ARGB32_Premultiplied)
+                image.fill(Qt.GlobalColor.transparent)
+                painter = QPainter(image)
+                renderer.render(painter)
+                painter.end()
+                self.icons[iconPath] = image
+
+    # Font database is GUI thread only (and needs the application object)
+    def RegisterFonts(self):
+        if QGuiApplication.instance() is None:
+            return
+        for fontPath, data in self.fontData.items():
+            fontRegistry.Load(fontPath, data, owner = self.path)
+        # File contents are not needed after registration
+        self.fontData = dict.fromkeys(self.fontData)
+
+    def GetIcon(self, path):
+        return self.icons.get(os.path.normpath(path))
+
+# ==========[> Background loading
+
+class ThemeBundleTaskSignals(QObject):
+    finished = pyqtSignal(object)
+
+class ThemeBundleTask(QRunnable):
+    def __init__(self, bundle, screenSize, basePath):
+        super().__init__()
+        self.bundle = bundle
+        self.screenSize = screenSize
+        self.basePath = basePath
+        self.signals = ThemeBundleTaskSignals()
+
+    def run(self):
+        self.signals.finished.emit(self.bundle.Read(self.screenSize, self.basePath))
+
+# Preloads theme bundles in the background and keeps the last few of them
+class ThemeBundleLoader(QObject):
+    bundleReady = pyqtSignal(str)
+
+    def __init__(self, basePath, parent = None):
+        super().__init__(parent)
+        self.basePath = basePath
+
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+
+        # name -> bundle (insertion order = age)
+        self.bundles = {}
+        # name -> running task (keeping signals alive)
+        self.tasks = {}
+        # Folder of the applied theme (its fonts are never unloaded)
+        self.activePath = None
+
+    def GetScreenSize(self):
+        if QGuiApplication.instance() is None or QGuiApplication.primaryScreen() is None:
+            return None
+        return QGuiApplication.primaryScreen().geometry().size()
+
+    def Preload(self, name, path):
+        bundle = self.bundles.get(name)
+        if name in self.tasks or (bundle is not None and bundle.path == path and bundle.IsFresh()):
+            return
+
+        task = ThemeBundleTask(ThemeBundle(name, path), self.GetScreenSize(), self.basePath)
+        task.signals.finished.connect(self.OnTaskFinished)
+        self.tasks[name] = task
+        self.pool.start(task)
+
+    def OnTaskFinished(self, bundle):
+        self.tasks.pop(bundle.name, None)
+        bundle.RegisterFonts()
+        self.Store(bundle)
+        log.Info(f"Preloaded \"{bundle.name}\" in {bundle.loadMs:.1f} ms ({len(bundle.wallpapers)} wallpapers, {len(bundle.fontData)} fonts, {len(bundle.icons)} icons)")
+        self.bundleReady.emit(bundle.name)
+
+    def Store(self, bundle):
+        self.bundles.pop(bundle.name, None)
+        self.bundles[bundle.name] = bundle
+        while len(self.bundles) > MAX_BUNDLES:
+            evicted = self.bundles.pop(next(iter(self.bundles)))
+            self.ReleaseFonts(evicted.path)
+
+    # Fonts of a theme that is neither applied nor preloaded are removed from the font database
+    def ReleaseFonts(self, themePath):
+        if themePath == self.activePath or any(bundle.path == themePath for bundle in self.bundles.values()):
+            return
+        fontRegistry.Release(themePath)
+
+    def SetActive(self, themePath):
+        previousPath = self.activePath
+        self.activePath = themePath
+        if previousPath is not None and previousPath != themePath:
+            self.ReleaseFonts(previousPath)
+
+    # Ready bundle (preloaded if possible, read right here otherwise)
+    # Returns (bundle, True if it was preloaded)
+    def Get(self, name, path):
+        bundle = self.bundles.get(name)
+        if bundle is not None and bundle.path == path and bundle.IsFresh():
+            # Most recently used -> last to be dropped
+            self.Store(bundle)
+            return bundle, True
+
+        bundle = ThemeBundle(name, path).Read(self.GetScreenSize(), self.basePath)
+        bundle.RegisterFonts()
+        self.Store(bundle)
+        return bundle, False
@@ -3,7 +3,11 @@ from ctypes import c_int, c_void_p, Structure, POINTER, sizeof, windll
 from ctypes.wintypes import HWND
 from enum import Enum
 from PyQt6.QtGui import QFontDatabase
+import threading
 import os
+from core.logger import GetLogger
+
+fontLog = GetLogger("FontLoader")
 
 # ==========[> Blur
 
@@ -81,17 +85,119 @@ def MakeBlur(hwnd: int, enable: bool = True, blurMode: int = AccentState.ACCENT_
 
 # ==========[> Load fonts from file
 
-def LoadFont(fontFromConfig, path = ""):
-    if str(fontFromConfig).lower().endswith((".ttf", ".otf")):
-        fontFullPath = f"{path}\\{fontFromConfig}"
-        if os.path.exists(fontFullPath):
-            fontID = QFontDatabase.addApplicationFont(fontFullPath)
-            if fontID != -1:
-                families = QFontDatabase.applicationFontFamilies(fontID)
-                if families:
-                    return families[0]
-            else:
-                print(f"[Log] [FontLoader] Could not load font from file: {fontFullPath}")
+# ***info***
+# Application fonts registered once per file version (absolute path + mtime)
+# owner - who uses the font (theme folder, None = keep forever), fonts of released owners are unloaded
+# Qt font database is GUI thread only, IsLoaded() can be called from workers
+# **********
+class FontRegistry:
+    def __init__(self):
+        # absolute path -> {"mtime", "id", "family", "owners"}
+        self.fonts = {}
+        self.lock = threading.Lock()
+
+        self.registrations = 0
+        self.cacheHits = 0
+        self.fileReads = 0
+        self.unloads = 0
+        self.failures = 0
+
+    def GetMtime(self, path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def IsLoaded(self, path):
+        path = os.path.abspath(path)
+        with self.lock:
+            entry = self.fonts.get(path)
+        return entry is not None and entry["mtime"] == self.GetMtime(path)
+
+    # ***info***
+    # Returns family name (None if the font can't be loaded)
+    # data - file contents if they were already read (theme bundle preloading)
+    # **********
+    def Load(self, path, data = None, owner = None):
+        path = os.path.abspath(path)
+        mtime = self.GetMtime(path)
+        if mtime is None:
+            fontLog.Warning(f"Font file not found: {path}")
+            self.failures += 1
+            return None
+
+        with self.lock:
+            entry = self.fonts.get(path)
+
+        # Every caller becomes an owner, None included (a font first loaded by a theme stays for a None caller)
+        if entry is not None and entry["mtime"] == mtime:
+            self.cacheHits += 1
+            with self.lock:
+                entry["owners"].add(owner)
+            return entry["family"]
+
+        # File was changed -> old version goes away
+        if entry is not None:
+            self.Unload(path)
+
+        if data is None:
+            fontID = QFontDatabase.addApplicationFont(path)
+            self.fileReads += 1
         else:
-            print(f"[Log] [FontLoader] Font file not found: {fontFullPath}")
-    return fontFromConfig
\ No newline at end of file
+            fontID = QFontDatabase.addApplicationFontFromData(data)
+
+        families = QFontDatabase.applicationFontFamilies(fontID) if fontID != -1 else []
+        if not families:
+            fontLog.Warning(f"Could not load font from file: {path}")
+            self.failures += 1
+            return None
+
+        self.registrations += 1
+        with self.lock:
+            self.fonts[path] = {"mtime": mtime, "id": fontID, "family": families[0], "owners": {owner}}
+        return families[0]
+
+    def Unload(self, path):
+        with self.lock:
+            entry = self.fonts.pop(os.path.abspath(path), None)
+        if entry is None:
+            return
+        QFontDatabase.removeApplicationFont(entry["id"])
+        self.unloads += 1
+
+    # Owner no longer active: fonts used only by it are removed from the font database
+    def Release(self, owner):
+        with self.lock:
+            unused = []
+            for path, entry in self.fonts.items():
+                entry["owners"].discard(owner)
+                if not entry["owners"]:
+                    unused.append(path)
+        for path in unused:
+            self.Unload(path)
+        if unused:
+            fontLog.Debug(f"Unloaded {len(unused)} fonts of {owner}")
+
+    def Stats(self):
+        with self.lock:
+            loaded = len(self.fonts)
+        return {
+            "loaded": loaded,
+            "registrations": self.registrations,
+            "cache_hits": self.cacheHits,
+            "file_reads": self.fileReads,
+            "unloads": self.unloads,
+            "failures": self.failures,
+        }
+
+fontRegistry = FontRegistry()
+
+# fontFromConfig - family name or font file (absolute or relative to path)
+# Returns family name
+def LoadFont(fontFromConfig, path = "", owner = None):
+    if str(fontFromConfig).lower().endswith((".ttf", ".otf")):
+        fontFullPath = fontFromConfig if os.path.isabs(fontFromConfig) else os.path.join(path, fontFromConfig)
+        family = fontRegistry.Load(fontFullPath, owner = owner)
+        if family is not None:
+            return family
+    return fontFromConfig
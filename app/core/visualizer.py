@@ -0,0 +1,79 @@
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtCore import Qt
+from core.config import config as selectedThemeConfig
+from core.config import ConfigWrapper
+from core.configSnapshot import BuildSnapshot
+from core.fileWatcher import GetFileWatchService
+from core.audio import GetAudioService
+from core.logger import GetLogger
+import os
+
+# ***info***
+# Base of the desktop audio visualizers (defaultSpectrum, oscilloscope, VFDVUMeter, OSUSpectrum)
+# - config switcher: [section] of themeconfig.ini wins over the config.ini next to the widget module
+# - theme updates (configUpdated) and local config.ini saves both end in Updater(changedSections)
+# - visible widgets get ApplySettings(settings) and are subscribed to the AudioService, hidden ones are unsubscribed
+# Subclasses implement ApplySettings(settings) and OnAudioFrame(frame), and call Updater() at the end of __init__
+# Sandboxed (sandboxed_widgets) the widget subscribes to the AudioService of its own process: one more capture per widget
+# **********
+class AudioVisualizer(QWidget):
+    def __init__(self, parent, section, schema, modulePath):
+        super().__init__(parent)
+        self.defaultSection = section
+        self.schema = schema
+        self.localConfig = ConfigWrapper()
+        self.log = GetLogger(section)
+
+        # Config path
+        self.widgetPath = os.path.dirname(os.path.abspath(modulePath))
+        self.configPath = os.path.join(self.widgetPath, "config.ini")
+        self.selectedConfig = None
+        self.settings = None
+
+        # Desktop clicks go through the visualizer
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+
+        # Theme config
+        selectedThemeConfig.configUpdated.connect(self.OnConfigUpdated)
+        # Widget config (shared debounced watcher, unwatched when the widget is deleted)
+        if os.path.exists(self.configPath):
+            GetFileWatchService().Watch(self.configPath, self.ConfigFileChanged, owner = self)
+
+    # configUpdated carries (source, sections), WidgetManager calls Updater(sections) directly
+    def OnConfigUpdated(self, source, changedSections):
+        if source == "theme":
+            self.Updater(changedSections)
+
+    def ConfigFileChanged(self, paths):
+        self.log.Info(f"Local config changed: {paths[0]}. Updates will not be applied if there is already a section for this widget in the themeconfig.ini file.")
+        self.Updater()
+
+    def Updater(self, changedSections = None):
+        if changedSections and "ALL" not in changedSections and self.defaultSection not in changedSections:
+            return
+
+        self.localConfig.parser.read(self.configPath)
+
+        # Config switcher
+        if selectedThemeConfig.theme.GetSectionStatus(self.defaultSection) == True: # themeconfig.ini
+            self.selectedConfig = selectedThemeConfig.theme
+        else: # build-in widget config
+            self.selectedConfig = self.localConfig
+
+        self.settings = settings = BuildSnapshot(self.selectedConfig.parser, self.schema, self.selectedConfig.revision).Section(self.defaultSection)
+
+        if not settings.visible:
+            GetAudioService().Unsubscribe(self.OnAudioFrame)
+            self.hide()
+            return
+
+        self.ApplySettings(settings)
+        self.show()
+        GetAudioService().Subscribe(self.OnAudioFrame, owner = self)
+
+    # Engines, geometry and paint resources for the new settings (widget is shown afterwards)
+    def ApplySettings(self, settings):
+        raise NotImplementedError
+
+    def OnAudioFrame(self, frame):
+        raise NotImplementedError
@@ -0,0 +1,202 @@
+from PyQt6.QtGui import QImage
+from collections import OrderedDict
+import threading
+import hashlib
+import struct
+import os
+from core.logger import GetLogger
+
+log = GetLogger("WallpaperCache")
+
+# magic, width, height, bytes per line, QImage format
+HEADER = struct.Struct("<4sIIII")
+MAGIC = b"NWPC"
+EXTENSION = ".raw"
+
+# On-disk cache of already scaled wallpapers.
+# Files are stored as raw pixels, so loading one is just a file read (no decoding, no scaling).
+# Usage order is tracked with file mtime, oldest files are evicted when the size cap is reached.
+class WallpaperCache:
+    def __init__(self, directory, maxBytes):
+        self.directory = directory
+        self.maxBytes = maxBytes
+        # Get/Put are called from QThreadPool workers
+        self.lock = threading.Lock()
+        self.totalBytes = None
+
+    # Cache key: source file identity + target resolution + wallpaper mode
+    def MakeKey(self, path, targetSize, mode):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        rawKey = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{targetSize.width()}x{targetSize.height()}|{mode}"
+        return hashlib.sha1(rawKey.encode("utf-8")).hexdigest()
+
+    def GetFilePath(self, key):
+        return os.path.join(self.directory, key + EXTENSION)
+
+    def Get(self, path, targetSize, mode):
+        key = self.MakeKey(path, targetSize, mode)
+        if key is None:
+            return None
+
+        filePath = self.GetFilePath(key)
+        try:
+            with open(filePath, "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+
+        if len(data) < HEADER.size:
+            return None
+
+        magic, width, height, bytesPerLine, imageFormat = HEADER.unpack_from(data)
+        if magic != MAGIC or len(data) != HEADER.size + bytesPerLine * height:
+            log.Warning(f"Broken cache entry, removing: {filePath}")
+            self.Remove(filePath)
+            return None
+
+        # Marking entry as recently used
+        try:
+            os.utime(filePath)
+        except OSError:
+            pass
+
+        pixels = data[HEADER.size:]
+        # copy() detaches image from the python buffer
+        return QImage(pixels, width, height, bytesPerLine, QImage.Format(imageFormat)).copy()
+
+    def Put(self, path, targetSize, mode, image):
+        if image.isNull() or self.maxBytes <= 0:
+            return
+
+        key = self.MakeKey(path, targetSize, mode)
+        if key is None:
+            return
+
+        header = HEADER.pack(MAGIC, image.width(), image.height(), image.bytesPerLine(), image.format().value)
+        pixels = image.constBits().asstring(image.sizeInBytes())
+
+        filePath = self.GetFilePath(key)
+        tempPath = f"{filePath}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok = True)
+            with open(tempPath, "wb") as file:
+                file.write(header)
+                file.write(pixels)
+        except OSError as e:
+            log.Warning(f"Failed to write cache entry {filePath}: {e}")
+            self.Remove(tempPath)
+            return
+
+        # Replace under the lock: an overwritten entry (same key from another worker) stops counting
+        with self.lock:
+            try:
+                oldSize = os.stat(filePath).st_size
+            except OSError:
+                oldSize = 0
+            try:
+                os.replace(tempPath, filePath)
+            except OSError as e:
+                log.Warning(f"Failed to write cache entry {filePath}: {e}")
+                self.Remove(tempPath)
+                return
+
+            if self.totalBytes is not None:
+                self.totalBytes += len(header) + len(pixels) - oldSize
+            self.Evict()
+
+    def Remove(self, filePath):
+        try:
+            os.remove(filePath)
+        except OSError:
+            pass
+
+    # Deleting least recently used entries until the cache fits the cap (lock must be held)
+    def Evict(self):
+        if self.totalBytes is not None and self.totalBytes <= self.maxBytes:
+            return
+
+        entries = []
+        try:
+            with os.scandir(self.directory) as iterator:
+                for entry in iterator:
+                    if entry.name.endswith(EXTENSION):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+
+        self.totalBytes = sum(size for _, size, _ in entries)
+        entries.sort()
+
+        for _, size, filePath in entries:
+            if self.totalBytes <= self.maxBytes:
+                break
+            self.Remove(filePath)
+            self.totalBytes -= size
+            log.Debug(f"Evicted: {filePath}")
+
+# In-memory LRU of scaled wallpaper pixmaps with a memory budget (GUI thread only)
+class PixmapCache:
+    def __init__(self, maxBytes):
+        self.maxBytes = maxBytes
+        # key -> (pixmap, bytes), oldest first
+        self.entries = OrderedDict()
+        self.totalBytes = 0
+
+        self.hits = self.misses = self.evictions = 0
+
+    # Bytes used by pixmap pixels
+    def GetPixmapBytes(self, pixmap):
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+    def Contains(self, key):
+        return key in self.entries
+
+    def Get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def Put(self, key, pixmap):
+        if pixmap is None or pixmap.isNull():
+            return
+
+        size = self.GetPixmapBytes(pixmap)
+        # Frame is larger than the whole budget
+        if size > self.maxBytes:
+            return
+
+        if key in self.entries:
+            self.totalBytes -= self.entries.pop(key)[1]
+
+        self.entries[key] = (pixmap, size)
+        self.totalBytes += size
+
+        while self.totalBytes > self.maxBytes:
+            _, (_, evictedSize) = self.entries.popitem(last = False)
+            self.totalBytes -= evictedSize
+            self.evictions += 1
+
+    def Clear(self):
+        self.entries.clear()
+        self.totalBytes = 0
+
+    def Stats(self):
+        return {
+            "entries": len(self.entries),
+            "bytes": self.totalBytes,
+            "max_bytes": self.maxBytes,
+            "bytes_per_frame": self.totalBytes // len(self.entries) if self.entries else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
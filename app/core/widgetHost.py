@@ -0,0 +1,417 @@
+from PyQt6.QtWidgets import QWidget, QApplication
+from PyQt6.QtCore import QObject, QEvent, QPoint, QTimer, Qt, pyqtSignal
+from PyQt6.QtGui import QImage, QPainter, QRegion
+from PyQt6 import sip
+from multiprocessing import shared_memory
+from core.logger import GetLogger, WIDGET_PROCESS_ENV
+import importlib.util
+import multiprocessing
+import ctypes
+import struct
+import time
+import sys
+import os
+
+log = GetLogger("WidgetHost")
+
+# ==========[> Shared frame buffer
+
+# magic, width, height, slots | frame counter | heartbeat counter | ready slot, stop flag
+HEADER = struct.Struct("<IIIIQQII")
+HEADER_SIZE = 64
+HEADER_MAGIC = 0x4E57484F
+FRAME_OFFSET = 16
+HEARTBEAT_OFFSET = 24
+READY_SLOT_OFFSET = 32
+STOP_OFFSET = 36
+# Child writes one slot while the shell copies another (a copy can't be overwritten within one frame)
+SLOT_COUNT = 3
+
+# ***info***
+# Header + SLOT_COUNT ARGB32 premultiplied images in one shared memory block
+# Writer (widget process): paints into the next slot, then publishes ready slot + frame counter
+# Reader (shell): copies the ready slot, frame counter is checked again after the copy
+# **********
+class FrameBuffer:
+    def __init__(self, sharedMemory, width, height, owner):
+        self.sharedMemory = sharedMemory
+        self.width = width
+        self.height = height
+        self.owner = owner
+        self.stride = width * 4
+        self.slotSize = self.stride * height
+
+        # ctypes views keep the addresses of the slots for zero-copy QImages
+        self.slotBuffers = [(ctypes.c_char * self.slotSize).from_buffer(sharedMemory.buf, HEADER_SIZE + index * self.slotSize) for index in range(SLOT_COUNT)]
+        self.slotImages = [QImage(sip.voidptr(ctypes.addressof(buffer)), width, height, self.stride, QImage.Format.Format_ARGB32_Premultiplied) for buffer in self.slotBuffers]
+
+    @classmethod
+    def Create(cls, width, height):
+        size = HEADER_SIZE + width * 4 * height * SLOT_COUNT
+        sharedMemory = shared_memory.SharedMemory(create = True, size = size)
+        HEADER.pack_into(sharedMemory.buf, 0, HEADER_MAGIC, width, height, SLOT_COUNT, 0, 0, 0, 0)
+        return cls(sharedMemory, width, height, True)
+
+    @classmethod
+    def Attach(cls, name):
+        sharedMemory = shared_memory.SharedMemory(name = name)
+        magic, width, height, slots, frame, heartbeat, readySlot, stop = HEADER.unpack_from(sharedMemory.buf, 0)
+        if magic != HEADER_MAGIC or slots != SLOT_COUNT:
+            sharedMemory.close()
+            raise ValueError(f"Shared memory {name} is not a widget frame buffer")
+        return cls(sharedMemory, width, height, False)
+
+    @property
+    def name(self):
+        return self.sharedMemory.name
+
+    def ReadValue(self, fmt, offset):
+        return struct.unpack_from(fmt, self.sharedMemory.buf, offset)[0]
+
+    def WriteValue(self, fmt, offset, value):
+        struct.pack_into(fmt, self.sharedMemory.buf, offset, value)
+
+    def FrameCounter(self):
+        return self.ReadValue("<Q", FRAME_OFFSET)
+
+    def HeartbeatCounter(self):
+        return self.ReadValue("<Q", HEARTBEAT_OFFSET)
+
+    def StopRequested(self):
+        return self.ReadValue("<I", STOP_OFFSET) != 0
+
+    def RequestStop(self):
+        self.WriteValue("<I", STOP_OFFSET, 1)
+
+    # ==========[> Writer side
+
+    def NextSlot(self):
+        return (self.FrameCounter() + 1) % SLOT_COUNT
+
+    def Publish(self, slot):
+        self.WriteValue("<I", READY_SLOT_OFFSET, slot)
+        # Counter goes last, reader sees the slot only after it is complete
+        self.WriteValue("<Q", FRAME_OFFSET, self.FrameCounter() + 1)
+
+    def Beat(self):
+        self.WriteValue("<Q", HEARTBEAT_OFFSET, self.HeartbeatCounter() + 1)
+
+    # ==========[> Reader side
+
+    # Returns (frame counter, own QImage copy) or None if there is no new complete frame
+    def ReadFrame(self, lastFrame):
+        frame = self.FrameCounter()
+        if frame == lastFrame or frame == 0:
+            return None
+        slot = self.ReadValue("<I", READY_SLOT_OFFSET)
+        image = self.slotImages[slot].copy()
+
+        # Writer went around all slots while copying -> torn frame, next poll gets a fresh one
+        if self.FrameCounter() - frame >= SLOT_COUNT - 1:
+            return None
+        return frame, image
+
+    def Close(self):
+        # QImages and ctypes views have to go before the memory can be closed
+        self.slotImages = []
+        self.slotBuffers = []
+        try:
+            self.sharedMemory.close()
+            if self.owner:
+                self.sharedMemory.unlink()
+        except (OSError, BufferError) as e:
+            log.Warning(f"Failed to release frame buffer {self.sharedMemory.name}: {e}")
+
+# ==========[> Widget process
+
+HEARTBEAT_MS = 250
+
+# Widget module from its file (userdata widgets aren't importable as packages)
+def LoadWidgetModule(scriptPath, moduleName):
+    isPackage = scriptPath.endswith("__init__.py")
+    spec = importlib.util.spec_from_file_location(moduleName, scriptPath, submodule_search_locations = [os.path.dirname(scriptPath)] if isPackage else None)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[moduleName] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[moduleName]
+        raise
+    return module
+
+# ***info***
+# Optional module-level Prepare() of a widget: heavy work without Qt widgets/pixmaps (config parsing,
+# font files, assets). It runs on a loader thread and its result is passed as Widget(parent, prepared = ...)
+# **********
+def PrepareWidget(module):
+    prepare = getattr(module, "Prepare", None)
+    return prepare() if callable(prepare) else None
+
+def ConstructWidget(module, parent, prepared = None):
+    if callable(getattr(module, "Prepare", None)):
+        return module.Widget(parent, prepared = prepared)
+    return module.Widget(parent)
+
+# Runs in the widget process: renders Widget into the shared buffer when it was repainted
+class WidgetRenderer(QObject):
+    def __init__(self, widget, frameBuffer, targetFps):
+        super().__init__()
+        self.widget = widget
+        self.frameBuffer = frameBuffer
+        self.dirty = True
+        self.rendering = False
+        self.parentProcess = multiprocessing.parent_process()
+
+        # Paint events of the offscreen widget = widget content changed
+        widget.installEventFilter(self)
+
+        self.frameTimer = QTimer(self)
+        self.frameTimer.setInterval(max(1, round(1000 / max(1, targetFps))))
+        self.frameTimer.timeout.connect(self.Frame)
+        self.frameTimer.start()
+
+        self.heartbeatTimer = QTimer(self)
+        self.heartbeatTimer.setInterval(HEARTBEAT_MS)
+        self.heartbeatTimer.timeout.connect(self.Heartbeat)
+        self.heartbeatTimer.start()
+        self.Heartbeat()
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Type.Paint and not self.rendering:
+            self.dirty = True
+        return False
+
+    def Frame(self):
+        if self.frameBuffer.StopRequested():
+            QApplication.instance().quit()
+            return
+        if not self.dirty:
+            return
+        self.dirty = False
+
+        slot = self.frameBuffer.NextSlot()
+        image = self.frameBuffer.slotImages[slot]
+        image.fill(Qt.GlobalColor.transparent)
+
+        self.rendering = True
+        painter = QPainter(image)
+        self.widget.render(painter, QPoint(), QRegion(), QWidget.RenderFlag.DrawChildren)
+        painter.end()
+        self.rendering = False
+
+        self.frameBuffer.Publish(slot)
+
+    # Shows the shell that the event loop is alive (a stuck widget stops the heartbeat too)
+    def Heartbeat(self):
+        if self.parentProcess is not None and not self.parentProcess.is_alive():
+            QApplication.instance().quit()
+            return
+        self.frameBuffer.Beat()
+
+# ***info***
+# Entry point of the widget process (multiprocessing spawn target)
+# The widget module is the same as for in-process widgets: it has to define Widget(parent)
+# Widget is created without parent on an offscreen platform and resized to the buffer size
+# **********
+def RunWidgetProcess(modulePath, name, bufferName, targetFps):
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    # Read by ConfigManager (own log file) and AudioService, core.config is first imported with the widget module
+    os.environ[WIDGET_PROCESS_ENV] = name
+    app = QApplication([sys.argv[0]])
+
+    frameBuffer = FrameBuffer.Attach(bufferName)
+    try:
+        module = LoadWidgetModule(modulePath, f"sandboxed_widgets.{name}")
+        widget = ConstructWidget(module, None, PrepareWidget(module))
+        widget.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        widget.resize(frameBuffer.width, frameBuffer.height)
+        widget.show()
+
+        renderer = WidgetRenderer(widget, frameBuffer, targetFps)
+        app.exec()
+    finally:
+        frameBuffer.Close()
+
+# ==========[> Shell side
+
+# Frame buffer check interval of the watchdog
+WATCHDOG_MS = 500
+# No heartbeat for this long -> widget process is killed and restarted
+HEARTBEAT_TIMEOUT_MS = 3000
+# Time for the first heartbeat (Python + Qt startup of the new process)
+STARTUP_TIMEOUT_MS = 20000
+# Restart policy: delay doubles per restart, widget is given up after MAX_RESTARTS within RESTART_WINDOW_S
+RESTART_DELAY_MS = 1000
+MAX_RESTART_DELAY_MS = 30000
+MAX_RESTARTS = 5
+RESTART_WINDOW_S = 120
+
+# ***info***
+# Owns one widget process: frame buffer, start/stop, heartbeat watchdog, restart policy
+# frameReady(QImage) - new frame (own copy), failed(str) - widget was given up
+# **********
+class WidgetHost(QObject):
+    frameReady = pyqtSignal(QImage)
+    failed = pyqtSignal(str)
+
+    def __init__(self, name, modulePath, width, height, targetFps = 30, parent = None):
+        super().__init__(parent)
+        self.name = name
+        self.modulePath = modulePath
+        self.width = max(1, width)
+        self.height = max(1, height)
+        self.targetFps = targetFps
+
+        self.process = None
+        self.frameBuffer = None
+        self.lastFrame = 0
+        self.lastHeartbeat = 0
+        self.lastHeartbeatTime = 0.0
+        self.startTime = 0.0
+        self.restartTimes = []
+        self.stopped = False
+
+        self.pollTimer = QTimer(self)
+        self.pollTimer.setInterval(max(1, round(1000 / max(1, targetFps))))
+        self.pollTimer.timeout.connect(self.PollFrame)
+
+        self.watchdogTimer = QTimer(self)
+        self.watchdogTimer.setInterval(WATCHDOG_MS)
+        self.watchdogTimer.timeout.connect(self.CheckProcess)
+
+        self.restartTimer = QTimer(self)
+        self.restartTimer.setSingleShot(True)
+        self.restartTimer.timeout.connect(self.Start)
+
+    def Start(self):
+        if self.stopped:
+            return
+        try:
+            self.frameBuffer = FrameBuffer.Create(self.width, self.height)
+        except OSError as e:
+            log.Error(f"{self.name}: can't create frame buffer: {e}")
+            self.failed.emit(str(e))
+            return
+
+        # Spawn on every platform: a fresh interpreter, nothing of the shell's Qt state is inherited
+        context = multiprocessing.get_context("spawn")
+        self.process = context.Process(
+            target = RunWidgetProcess,
+            args = (self.modulePath, self.name, self.frameBuffer.name, self.targetFps),
+            name = f"NinaweWidget-{self.name}",
+            daemon = True
+        )
+        self.process.start()
+
+        self.lastFrame = 0
+        self.lastHeartbeat = 0
+        self.startTime = self.lastHeartbeatTime = time.monotonic()
+        self.pollTimer.start()
+        self.watchdogTimer.start()
+        log.Info(f"{self.name}: started in process {self.process.pid} ({self.width}x{self.height}, {self.targetFps} FPS)")
+
+    def PollFrame(self):
+        if self.frameBuffer is None:
+            return
+        result = self.frameBuffer.ReadFrame(self.lastFrame)
+        if result is None:
+            return
+        self.lastFrame, image = result
+        self.frameReady.emit(image)
+
+    def CheckProcess(self):
+        if self.process is None:
+            return
+
+        if not self.process.is_alive():
+            self.Restart(f"process exited with code {self.process.exitcode}")
+            return
+
+        heartbeat = self.frameBuffer.HeartbeatCounter()
+        now = time.monotonic()
+        if heartbeat != self.lastHeartbeat:
+            self.lastHeartbeat = heartbeat
+            self.lastHeartbeatTime = now
+            return
+
+        timeout = HEARTBEAT_TIMEOUT_MS if heartbeat else STARTUP_TIMEOUT_MS
+        if (now - self.lastHeartbeatTime) * 1000 > timeout:
+            self.Restart(f"no heartbeat for {timeout} ms")
+
+    def Restart(self, reason):
+        self.StopProcess()
+
+        now = time.monotonic()
+        self.restartTimes = [stamp for stamp in self.restartTimes if now - stamp < RESTART_WINDOW_S] + [now]
+        if len(self.restartTimes) > MAX_RESTARTS:
+            log.Error(f"{self.name}: {reason}, {MAX_RESTARTS} restarts in {RESTART_WINDOW_S} s, giving up")
+            self.failed.emit(reason)
+            return
+
+        delay = min(MAX_RESTART_DELAY_MS, RESTART_DELAY_MS * 2 ** (len(self.restartTimes) - 1))
+        log.Warning(f"{self.name}: {reason}, restarting in {delay} ms")
+        self.restartTimer.start(delay)
+
+    def StopProcess(self):
+        self.pollTimer.stop()
+        self.watchdogTimer.stop()
+
+        if self.process is not None:
+            if self.frameBuffer is not None:
+                self.frameBuffer.RequestStop()
+            self.process.join(0.3)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join(0.3)
+            self.process = None
+
+        if self.frameBuffer is not None:
+            self.frameBuffer.Close()
+            self.frameBuffer = None
+
+    def Stop(self):
+        self.stopped = True
+        self.restartTimer.stop()
+        self.StopProcess()
+
+# ***info***
+# Shell part of a sandboxed widget: only blits the frames of its WidgetHost
+# A slow or crashing widget can't block or kill the shell, it just stops updating until restarted
+# **********
+class SandboxedWidget(QWidget):
+    def __init__(self, parent, name, modulePath, x = 0, y = 0, width = 400, height = 200, targetFps = 30):
+        super().__init__(parent)
+        self.name = name
+        self.frame = None
+        self.failedReason = None
+
+        self.setGeometry(x, y, width, height)
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        # Widget process renders without input (mouse goes to the desktop)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+
+        self.host = WidgetHost(name, modulePath, width, height, targetFps, self)
+        self.host.frameReady.connect(self.OnFrameReady)
+        self.host.failed.connect(self.OnHostFailed)
+        QApplication.instance().aboutToQuit.connect(self.Shutdown)
+        self.host.Start()
+        self.show()
+
+    def OnFrameReady(self, image):
+        self.frame = image
+        self.update()
+
+    def OnHostFailed(self, reason):
+        self.failedReason = reason
+        self.frame = None
+        self.update()
+
+    # Called by WidgetManager.UnloadWidgets and on exit
+    def Shutdown(self):
+        self.host.Stop()
+
+    def paintEvent(self, event):
+        if self.frame is None:
+            return
+        painter = QPainter(self)
+        painter.drawImage(0, 0, self.frame)
@@ -1,12 +1,70 @@
 import importlib
+import configparser
+import threading
+import time
 import sys
+import os
 from PyQt6.QtWidgets import QWidget
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
 from core.config import config as themeConfig
+from core.profiler import profiler
+from core.logger import GetLogger
+from core.widgetHost import SandboxedWidget, LoadWidgetModule, PrepareWidget, ConstructWidget
+
+log = GetLogger("WidgetManager")
+
+# ==========[> Background loading
+
+class WidgetLoadTaskSignals(QObject):
+    finished = pyqtSignal(object)
+
+# ***info***
+# Worker part of loading one widget: module import (or reload) + Prepare() of the module,
+# sandboxed widgets only read their [Sandbox] settings. Widget(...) itself is created on the GUI thread.
+# **********
+class WidgetLoadTask(QRunnable):
+    def __init__(self, manager, name, sandboxed):
+        super().__init__()
+        # The manager keeps the task until the next LoadWidgets (its signal may still be queued)
+        self.setAutoDelete(False)
+        self.manager = manager
+        self.name = name
+        self.sandboxed = sandboxed
+        self.signals = WidgetLoadTaskSignals()
+        self.done = threading.Event()
+
+        # Results
+        self.module = self.prepared = self.sandboxSettings = None
+        self.failed = False
+        self.loadMs = 0.0
+
+    def run(self):
+        startTime = time.perf_counter()
+        try:
+            if self.sandboxed:
+                self.sandboxSettings = self.manager.ReadSandboxSettings(self.name)
+            else:
+                self.module = self.manager.ImportWidgetModule(self.name)
+                self.prepared = PrepareWidget(self.module)
+        # exceptions
+        except ModuleNotFoundError:
+            self.failed = True
+            self.manager.log.Warning(f"Widget folder not found: widgets/{self.manager.widgetType}/{self.name}")
+        except Exception as e:
+            self.failed = True
+            self.manager.log.Exception(f"Failed to load widget '{self.name}': {e}")
+
+        self.loadMs = (time.perf_counter() - startTime) * 1000
+        profiler.AddTime(f"widget.{self.manager.widgetType}.{self.name}.load", self.loadMs)
+        self.done.set()
+        self.signals.finished.emit(self)
 
 class WidgetManager:
     def __init__(self, parent, widgetType = None):
         if widgetType == None:
-            print("[Log] [WidgetManager] | Widget type not selected")
+            log.Warning("Widget type not selected")
+        # [WidgetManager] [Taskbar] / [WidgetManager] [Desktop]
+        self.log = GetLogger(f"WidgetManager.{widgetType.capitalize()}") if widgetType else log
 
         # link to window
         self.parent = parent
@@ -14,6 +72,20 @@ class WidgetManager:
         self.widgetType = widgetType
         # imported widget objects
         self.widgets = []
+        # widget object -> widget name (timings/logs)
+        self.widgetNames = {}
+        # (active_widgets, sandboxed_widgets) values the widgets were loaded for
+        self.loadedList = None
+
+        # Imports/Prepare() of the widgets run in parallel, only the construction is on the GUI thread
+        widgetsConfig = themeConfig.app.snapshot.Widgets
+        self.loadBudgetMs = widgetsConfig.load_budget_ms
+        self.deferSlowWidgets = widgetsConfig.defer_slow
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max(1, widgetsConfig.load_workers))
+        # Tasks of the last LoadWidgets, name -> task for widgets that missed the budget
+        self.loadTasks = []
+        self.deferredTasks = {}
 
         self.panelHeight = self.panelWidth = None
 
@@ -21,73 +93,213 @@ class WidgetManager:
         if not self.widgets:
             return
 
-        print(f"[Log] [WidgetManager] [{self.widgetType.upper()}] | Unloading {len(self.widgets)} widgets...")
+        self.log.Debug(f"Unloading {len(self.widgets)} widgets...")
 
         for widget in self.widgets:
+            # Sandboxed widgets stop their process
+            if hasattr(widget, "Shutdown"):
+                widget.Shutdown()
             widget.setParent(None)
             widget.deleteLater()
         self.widgets.clear()
+        self.widgetNames.clear()
 
+    # Raw active_widgets and sandboxed_widgets values of the theme
+    def ReadWidgetLists(self):
+        configSection = "Taskbar" if self.widgetType == "taskbar" else "Desktop"
+        return (
+            themeConfig.theme.Get(configSection, "active_widgets", fallback = ""),
+            themeConfig.theme.Get(configSection, "sandboxed_widgets", fallback = "")
+        )
+
+    # ***info***
+    # Widget folder and its module file: app/widgets/<type>/<name> first, then userdata/widgets/<type>/<name>
+    # Module file - __init__.py, otherwise <name>.py (any case) or the only .py file of the folder
+    # Returns (folder, module file) or (None, None)
+    # **********
+    def FindWidget(self, name):
+        for baseDir in (os.path.join("app", "widgets"), os.path.join("userdata", "widgets")):
+            folder = themeConfig.app.GetPath(os.path.join(baseDir, self.widgetType, name))
+            if not os.path.isdir(folder):
+                continue
+
+            initFile = os.path.join(folder, "__init__.py")
+            if os.path.isfile(initFile):
+                return folder, initFile
+
+            scripts = sorted(fileName for fileName in os.listdir(folder) if fileName.endswith(".py"))
+            named = [fileName for fileName in scripts if fileName[:-3].lower() == name.lower()]
+            if named or len(scripts) == 1:
+                return folder, os.path.join(folder, (named or scripts)[0])
+        return None, None
+
+    def ImportWidgetModule(self, name):
+        # forming path to widget (module)
+        modulePath = f"widgets.{self.widgetType}.{name}"
+
+        # reimport module if it imported earlier
+        if modulePath in sys.modules:
+            return importlib.reload(sys.modules[modulePath])
+
+        try:
+            module = importlib.import_module(modulePath)
+            # Folder without __init__.py is a namespace package, its script is loaded below
+            if getattr(module, "__file__", None) is not None:
+                return module
+            del sys.modules[modulePath]
+        except ModuleNotFoundError as e:
+            # Only a missing widget goes on to userdata (not a missing import inside the widget)
+            if e.name != modulePath:
+                raise
+
+        folder, scriptPath = self.FindWidget(name)
+        if scriptPath is None:
+            raise ModuleNotFoundError(f"No module named {modulePath!r}", name = modulePath)
+        # Loaded from the file again on every LoadWidgets (same as reload)
+        return LoadWidgetModule(scriptPath, f"userwidgets.{self.widgetType}.{name}")
+
+    # [Sandbox] of the widget config.ini: position/size/FPS of its process
+    def ReadSandboxSettings(self, name):
+        folder, scriptPath = self.FindWidget(name)
+        if scriptPath is None:
+            raise ModuleNotFoundError(f"No module named 'widgets.{self.widgetType}.{name}'", name = name)
+
+        sandboxConfig = configparser.ConfigParser(interpolation = None)
+        sandboxConfig.read(os.path.join(folder, "config.ini"))
+        section = "Sandbox"
+        return {
+            "modulePath": scriptPath,
+            "x": sandboxConfig.getint(section, "x", fallback = 0),
+            "y": sandboxConfig.getint(section, "y", fallback = 0),
+            "width": sandboxConfig.getint(section, "width", fallback = 400),
+            "height": sandboxConfig.getint(section, "height", fallback = 200),
+            "targetFps": sandboxConfig.getint(section, "target_fps", fallback = 30),
+        }
+
+    # GUI thread part of a finished WidgetLoadTask, returns the widget or None
+    def CreateWidget(self, task):
+        if task.failed:
+            return None
+
+        startTime = time.perf_counter()
+        with profiler.Span(f"widget.{self.widgetType}.{task.name}"):
+            try:
+                if task.sandboxed:
+                    instance = SandboxedWidget(self.parent, task.name, **task.sandboxSettings)
+                # Finding the "Widget" class in the module
+                elif not hasattr(task.module, "Widget"):
+                    self.log.Warning(f"Widget '{task.name}' has no class 'Widget' inside __init__.py. Don't know what to do with it.")
+                    return None
+                else:
+                    # Attaching the widget to the parent
+                    instance = ConstructWidget(task.module, self.parent, task.prepared)
+            except Exception as e:
+                self.log.Exception(f"Failed to load widget '{task.name}': {e}")
+                return None
+
+        createMs = (time.perf_counter() - startTime) * 1000
+        # Construction blocks the GUI thread, the budget applies to it as well
+        if self.loadBudgetMs and createMs > self.loadBudgetMs:
+            self.log.Warning(f"Widget '{task.name}' took {createMs:.1f} ms to construct (budget {self.loadBudgetMs} ms)")
+        self.log.Debug(f"Loaded: {task.name}{' (sandboxed)' if task.sandboxed else ''} (load {task.loadMs:.1f} ms, construct {createMs:.1f} ms)")
+
+        # Adding widget to list
+        self.widgets.append(instance)
+        self.widgetNames[instance] = task.name
+        return instance
+
+    # ***info***
+    # Imports and Prepare() of all widgets run on the pool at once, the GUI thread then creates them in config order
+    # load_budget_ms - time LoadWidgets waits for the workers, widgets that are still loading are logged and
+    #                  (defer_slow) added by OnTaskFinished when ready, without defer_slow LoadWidgets waits for them
+    # **********
     def LoadWidgets(self):
         self.UnloadWidgets()
+        # Results of the previous load are not needed anymore
+        self.deferredTasks.clear()
+        self.loadTasks = []
 
-        configSection = "Taskbar" if self.widgetType == "taskbar" else "Desktop"
-        
         # Reading active widgets
-        rawList = themeConfig.theme.Get(configSection, "active_widgets", fallback = "")
+        rawList, sandboxList = self.ReadWidgetLists()
+        self.loadedList = (rawList, sandboxList)
         
         if not rawList:
-            print(f"[Log] [WidgetManager] [WidgetType: {self.widgetType.upper()}] | No active widgets found in config.")
+            self.log.Info("No active widgets found in config.")
             return
 
-        widgetNames = [x.strip() for x in rawList.split(",")]
+        widgetNames = [x.strip() for x in rawList.split(",") if x.strip()]
+        sandboxedNames = {x.strip() for x in sandboxList.split(",") if x.strip()}
 
+        startTime = time.perf_counter()
         for name in widgetNames:
-            if not name:
+            task = WidgetLoadTask(self, name, name in sandboxedNames)
+            task.signals.finished.connect(self.OnTaskFinished)
+            self.loadTasks.append(task)
+            self.pool.start(task)
+
+        deadline = startTime + self.loadBudgetMs / 1000 if self.loadBudgetMs else None
+        for task in self.loadTasks:
+            if deadline is None or not self.deferSlowWidgets:
+                task.done.wait()
+            elif not task.done.wait(max(0.0, deadline - time.perf_counter())):
+                self.log.Warning(f"Widget '{task.name}' is still loading after {self.loadBudgetMs} ms, it will be added when ready")
+                self.deferredTasks[task.name] = task
                 continue
-            
-            try:
-                # forming path to widget (module)
-                modulePath = f"widgets.{self.widgetType}.{name}"
-                
-                # reimport module if it imported earlier
-                if modulePath in sys.modules:
-                    module = importlib.reload(sys.modules[modulePath])
-                else:
-                    module = importlib.import_module(modulePath)
 
-                # Finding the "Widget" class in the module
-                if not hasattr(module, "Widget"):
-                    print(f"[Log] [WidgetManager] [WidgetType: {self.widgetType.upper()}] | Widget '{name}' has no class 'Widget' inside __init__.py. Don't know what to do with it.")
-                    continue
-                else:
-                    widgetClass = getattr(module, "Widget")
-
-                # Attaching the widget to the parent
-                instance = widgetClass(self.parent)
-                # Adding widget to list
-                self.widgets.append(instance)
-                
-                print(f"[Log] [WidgetManager] [WidgetType: {self.widgetType.upper()}] | Loaded: {name}")
-
-            # exceptions
-            except ModuleNotFoundError:
-                print(f"[Log] [WidgetManager] [WidgetType: {self.widgetType.upper()}] | Widget folder not found: widgets/{self.widgetType}/{name}")
-            except Exception as e:
-                print(f"[Log] [WidgetManager] [WidgetType: {self.widgetType.upper()}] | Failed to load widget '{name}': {e}")
-                import traceback
-                traceback.print_exc()
+            if self.loadBudgetMs and task.loadMs > self.loadBudgetMs:
+                self.log.Warning(f"Widget '{task.name}' took {task.loadMs:.1f} ms to load (budget {self.loadBudgetMs} ms)")
+            self.CreateWidget(task)
+
+        # Parallel load time vs the sum of the per-widget times (sequential loading)
+        loadedTasks = [task for task in self.loadTasks if task.done.is_set()]
+        if loadedTasks:
+            totalMs = (time.perf_counter() - startTime) * 1000
+            sequentialMs = sum(task.loadMs for task in loadedTasks)
+            slowest = max(loadedTasks, key = lambda task: task.loadMs)
+            self.log.Info(f"Loaded {len(self.widgets)} widgets in {totalMs:.1f} ms (imports {sequentialMs:.1f} ms in total, slowest: {slowest.name} {slowest.loadMs:.1f} ms)")
+
+    # Deferred widget finished loading (GUI thread): created and styled like the others
+    def OnTaskFinished(self, task):
+        if self.deferredTasks.get(task.name) is not task:
+            return
+        del self.deferredTasks[task.name]
+
+        self.log.Info(f"Deferred widget '{task.name}' loaded in {task.loadMs:.1f} ms")
+        instance = self.CreateWidget(task)
+        if instance is None:
+            return
+        if hasattr(instance, "Updater"):
+            self.CallWidget(instance, instance.Updater, ["ALL"])
+        if self.parent.isVisible():
+            instance.show()
+
+    # Theme switch: modules are reimported only if the list of widgets is different
+    # (same widgets just get their styles reloaded by ReloadStyles)
+    def SyncWidgets(self):
+        if self.ReadWidgetLists() == self.loadedList:
+            return
+        self.LoadWidgets()
+
+    # Style/layout calls of a widget stay on the GUI thread, slow ones are logged
+    def CallWidget(self, widget, method, *args):
+        name = self.widgetNames.get(widget, type(widget).__name__)
+        startTime = time.perf_counter()
+        with profiler.Span(f"widget.{self.widgetType}.{name}.{method.__name__}"):
+            method(*args)
+        callMs = (time.perf_counter() - startTime) * 1000
+        if self.loadBudgetMs and callMs > self.loadBudgetMs:
+            self.log.Warning(f"Widget '{name}' {method.__name__}() took {callMs:.1f} ms (budget {self.loadBudgetMs} ms)")
 
     def ReloadStyles(self, changedSections = None):
         # Reloading winget props (all)
         for widget in self.widgets:
             if hasattr(widget, "Updater"):
-                widget.Updater(changedSections)
+                self.CallWidget(widget, widget.Updater, changedSections)
     
     def InitLayout(self):
         # Reinitializating widget (all)
         for widget in self.widgets:
             if hasattr(widget, "Init"):
-                widget.Init()
+                self.CallWidget(widget, widget.Init)
             else:
-                print(f"[Log] [WidgetManager] [WidgetType: {self.widgetType.upper()}] | Failed to init widget")
\ No newline at end of file
+                self.log.Warning("Failed to init widget")
@@ -1,23 +1,89 @@
 import os
 import random
-from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel, QFileIconProvider, QGraphicsDropShadowEffect, QFrame
+import time
+from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel, QFrame
 from PyQt6.QtGui import QPainter, QPixmap, QColor, QIcon, QPen, QBrush
-from PyQt6.QtCore import Qt, QTimer, QVariantAnimation, QFileInfo, QRect
+from PyQt6.QtCore import Qt, QTimer, QVariantAnimation, QRect, QFileSystemWatcher
 from core.config import config as themeConfig
-import win32com.client
-import json
+from core.imageLoader import LoadScaledImage, WallpaperLoader
+from core.wallpaperCache import WallpaperCache, PixmapCache
+from core.desktopScanner import ScanDirectory, DiffEntries
+from core.iconProvider import GetIconService
+from core.desktopLayout import DesktopLayoutStore
+from core.styles import styleCache, RenderShadowedText
+from core.profiler import profiler
+from core.logger import GetLogger
+from core.widgetManager import WidgetManager
+from ui.wallpaper import CreateWallpaperLayer
+from ui.desktopIcons import DesktopIconLayer, GetIconLabelFont, GetDisplayName
+
+log = GetLogger("Desktop")
+
+# Desktop icon grid metrics
+GRID_ITEM_WIDTH = 86
+GRID_ITEM_HEIGHT = 110
+GRID_MARGIN_X = 50
+GRID_MARGIN_Y = 50
+GRID_SPACING_X = 10
+GRID_SPACING_Y = 10
+GRID_STEP_X = GRID_ITEM_WIDTH + GRID_SPACING_X
+GRID_STEP_Y = GRID_ITEM_HEIGHT + GRID_SPACING_Y
+
+def BuildDesktopIconStyle():
+    return """
+        QFrame#IconFrame {
+            background: transparent;
+            border: 1px solid transparent;
+            border-radius: 4px;
+        }
+        QFrame#IconFrame:hover {
+            background: rgba(255, 255, 255, 30);
+            border: 1px solid rgba(255, 255, 255, 60);
+        }
+        QFrame#IconFrame[selected = "true"] {
+            background: rgba(255, 255, 255, 60);
+            border: 1px solid rgba(255, 255, 255, 100);
+        }
+        QFrame#IconFrame[selected = "true"]:hover {
+            background: rgba(255, 255, 255, 80);
+            border: 1px solid rgba(255, 255, 255, 120);
+        }
+    """
 
 class DesktopWindow(QMainWindow):
-    def __init__(self):
+    # deferIcons - wallpaper only, icons are shown by a later ScanDesktop() call (staged startup)
+    def __init__(self, deferIcons = False):
         super().__init__()
+        self.deferIcons = deferIcons
         
-        self.backgroundBitmap = None 
-        self.nextBackgroundBitmap = None
-        self.fadeAlpha = 0.0
+        performanceConfig = themeConfig.app.snapshot.Performance
+
+        # Wallpaper + cross-fade renderer (behind every other desktop widget)
+        self.wallpaperLayer = CreateWallpaperLayer(
+            self,
+            useGpu = performanceConfig.use_gpu,
+            msaaSamples = performanceConfig.msaa_samples,
+            targetFps = performanceConfig.target_fps
+        )
+        self.setCentralWidget(self.wallpaperLayer)
         
         self.wallpaperMode = None
         self.wallpaperList = []
         self.currentWallpaperIndex = 0
+        # Wallpaper path waiting for the prefetch to finish
+        self.awaitingWallpaper = None
+
+        # Scaled wallpapers saved on disk (skips decoding on the next start)
+        cacheSizeMb = performanceConfig.wallpaper_disk_cache_mb
+        self.wallpaperCache = WallpaperCache(themeConfig.app.GetPath("userdata\\cache\\wallpapers"), cacheSizeMb * 1024 * 1024)
+
+        # Scaled carousel frames kept in memory (budget in MB)
+        memoryCacheMb = performanceConfig.wallpaper_cache_mb
+        self.wallpaperMemoryCache = PixmapCache(memoryCacheMb * 1024 * 1024)
+
+        # Background decoding of the next carousel wallpaper
+        self.wallpaperLoader = WallpaperLoader(self, self.wallpaperCache)
+        self.wallpaperLoader.wallpaperReady.connect(self.OnWallpaperReady)
 
         # Carousel timer
         self.carouselTimer = QTimer(self)
@@ -28,6 +94,21 @@ class DesktopWindow(QMainWindow):
         self.fadeAnimation.valueChanged.connect(self.UpdateFade)
         self.fadeAnimation.finished.connect(self.EndTransition)
 
+        # Desktop widgets (in-process and sandboxed), loaded in Init under the icons
+        self.widgetsManager = WidgetManager(self, "desktop")
+
+        # Desktop folder watcher (incremental icon updates)
+        self.desktop_path = os.path.expanduser("~/Desktop")
+        self.desktop_entries = {}
+        self.desktopWatcher = QFileSystemWatcher(self)
+        self.desktopWatcher.directoryChanged.connect(self.OnDesktopDirectoryChanged)
+
+        # Bursts of changes (copying many files, etc.) are synced once
+        self.desktopSyncTimer = QTimer(self)
+        self.desktopSyncTimer.setSingleShot(True)
+        self.desktopSyncTimer.setInterval(200)
+        self.desktopSyncTimer.timeout.connect(self.SyncDesktop)
+
         # ahhhhh I'm too lazy to comment all the code :(
         # i think I'll do it next time
         self.Init()
@@ -45,28 +126,35 @@ class DesktopWindow(QMainWindow):
         screen = self.screen().geometry()
         self.setGeometry(screen)
 
-        self.wallpaperMode = themeConfig.theme.Get("Desktop", "wallpaper_mode", fallback="cover")
-        backgroundPath = themeConfig.theme.GetResource(themeConfig.theme.Get("Desktop", "wallpaper_path"))
-        
-        isCarousel = themeConfig.theme.GetBool("Desktop", "wallpaper_carousel", fallback=True)
-        intervalMin = themeConfig.theme.GetFloat("Desktop", "carousel_interval_min", fallback=15)
-        self.shuffle = themeConfig.theme.GetBool("Desktop", "carousel_shuffle", fallback=False)
-        transitionMs = themeConfig.theme.GetInt("Desktop", "wallpaper_transition_ms", fallback=500)
-
-        self.fadeAnimation.setDuration(transitionMs)
-        self.fadeAnimation.setStartValue(0.0)
-        self.fadeAnimation.setEndValue(1.0)
-
-        print(f"[Log] [Desktop] | Loading wallpaper: {backgroundPath} (Mode: {self.wallpaperMode})")
-
-        self.LoadWallpaper(backgroundPath, isCarousel, intervalMin)
+        self.ApplyWallpaperConfig()
+        # Theme edits / theme switches
+        themeConfig.Subscribe("theme", "Desktop", None, self.OnDesktopConfigChanged, owner = self)
 
         self.desktop_items = []
-        self.selected_items = []
+        self.items_by_path = {}
+        # (grid_x, grid_y) -> [items] (one item per cell normally)
+        self.grid_index = {}
+        self.selected_items = set()
+        self.layoutStore = DesktopLayoutStore(themeConfig.theme.GetPath("userdata\\preferences\\user\\desktopdata.json"), parent = self)
 
         self.is_selecting = False
         self.selection_start = None
-        self.previously_selected = [] 
+        self.previously_selected = set()
+        # Last rubber band rect, only cells under old + new rect are checked on move
+        self.last_selection_rect = None
+
+        # Widgets first, icons are created later and stay on top of them
+        self.widgetsManager.LoadWidgets()
+
+        # Icon rendering mode: widgets (QWidget tree per icon) / painted (one layer draws the whole grid)
+        self.iconLayer = None
+        if themeConfig.app.snapshot.Desktop.icon_render_mode == "painted":
+            self.iconLayer = DesktopIconLayer(self)
+            self.iconLayer.setGeometry(self.rect())
+            self.iconLayer.show()
+        else:
+            # One stylesheet for all icon widgets instead of one per icon
+            styleCache.Apply(self, styleCache.Get("desktopIcons", BuildDesktopIconStyle))
 
         self.selection_box = QWidget(self)
         self.selection_box.setStyleSheet("""
@@ -75,102 +163,221 @@ class DesktopWindow(QMainWindow):
         """)
         self.selection_box.hide()
 
-        self.ScanDesktop()
+        if not self.deferIcons:
+            self.ScanDesktop()
 
+    @profiler.Timed("desktop.scan")
     def ScanDesktop(self):
-        desktop_path = os.path.expanduser("~/Desktop")
-        json_path = themeConfig.theme.GetPath("userdata\\preferences\\user\\desktopdata.json")
-
-        desktop_data = {"desktop": []}
-        if os.path.exists(json_path):
-            try:
-                with open(json_path, "r", encoding="utf-8") as f:
-                    desktop_data = json.load(f)
-            except Exception as e:
-                print(f"[Log] [Desktop] | Failed to read JSON: {e}")
+        self.layoutStore.Load()
+        saved_items = dict(self.layoutStore.itemsByPath)
 
-        saved_items = {item["path"]: item for item in desktop_data.get("desktop", []) if "path" in item}
-
-        if not os.path.exists(desktop_path):
-            print("[Log] [Desktop] | Desktop folder not found!")
+        if not os.path.exists(self.desktop_path):
+            log.Warning("Desktop folder not found!")
             return
 
-        itemHeight = 110
-        windowMarginY = 50
-        spacingY = 10
-        max_rows = max(1, (self.height() - windowMarginY * 2) // (itemHeight + spacingY))
+        max_rows = self.GetMaxRows()
 
         occupied_positions = set()
         for item in saved_items.values():
             pos = item.get("position", [0, 0])
             occupied_positions.add((pos[0], pos[1]))
 
-        valid_filepaths = []
-        for filename in os.listdir(desktop_path):
-            if filename.startswith('.') or filename.lower() == 'desktop.ini':
-                continue
-            valid_filepaths.append(os.path.join(desktop_path, filename))
+        self.desktop_entries = ScanDirectory(self.desktop_path)
 
         updated_desktop_data = []
         
-        for filepath in valid_filepaths:
+        for filepath in self.desktop_entries:
             if filepath in saved_items:
                 updated_desktop_data.append(saved_items[filepath])
             else:
                 new_pos = self.GetFirstFreePosition(occupied_positions, max_rows)
                 
                 occupied_positions.add(tuple(new_pos)) 
-                
-                new_item = {
-                    "type": "file",
-                    "name": os.path.basename(filepath),
-                    "path": filepath,
-                    "icon": "default",
-                    "position": new_pos 
-                }
-                updated_desktop_data.append(new_item)
-
-        desktop_data["desktop"] = updated_desktop_data
-        
-        os.makedirs(os.path.dirname(json_path), exist_ok=True)
-        
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(desktop_data, f, indent=4, ensure_ascii=False)
+                updated_desktop_data.append(self.MakeItemData(filepath, new_pos))
+
+        # Written only if something really changed
+        self.layoutStore.SetItems(updated_desktop_data)
 
         self.RenderGrid(updated_desktop_data)
 
+        # Further changes are applied incrementally
+        if self.desktop_path not in self.desktopWatcher.directories():
+            self.desktopWatcher.addPath(self.desktop_path)
+
+    def MakeItemData(self, filepath, position):
+        return {
+            "type": "file",
+            "name": os.path.basename(filepath),
+            "path": filepath,
+            "icon": "default",
+            "position": position
+        }
+
+    def GetMaxRows(self):
+        return max(1, (self.height() - GRID_MARGIN_Y * 2) // GRID_STEP_Y)
+
+    def OnDesktopDirectoryChanged(self, path):
+        self.desktopSyncTimer.start()
+
+    # Applies only the difference between the last scan and the current folder state
+    def SyncDesktop(self):
+        new_entries = ScanDirectory(self.desktop_path)
+        added, removed, renamed, modified = DiffEntries(self.desktop_entries, new_entries)
+        self.desktop_entries = new_entries
+
+        if not (added or removed or renamed or modified):
+            return
+
+        iconService = GetIconService()
+
+        for filepath in removed:
+            self.layoutStore.Remove(filepath)
+            self.RemoveItem(filepath)
+
+        for old_path, new_path in renamed:
+            self.layoutStore.Rename(old_path, new_path)
+            iconService.Invalidate(old_path)
+
+            item = self.items_by_path.pop(old_path, None)
+            if item is not None:
+                item.SetPath(new_path)
+                self.items_by_path[new_path] = item
+
+        # Edited in place (new .exe/.ico, retargeted .lnk): icon is resolved again
+        for filepath in modified:
+            iconService.Invalidate(filepath)
+            item = self.items_by_path.get(filepath)
+            if item is not None:
+                item.ReloadIcon()
+
+        # Grid index works as occupied set here (no need to rebuild it)
+        occupied_positions = self.grid_index
+        max_rows = self.GetMaxRows()
+
+        for filepath in added:
+            new_pos = self.GetFirstFreePosition(occupied_positions, max_rows)
+
+            data = self.MakeItemData(filepath, new_pos)
+            self.layoutStore.Add(data)
+            self.CreateItem(data)
+
+        log.Info(f"Added: {len(added)}, removed: {len(removed)}, renamed: {len(renamed)}, modified: {len(modified)}")
+
     def RenderGrid(self, items_data):
-        itemWidth = 86
-        itemHeight = 110
-        windowMarginX = 50
-        windowMarginY = 50
-        spacingX = 10
-        spacingY = 10
+        renderStart = time.perf_counter()
 
         for item in self.desktop_items:
             item.deleteLater()
         self.desktop_items.clear()
+        self.items_by_path.clear()
+        self.grid_index.clear()
         self.selected_items.clear()
 
         for data in items_data:
             if data.get("type") == "widget":
                 continue
-                
-            filepath = data.get("path")
-            grid_x, grid_y = data.get("position", [0, 0])
-            
+
+            self.CreateItem(data)
+
+        renderMs = (time.perf_counter() - renderStart) * 1000
+        perItemMs = renderMs / len(self.desktop_items) if self.desktop_items else 0
+        profiler.AddTime("desktop.render_grid", renderMs)
+        profiler.Count("desktop.items_rendered", len(self.desktop_items))
+        log.Info(f"{len(self.desktop_items)} items in {renderMs:.1f} ms ({perItemMs:.2f} ms per item)")
+
+    def GetItemPosition(self, grid_x, grid_y):
+        positionX = GRID_MARGIN_X + grid_x * GRID_STEP_X
+        positionY = GRID_MARGIN_Y + grid_y * GRID_STEP_Y
+        return positionX, positionY
+
+    def AddToGridIndex(self, item):
+        self.grid_index.setdefault((item.grid_x, item.grid_y), []).append(item)
+
+    def RemoveFromGridIndex(self, item):
+        cell = (item.grid_x, item.grid_y)
+        cellItems = self.grid_index.get(cell)
+        if cellItems and item in cellItems:
+            cellItems.remove(item)
+            if not cellItems:
+                del self.grid_index[cell]
+
+    def CreateItem(self, data):
+        filepath = data.get("path")
+        grid_x, grid_y = data.get("position", [0, 0])
+        
+        if self.iconLayer is not None:
+            item = self.iconLayer.CreateItem(filepath)
+        else:
             item = DesktopItem(filepath, parent=self)
 
-            positionX = windowMarginX + grid_x * (itemWidth + spacingX)
-            positionY = windowMarginY + grid_y * (itemHeight + spacingY)
+        item.grid_x = grid_x
+        item.grid_y = grid_y
+        
+        item.move(*self.GetItemPosition(grid_x, grid_y))
+        item.show()
+        
+        self.desktop_items.append(item)
+        self.items_by_path[filepath] = item
+        self.AddToGridIndex(item)
+        return item
+
+    def RemoveItem(self, filepath):
+        item = self.items_by_path.pop(filepath, None)
+        if item is None:
+            return
+
+        self.desktop_items.remove(item)
+        self.RemoveFromGridIndex(item)
+        self.selected_items.discard(item)
+        self.previously_selected.discard(item)
 
-            item.grid_x = grid_x
-            item.grid_y = grid_y
-            
-            item.move(positionX, positionY)
-            item.show()
-            
-            self.desktop_items.append(item)
+        item.deleteLater()
+
+    def ApplyWallpaperConfig(self):
+        desktopConfig = themeConfig.theme.snapshot.Desktop
+        self.wallpaperMode = desktopConfig.wallpaper_mode
+        backgroundPath = themeConfig.theme.GetResource(desktopConfig.wallpaper_path)
+        
+        isCarousel = desktopConfig.wallpaper_carousel
+        intervalMin = desktopConfig.carousel_interval_min
+        self.shuffle = desktopConfig.carousel_shuffle
+        transitionMs = desktopConfig.wallpaper_transition_ms
+
+        self.fadeAnimation.setDuration(transitionMs)
+        self.fadeAnimation.setStartValue(0.0)
+        self.fadeAnimation.setEndValue(1.0)
+
+        # Wallpaper decoded by the theme bundle preloader (theme switches)
+        self.TakeBundleWallpapers()
+
+        log.Info(f"Loading wallpaper: {backgroundPath} (Mode: {self.wallpaperMode})")
+
+        self.LoadWallpaper(backgroundPath, isCarousel, intervalMin)
+
+    def TakeBundleWallpapers(self):
+        bundle = themeConfig.theme.bundle
+        if bundle is None:
+            return
+        for key, image in bundle.wallpapers.items():
+            if key[1:3] == (self.width(), self.height()) and not self.wallpaperMemoryCache.Contains(key):
+                self.wallpaperMemoryCache.Put(key, QPixmap.fromImage(image))
+
+    def OnDesktopConfigChanged(self, changes):
+        widgetKeys = ("active_widgets", "sandboxed_widgets")
+        if any(change.key in widgetKeys for change in changes):
+            self.widgetsManager.SyncWidgets()
+        # Other keys are wallpaper keys
+        if all(change.key in widgetKeys for change in changes):
+            return
+
+        self.carouselTimer.stop()
+        if self.fadeAnimation.state() == QVariantAnimation.State.Running:
+            self.fadeAnimation.stop()
+            self.wallpaperLayer.FinishFade()
+        self.wallpaperLoader.Clear()
+        self.awaitingWallpaper = None
+        self.wallpaperList = []
+        self.ApplyWallpaperConfig()
 
     def LoadWallpaper(self, path, isCarousel, intervalMin):
         if os.path.isdir(path):
@@ -186,81 +393,139 @@ class DesktopWindow(QMainWindow):
             self.wallpaperList = [path]
 
         if not self.wallpaperList:
-            print(f"[Log] [Desktop] [DesktopWindow] [LoadWallpaper] | No valid images found at {path}")
-            self.backgroundBitmap = QPixmap(1, 1)
-            self.backgroundBitmap.fill(QColor("#2E2E2E"))
-            self.update()
+            log.Warning(f"No valid images found at {path}")
+            emptyBitmap = QPixmap(1, 1)
+            emptyBitmap.fill(QColor("#2E2E2E"))
+            self.wallpaperLayer.SetBackground(emptyBitmap)
             return
 
         self.currentWallpaperIndex = 0
-        self.backgroundBitmap = self.GetScaledPixmap(self.wallpaperList[self.currentWallpaperIndex])
+        self.wallpaperLayer.SetBackground(self.GetScaledPixmap(self.wallpaperList[self.currentWallpaperIndex]))
 
         if isCarousel and len(self.wallpaperList) > 1:
             self.carouselTimer.start(round(intervalMin * 60 * 1000)) # to minutes
+            self.PrefetchNextWallpaper()
 
-        self.update()
+    def GetWallpaperKey(self, path):
+        return (path, self.width(), self.height(), self.wallpaperMode)
 
     def GetScaledPixmap(self, path):
-        pixmap = QPixmap(path)
-        if pixmap.isNull():
+        key = self.GetWallpaperKey(path)
+        pixmap = self.wallpaperMemoryCache.Get(key)
+        if pixmap is not None:
             return pixmap
 
-        if self.wallpaperMode == "cover":
-            return pixmap.scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatioByExpanding, Qt.TransformationMode.SmoothTransformation)
-        elif self.wallpaperMode == "contain":
-            return pixmap.scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        else:
-            return pixmap.scaled(self.size(), Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        image = LoadScaledImage(path, self.size(), self.wallpaperMode, self.wallpaperCache)
+        if image.isNull():
+            return QPixmap()
+
+        pixmap = QPixmap.fromImage(image)
+        self.wallpaperMemoryCache.Put(key, pixmap)
+        return pixmap
+
+    # Carousel frame cache diagnostics (hits, misses, evictions, memory usage)
+    def GetWallpaperCacheStats(self):
+        return self.wallpaperMemoryCache.Stats()
+
+    def GetNextWallpaperIndex(self):
+        return (self.currentWallpaperIndex + 1) % len(self.wallpaperList)
+
+    def PrefetchNextWallpaper(self):
+        nextPath = self.wallpaperList[self.GetNextWallpaperIndex()]
+
+        # Already decoded earlier
+        if self.wallpaperMemoryCache.Contains(self.GetWallpaperKey(nextPath)):
+            return
+
+        self.wallpaperLoader.Prefetch(nextPath, self.size(), self.wallpaperMode)
 
     def StartTransition(self):
-        self.currentWallpaperIndex = (self.currentWallpaperIndex + 1) % len(self.wallpaperList)
-        self.nextBackgroundBitmap = self.GetScaledPixmap(self.wallpaperList[self.currentWallpaperIndex])
+        # Previous transition is still waiting for its wallpaper
+        if self.awaitingWallpaper:
+            return
+
+        blockStart = time.perf_counter()
+
+        self.currentWallpaperIndex = self.GetNextWallpaperIndex()
+        nextPath = self.wallpaperList[self.currentWallpaperIndex]
+
+        # Prefetched frames land in the memory cache (see OnWallpaperReady)
+        pixmap = self.wallpaperMemoryCache.Get(self.GetWallpaperKey(nextPath))
+        if pixmap is None:
+            # Frame didn't fit the memory budget, but the prefetch result is still there
+            pixmap = self.wallpaperLoader.Take(nextPath, self.size(), self.wallpaperMode)
+
+        if pixmap is not None:
+            source = "prefetch"
+        elif self.wallpaperLoader.IsPending(nextPath, self.size(), self.wallpaperMode):
+            # Decoding is still running, fade starts from OnWallpaperReady
+            self.awaitingWallpaper = nextPath
+            log.Info(f"Prefetch not finished yet, waiting for {nextPath}")
+            return
+        else:
+            # Nothing was prefetched (or it failed), decoding right here
+            pixmap = self.GetScaledPixmap(nextPath)
+            source = "sync"
+
+        self.BeginFade(pixmap)
+
+        blockedMs = (time.perf_counter() - blockStart) * 1000
+        log.Info(f"GUI thread blocked for {blockedMs:.2f} ms ({source}), cache: {self.GetWallpaperCacheStats()}")
+
+    def OnWallpaperReady(self, path, pixmap):
+        key = self.GetWallpaperKey(path)
+        if not pixmap.isNull() and not self.wallpaperMemoryCache.Contains(key):
+            self.wallpaperMemoryCache.Put(key, pixmap)
+            # Keeping it in the loader only if the budget rejected it
+            if self.wallpaperMemoryCache.Contains(key):
+                self.wallpaperLoader.Take(path, self.size(), self.wallpaperMode)
+
+        if path != self.awaitingWallpaper:
+            return
+
+        self.awaitingWallpaper = None
+        self.wallpaperLoader.Take(path, self.size(), self.wallpaperMode)
+
+        if pixmap.isNull():
+            # Broken image, skipping it until the next tick
+            self.PrefetchNextWallpaper()
+            return
+
+        self.BeginFade(pixmap)
+
+    def BeginFade(self, pixmap):
+        self.wallpaperLayer.StartFade(pixmap)
         self.fadeAnimation.start()
 
     def UpdateFade(self, value):
-        self.fadeAlpha = value
-        self.update()
+        # Layer repaints on its own frame timer (target_fps), here only the value is stored
+        self.wallpaperLayer.SetFadeAlpha(value)
 
     def EndTransition(self):
-        self.backgroundBitmap = self.nextBackgroundBitmap
-        self.nextBackgroundBitmap = None
-        self.fadeAlpha = 0.0
-        self.update()
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
-        
-        painter.fillRect(self.rect(), QColor("black"))
+        self.wallpaperLayer.FinishFade()
+        log.Info(f"Fade paint cost: {self.wallpaperLayer.FrameStats()}")
 
-        if self.backgroundBitmap and not self.backgroundBitmap.isNull():
-            self.DrawCenteredPixmap(painter, self.backgroundBitmap, 1.0)
+        # Decoding the next one while this one is on the screen
+        self.PrefetchNextWallpaper()
 
-        if self.nextBackgroundBitmap and not self.nextBackgroundBitmap.isNull() and self.fadeAlpha > 0:
-            self.DrawCenteredPixmap(painter, self.nextBackgroundBitmap, self.fadeAlpha)
-
-    def DrawCenteredPixmap(self, painter, pixmap, opacity):
-        painter.setOpacity(opacity)
-        
-        x = (self.width() - pixmap.width()) // 2
-        y = (self.height() - pixmap.height()) // 2
-        
-        painter.drawPixmap(x, y, pixmap)
-        painter.setOpacity(1.0)
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if getattr(self, "iconLayer", None) is not None:
+            self.iconLayer.setGeometry(self.rect())
 
     def ItemClicked(self, item, ctrl_pressed):
         if ctrl_pressed:
             if item in self.selected_items:
                 item.SetSelected(False)
-                self.selected_items.remove(item)
+                self.selected_items.discard(item)
             else:
                 item.SetSelected(True)
-                self.selected_items.append(item)
+                self.selected_items.add(item)
         else:
             if item not in self.selected_items or len(self.selected_items) > 1:
                 self.ClearSelection()
                 item.SetSelected(True)
-                self.selected_items.append(item)
+                self.selected_items.add(item)
 
     def ClearSelection(self):
         for item in self.selected_items:
@@ -273,12 +538,13 @@ class DesktopWindow(QMainWindow):
 
             if not ctrl_pressed:
                 self.ClearSelection()
-                self.previously_selected = []
+                self.previously_selected = set()
             else:
                 self.previously_selected = self.selected_items.copy()
 
             self.is_selecting = True
             self.selection_start = event.pos()
+            self.last_selection_rect = None
             
             self.selection_box.setGeometry(QRect(self.selection_start, self.selection_start))
             self.selection_box.show()
@@ -292,18 +558,40 @@ class DesktopWindow(QMainWindow):
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton and self.is_selecting:
             self.is_selecting = False
+            self.last_selection_rect = None
             self.selection_box.hide()
 
+    # Grid cells whose items can intersect the rect
+    def GetCellRange(self, rect):
+        first_x = max(0, (rect.left() - GRID_MARGIN_X - GRID_ITEM_WIDTH) // GRID_STEP_X)
+        first_y = max(0, (rect.top() - GRID_MARGIN_Y - GRID_ITEM_HEIGHT) // GRID_STEP_Y)
+        last_x = (rect.right() - GRID_MARGIN_X) // GRID_STEP_X
+        last_y = (rect.bottom() - GRID_MARGIN_Y) // GRID_STEP_Y
+        return first_x, first_y, last_x, last_y
+
     def ProcessSelection(self, selection_rect):
-        for item in self.desktop_items:
-            if selection_rect.intersects(item.geometry()):
-                if item not in self.selected_items:
-                    item.SetSelected(True)
-                    self.selected_items.append(item)
-            else:
-                if item in self.selected_items and item not in self.previously_selected:
-                    item.SetSelected(False)
-                    self.selected_items.remove(item)
+        # Only cells under the old and the new rect can change their state
+        changed_region = selection_rect if self.last_selection_rect is None else selection_rect.united(self.last_selection_rect)
+        self.last_selection_rect = selection_rect
+
+        first_x, first_y, last_x, last_y = self.GetCellRange(changed_region)
+
+        # Sparse desktops: walking occupied cells is cheaper than walking the rect
+        if (last_x - first_x + 1) * (last_y - first_y + 1) > len(self.grid_index):
+            cells = [cell for cell in self.grid_index if first_x <= cell[0] <= last_x and first_y <= cell[1] <= last_y]
+        else:
+            cells = [(x, y) for x in range(first_x, last_x + 1) for y in range(first_y, last_y + 1)]
+
+        for cell in cells:
+            for item in self.grid_index.get(cell, ()):
+                if selection_rect.intersects(item.geometry()):
+                    if item not in self.selected_items:
+                        item.SetSelected(True)
+                        self.selected_items.add(item)
+                else:
+                    if item in self.selected_items and item not in self.previously_selected:
+                        item.SetSelected(False)
+                        self.selected_items.discard(item)
 
     def GetFirstFreePosition(self, occupied_positions, max_rows):
         col = 0
@@ -314,67 +602,52 @@ class DesktopWindow(QMainWindow):
             col += 1
 
     def SnapItemToGrid(self, item):
-        itemWidth = 86   
-        itemHeight = 110
-        windowMarginX = 50
-        windowMarginY = 50
-        spacingX = 10
-        spacingY = 10
-
-        target_grid_x = round((item.x() - windowMarginX) / (itemWidth + spacingX))
-        target_grid_y = round((item.y() - windowMarginY) / (itemHeight + spacingY))
+        target_grid_x = round((item.x() - GRID_MARGIN_X) / GRID_STEP_X)
+        target_grid_y = round((item.y() - GRID_MARGIN_Y) / GRID_STEP_Y)
 
         target_grid_x = max(0, target_grid_x)
         target_grid_y = max(0, target_grid_y)
 
-        is_occupied = False
-        for other_item in self.desktop_items:
-            if other_item != item and getattr(other_item, 'grid_x', -1) == target_grid_x and getattr(other_item, 'grid_y', -1) == target_grid_y:
-                is_occupied = True
-                break
+        # O(1) occupancy check through the grid index
+        cell_items = self.grid_index.get((target_grid_x, target_grid_y), ())
+        is_occupied = any(other_item is not item for other_item in cell_items)
 
         if is_occupied:
             target_grid_x = item.grid_x
             target_grid_y = item.grid_y
         else:
+            self.RemoveFromGridIndex(item)
             item.grid_x = target_grid_x
             item.grid_y = target_grid_y
+            self.AddToGridIndex(item)
             self.UpdateItemPositionInJSON(item.filepath, target_grid_x, target_grid_y)
 
-        final_x = windowMarginX + target_grid_x * (itemWidth + spacingX)
-        final_y = windowMarginY + target_grid_y * (itemHeight + spacingY)
-        
-        item.move(final_x, final_y)
+        item.move(*self.GetItemPosition(target_grid_x, target_grid_y))
 
     def UpdateItemPositionInJSON(self, filepath, grid_x, grid_y):
-        import json
-        json_path = themeConfig.theme.GetPath("userdata\\preferences\\user\\desktopdata.json")
-        try:
-            with open(json_path, "r", encoding="utf-8") as f:
-                desktop_data = json.load(f)
-
-            for data in desktop_data.get("desktop", []):
-                if data.get("path") == filepath:
-                    data["position"] = [grid_x, grid_y]
-                    break
-                    
-            with open(json_path, "w", encoding="utf-8") as f:
-                json.dump(desktop_data, f, indent=4, ensure_ascii=False)
-                
-        except Exception as e:
-            print(f"[Log] [Desktop] | Failed to save new position for {filepath}: {e}")
+        # Saved by the layout store after the debounce window (one write per burst of drops)
+        self.layoutStore.SetPosition(filepath, grid_x, grid_y)
 
 class DesktopItem(QWidget):
     def __init__(self, filepath, parent = None):
         super().__init__(parent)
-        self.filepath = filepath
-        self.filename = os.path.basename(filepath)
-        
-        if self.filename.lower().endswith('.lnk'):
-            self.filename = self.filename[:-4]
-            
+        self.SetFilePath(filepath)
         self.Init()
 
+    def SetFilePath(self, filepath):
+        self.filepath = filepath
+        self.filename = GetDisplayName(filepath)
+
+    # Renamed on disk, updating label and icon in place
+    def SetPath(self, filepath):
+        self.SetFilePath(filepath)
+        self.textLabel.setPixmap(self.RenderLabel())
+        self.iconLabel.setPixmap(self.LoadIcon())
+
+    # Changed on disk under the same name (IconService entry invalidated by the desktop)
+    def ReloadIcon(self):
+        self.iconLabel.setPixmap(self.LoadIcon())
+
     def Init(self):
         self.setFixedSize(85, 110)
         
@@ -388,73 +661,40 @@ class DesktopItem(QWidget):
         frameLayout = QVBoxLayout(self.innerFrame)
         frameLayout.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        actualIconPath = self.filepath
-        
-        if self.filepath.lower().endswith('.lnk'):
-            try:
-                shell = win32com.client.Dispatch("WScript.Shell")
-                shortcut = shell.CreateShortCut(self.filepath)
-                target = shortcut.Targetpath
-                
-                if target and os.path.exists(target):
-                    actualIconPath = target
-            except Exception as exc:
-                print(f"[Log] [Desktop] [DesktopItem] [Init] | Failed to resolve shortcut {self.filepath}: {exc}")
-
-        provider = QFileIconProvider()
-        fileInfo = QFileInfo(actualIconPath)
-        icon = provider.icon(fileInfo)
-        
         self.iconLabel = QLabel()
-        self.iconLabel.setPixmap(icon.pixmap(48, 48)) 
+        self.iconLabel.setPixmap(self.LoadIcon())
         self.iconLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        self.textLabel = QLabel(self.filename)
+        # Label with pre-rendered shadow (no stylesheet and graphics effect per icon)
+        self.textLabel = QLabel()
         self.textLabel.setAlignment(Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignHCenter)
-        self.textLabel.setWordWrap(True)
         self.textLabel.setMaximumWidth(85) 
-        self.textLabel.setStyleSheet("""
-            color: white; 
-            font-size: 11px;
-            font-family: 'Segoe UI', Arial;
-            background: transparent;
-        """)
-
-        shadow = QGraphicsDropShadowEffect(self.textLabel)
-        shadow.setBlurRadius(5)
-        shadow.setXOffset(0)
-        shadow.setYOffset(0)
-        shadow.setColor(QColor(0, 0, 0, 255))
-        self.textLabel.setGraphicsEffect(shadow)
+        self.textLabel.setPixmap(self.RenderLabel())
 
         frameLayout.addWidget(self.iconLabel)
         frameLayout.addWidget(self.textLabel)
         mainLayout.addWidget(self.innerFrame)
 
-        self.setStyleSheet("""
-            QFrame#IconFrame {
-                background: transparent;
-                border: 1px solid transparent;
-                border-radius: 4px;
-            }
-            QFrame#IconFrame:hover {
-                background: rgba(255, 255, 255, 30);
-                border: 1px solid rgba(255, 255, 255, 60);
-            }
-            QFrame#IconFrame[selected = "true"] {
-                background: rgba(255, 255, 255, 60);
-                border: 1px solid rgba(255, 255, 255, 100);
-            }
-            QFrame#IconFrame[selected = "true"]:hover {
-                background: rgba(255, 255, 255, 80);
-                border: 1px solid rgba(255, 255, 255, 120);
-            }
-        """)
+    def RenderLabel(self):
+        return RenderShadowedText(self.filename, GetIconLabelFont(), "white", width = 85, maxLines = 3)
+
+    # Returns cached icon or placeholder, the real icon is set by SetIcon when it's resolved
+    def LoadIcon(self):
+        filepath = self.filepath
+        return GetIconService().Request(filepath, lambda pixmap: self.SetIcon(filepath, pixmap))
+
+    def SetIcon(self, filepath, pixmap):
+        # Icon of the old name (item was renamed while loading)
+        if filepath != self.filepath:
+            return
+        self.iconLabel.setPixmap(pixmap)
 
     def SetSelected(self, is_selected):
+        # Re-polishing is expensive, only on real state change
+        if self.innerFrame.property("selected") == is_selected:
+            return
         self.innerFrame.setProperty("selected", is_selected)
-        self.innerFrame.style().unpolish(self.innerFrame)
-        self.innerFrame.style().polish(self.innerFrame)
+        styleCache.Repolish(self.innerFrame)
 
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
@@ -492,4 +732,4 @@ class DesktopItem(QWidget):
                     self.parent().ClearSelection()
                 os.startfile(self.filepath)
             except Exception as e:
-                print(f"[Log] [DesktopItem] | Failed to start {self.filepath}: {e}")
\ No newline at end of file
+                log.Warning(f"Failed to start {self.filepath}: {e}")
\ No newline at end of file
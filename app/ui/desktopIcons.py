@@ -0,0 +1,312 @@
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtGui import QPainter, QColor, QFont, QPen, QRegion
+from PyQt6.QtCore import Qt, QRect, QRectF, QPoint, QTimer
+from core.iconProvider import GetIconService
+from core.styles import RenderShadowedText
+from core.profiler import profiler
+from core.logger import GetLogger
+import os
+
+log = GetLogger("DesktopIconLayer")
+
+ITEM_WIDTH = 85
+ITEM_HEIGHT = 110
+ICON_SIZE = 48
+ICON_TOP = 10
+LABEL_TOP = ICON_TOP + ICON_SIZE + 6
+LABEL_MAX_LINES = 3
+DRAG_THRESHOLD = 5
+# Icons of one column closer than this (grid spacing) share one rect of the input mask
+MASK_MERGE_GAP = 10
+
+# Frame colors: (background, border) for normal / hover / selected / selected + hover
+FRAME_COLORS = {
+    (False, False): None,
+    (False, True): (QColor(255, 255, 255, 30), QColor(255, 255, 255, 60)),
+    (True, False): (QColor(255, 255, 255, 60), QColor(255, 255, 255, 100)),
+    (True, True): (QColor(255, 255, 255, 80), QColor(255, 255, 255, 120)),
+}
+
+# Icon label font (Segoe UI 11px, Arial fallback)
+def GetIconLabelFont():
+    font = QFont("Segoe UI")
+    font.setFamilies(["Segoe UI", "Arial"])
+    font.setPixelSize(11)
+    return font
+
+# Label text of a desktop file (shortcuts are shown without .lnk)
+def GetDisplayName(filepath):
+    filename = os.path.basename(filepath)
+    if filename.lower().endswith(".lnk"):
+        return filename[:-4]
+    return filename
+
+# Desktop icon without its own QWidget, drawn by DesktopIconLayer.
+# Has the same interface the desktop uses for DesktopItem (move, geometry, SetSelected, ...).
+class PaintedDesktopItem:
+    def __init__(self, filepath, layer):
+        self.layer = layer
+        self.grid_x = self.grid_y = 0
+        self.position = QPoint(0, 0)
+        self.selected = False
+        self.iconPixmap = None
+        self.labelPixmap = None
+        self.SetPath(filepath)
+
+    def SetPath(self, filepath):
+        self.filepath = filepath
+        self.filename = GetDisplayName(filepath)
+
+        # Rendered on the first paint
+        self.labelPixmap = None
+        self.ReloadIcon()
+
+    def ReloadIcon(self):
+        filepath = self.filepath
+        self.iconPixmap = GetIconService().Request(filepath, lambda pixmap: self.SetIcon(filepath, pixmap))
+        self.layer.update(self.geometry())
+
+    def SetIcon(self, filepath, pixmap):
+        if filepath != self.filepath or self.layer is None:
+            return
+        self.iconPixmap = pixmap
+        self.layer.update(self.geometry())
+
+    def geometry(self):
+        return QRect(self.position.x(), self.position.y(), ITEM_WIDTH, ITEM_HEIGHT)
+
+    def x(self):
+        return self.position.x()
+
+    def y(self):
+        return self.position.y()
+
+    def move(self, x, y = None):
+        oldRect = self.geometry()
+        self.position = QPoint(x) if y is None else QPoint(x, y)
+        self.layer.update(oldRect.united(self.geometry()))
+        self.layer.ScheduleMaskUpdate()
+
+    def SetSelected(self, is_selected):
+        if self.selected == is_selected:
+            return
+        self.selected = is_selected
+        self.layer.update(self.geometry())
+
+    def raise_(self):
+        self.layer.RaiseItem(self)
+
+    def show(self):
+        self.layer.update(self.geometry())
+
+    def deleteLater(self):
+        self.layer.RemoveItem(self)
+        self.layer = None
+
+# ***info***
+# Single widget that paints the whole icon grid
+# It covers the whole desktop above the desktop widgets, so its mask is limited to the item rects:
+# ignored events would go to the desktop window, not to the widgets under the layer
+# **********
+class DesktopIconLayer(QWidget):
+    def __init__(self, desktop):
+        super().__init__(desktop)
+        self.desktop = desktop
+        # Paint order (last = on top)
+        self.items = []
+
+        self.hoveredItem = None
+        self.pressedItem = None
+        self.dragStartPos = None
+        self.dragOffset = None
+        self.isDragging = False
+
+        self.labelFont = GetIconLabelFont()
+
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.setMouseTracking(True)
+
+        # Item changes (grid rendering, sync, drops) rebuild the mask once
+        self.maskTimer = QTimer(self)
+        self.maskTimer.setSingleShot(True)
+        self.maskTimer.setInterval(0)
+        self.maskTimer.timeout.connect(self.UpdateMask)
+
+    def CreateItem(self, filepath):
+        item = PaintedDesktopItem(filepath, self)
+        self.items.append(item)
+        return item
+
+    def RemoveItem(self, item):
+        if item in self.items:
+            self.items.remove(item)
+        if self.hoveredItem is item:
+            self.hoveredItem = None
+        if self.pressedItem is item:
+            self.pressedItem = None
+        self.update(item.geometry())
+        self.ScheduleMaskUpdate()
+
+    def RaiseItem(self, item):
+        if item in self.items:
+            self.items.remove(item)
+            self.items.append(item)
+            self.update(item.geometry())
+
+    # ==========[> Input mask
+
+    def ScheduleMaskUpdate(self):
+        self.maskTimer.start()
+
+    def UpdateMask(self):
+        # Dragged item can go anywhere, the mask is restored after the drop (SnapItemToGrid moves it)
+        if self.isDragging:
+            return
+
+        # No items: an empty mask would mean no mask at all
+        self.setVisible(bool(self.items))
+        if not self.items:
+            return
+
+        columns = {}
+        for item in self.items:
+            rect = item.geometry()
+            columns.setdefault(rect.x(), []).append(rect)
+
+        region = QRegion()
+        for rects in columns.values():
+            rects.sort(key = QRect.y)
+            merged = rects[0]
+            for rect in rects[1:]:
+                if rect.y() <= merged.bottom() + 1 + MASK_MERGE_GAP:
+                    merged = merged.united(rect)
+                else:
+                    region = region.united(merged)
+                    merged = rect
+            region = region.united(merged)
+
+        self.setMask(region)
+        # Mask clips painting too, newly uncovered items are painted again
+        self.update()
+
+    # ==========[> Labels
+
+    def GetLabelPixmap(self, text):
+        return RenderShadowedText(text, self.labelFont, "white", width = ITEM_WIDTH, maxLines = LABEL_MAX_LINES)
+
+    # ==========[> Painting
+
+    def paintEvent(self, event):
+        frameStart = profiler.StartFrame()
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        dirtyRect = event.rect()
+
+        for item in self.items:
+            rect = item.geometry()
+            if not dirtyRect.intersects(rect):
+                continue
+            self.PaintItem(painter, item, rect)
+
+        painter.end()
+        profiler.EndFrame("desktop.icons", frameStart)
+
+    def PaintItem(self, painter, item, rect):
+        colors = FRAME_COLORS[(item.selected, item is self.hoveredItem)]
+        if colors:
+            painter.setBrush(colors[0])
+            painter.setPen(QPen(colors[1], 1))
+            painter.drawRoundedRect(QRectF(rect).adjusted(0.5, 0.5, -0.5, -0.5), 4, 4)
+
+        if item.iconPixmap is not None and not item.iconPixmap.isNull():
+            iconX = rect.x() + (ITEM_WIDTH - ICON_SIZE) // 2
+            painter.drawPixmap(QRect(iconX, rect.y() + ICON_TOP, ICON_SIZE, ICON_SIZE), item.iconPixmap)
+
+        if item.labelPixmap is None:
+            item.labelPixmap = self.GetLabelPixmap(item.filename)
+        painter.drawPixmap(rect.x(), rect.y() + LABEL_TOP, item.labelPixmap)
+
+    # ==========[> Hit testing (grid math + dragged item)
+
+    def ItemAt(self, pos):
+        # Top-most first: dragged/raised items are at the end
+        if self.pressedItem is not None and self.pressedItem.geometry().contains(pos):
+            return self.pressedItem
+
+        gridIndex = self.desktop.grid_index
+        firstX, firstY, lastX, lastY = self.desktop.GetCellRange(QRect(pos, pos))
+        for cellX in range(firstX, lastX + 1):
+            for cellY in range(firstY, lastY + 1):
+                for item in reversed(gridIndex.get((cellX, cellY), ())):
+                    if item.layer is self and item.geometry().contains(pos):
+                        return item
+        return None
+
+    def SetHovered(self, item):
+        if item is self.hoveredItem:
+            return
+        if self.hoveredItem is not None:
+            self.update(self.hoveredItem.geometry())
+        self.hoveredItem = item
+        if item is not None:
+            self.update(item.geometry())
+
+    # ==========[> Mouse
+
+    def mousePressEvent(self, event):
+        item = self.ItemAt(event.pos())
+        # Empty space -> rubber band selection on the desktop
+        if item is None or event.button() != Qt.MouseButton.LeftButton:
+            event.ignore()
+            return
+
+        self.pressedItem = item
+        self.dragStartPos = event.pos()
+        self.dragOffset = event.pos() - item.position
+        self.isDragging = False
+
+        item.raise_()
+
+        ctrl_pressed = bool(event.modifiers() & Qt.KeyboardModifier.ControlModifier)
+        self.desktop.ItemClicked(item, ctrl_pressed)
+
+    def mouseMoveEvent(self, event):
+        if self.pressedItem is None:
+            self.SetHovered(self.ItemAt(event.pos()))
+            event.ignore()
+            return
+
+        if event.buttons() & Qt.MouseButton.LeftButton:
+            if not self.isDragging and (event.pos() - self.dragStartPos).manhattanLength() > DRAG_THRESHOLD:
+                self.isDragging = True
+                self.clearMask()
+
+            if self.isDragging:
+                self.pressedItem.move(event.pos() - self.dragOffset)
+
+    def mouseReleaseEvent(self, event):
+        if self.pressedItem is None:
+            event.ignore()
+            return
+
+        if event.button() == Qt.MouseButton.LeftButton:
+            item = self.pressedItem
+            self.pressedItem = None
+            if self.isDragging:
+                self.isDragging = False
+                self.desktop.SnapItemToGrid(item)
+
+    def mouseDoubleClickEvent(self, event):
+        item = self.ItemAt(event.pos())
+        if item is None or event.button() != Qt.MouseButton.LeftButton:
+            event.ignore()
+            return
+
+        try:
+            self.desktop.ClearSelection()
+            os.startfile(item.filepath)
+        except Exception as e:
+            log.Warning(f"Failed to start {item.filepath}: {e}")
+
+    def leaveEvent(self, event):
+        self.SetHovered(None)
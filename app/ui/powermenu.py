@@ -1,13 +1,43 @@
 from PyQt6.QtWidgets import QWidget, QBoxLayout, QPushButton, QApplication, QFrame
-from PyQt6.QtCore import Qt, QSize, QFileSystemWatcher, QRectF
-from PyQt6.QtGui import QColor, QAction, QIcon, QPainter, QBrush
+from PyQt6.QtCore import Qt, QSize, QRectF
+from PyQt6.QtGui import QColor, QAction, QIcon, QPainter, QBrush, QPixmap
 from core.config import config as configurator
 from core.utils import MakeBlur
+from core.styles import styleCache
+from core.fileWatcher import GetFileWatchService
+from core.profiler import profiler
+from core.logger import GetLogger
 import subprocess
 import json
 import sys
 import os
 
+log = GetLogger("PowerMenu")
+
+def BuildPowerMenuStyle(buttonColor, buttonBorder, radius, hoverColor, pressedColor):
+    return f"""
+        QFrame#PowerMenuContainer {{
+            background-color: transparent;
+        }}
+        QPushButton {{
+            background-color: {buttonColor};
+            border: {buttonBorder}px solid white;
+            border-radius: {radius}px;
+            color: white;
+            font-size: 20px;
+            font-family: "Arial";
+            font-weight: bold;
+            margin: 0;
+        }}
+        QPushButton:hover {{ background-color: {hoverColor}; }}
+        QPushButton:pressed {{ background-color: {pressedColor}; }}
+    """
+
+# Keys of the shared button stylesheet (restyle without recreating buttons)
+BUTTON_STYLE_KEYS = frozenset(("button_color", "hover_color", "pressed_color", "button_border", "border_radius"))
+# Keys used only while painting the background/container
+PAINT_KEYS = frozenset(("argb_background_color", "argb_container_color", "argb_border_color", "use_bg_color", "double_container_bg_accent", "border_radius"))
+
 class PowerMenu(QWidget):
     def __init__(self):
         super().__init__()
@@ -28,6 +58,8 @@ class PowerMenu(QWidget):
         self.section = "PowerMenu"
         
         self.menuLayout = None
+        # Logging theme edit -> repaint latency on the next paint
+        self.repaintPending = False
 
         self.setWindowFlags(
             Qt.WindowType.FramelessWindowHint | 
@@ -59,55 +91,80 @@ class PowerMenu(QWidget):
         self.buttons = {}
 
         # File changed events
-        self.powerMenuUserPropertiesWatcher = QFileSystemWatcher()
         if os.path.exists(self.userPreferencesPath):
-            self.powerMenuUserPropertiesWatcher.addPath(self.userPreferencesPath)
-            self.powerMenuUserPropertiesWatcher.fileChanged.connect(self.LoadUserPreferences)
-        configurator.configUpdated.connect(self.UpdateStyles)
+            GetFileWatchService().Watch(self.userPreferencesPath, lambda paths: self.LoadUserPreferences(), owner = self)
+        # Theme edits and theme switches arrive as [PowerMenu] key changes
+        configurator.Subscribe("theme", self.section, None, self.OnMenuConfigChanged, owner = self)
         
         self.LoadUserPreferences()
 
+    # Full reload (first init, user preferences changes)
     def UpdateStyles(self, source = None, changedSections = None):
-        # If initial run or data update required
-        if "ALL" in changedSections or "init" in source:
-            pass
-        # If section is changed
-        elif "PowerMenu" in changedSections:
-            pass
-        # if update for PowerMenu not required
-        else:
+        self.ReadConfig()
+        self.RebuildMenu()
+
+    # ***info***
+    # Called with the changed [PowerMenu] keys (ConfigChange list)
+    # Button colors -> shared stylesheet only, background colors -> repaint only, other keys -> full rebuild
+    # **********
+    def OnMenuConfigChanged(self, changes):
+        changedKeys = {change.key for change in changes}
+        self.ReadConfig()
+        self.repaintPending = True
+
+        if not changedKeys <= BUTTON_STYLE_KEYS | PAINT_KEYS:
+            self.RebuildMenu()
             return
 
+        if changedKeys & BUTTON_STYLE_KEYS:
+            self.RestyleButtons()
+        if changedKeys & PAINT_KEYS:
+            self.ColorPicker(True)
+            self.themeUpdatedState = True
+            self.update()
+
+    def ReadConfig(self):
+        self.screen = QApplication.primaryScreen().geometry()
+        # Typed snapshot (parsed once per theme load), colors are kept as strings for stylesheets/blur
+        menuConfig = configurator.theme.snapshot.PowerMenu
+        self.buttonSize = menuConfig.button_size
+        self.hoverColor = menuConfig.hover_color
+        self.pressedColor = menuConfig.pressed_color
+        self.spacing = menuConfig.spacing
+        self.buttonColor = menuConfig.button_color
+        self.isFullscreen = menuConfig.fullscreen
+        self.blurEnabled = menuConfig.blur_enabled
+        self.blurMode = menuConfig.blur_mode
+        self.radius = 0 if self.blurEnabled and self.isFullscreen == False else menuConfig.border_radius
+        self.bgColor = menuConfig.argb_background_color.raw
+        self.containerColor = menuConfig.argb_container_color.raw
+        self.borderWidth = menuConfig.border_width_px
+        self.borderColor = menuConfig.argb_border_color.raw
+        self.buttonBorder = menuConfig.button_border
+        self.containerWidth = menuConfig.width
+        self.containerHeight = menuConfig.height
+        self.containerMargins = menuConfig.margins
+        self.containerPaddings = menuConfig.paddings
+        self.doubleContainerBackground = menuConfig.double_container_bg
+        self.doubleContainerBackgroundAccent = menuConfig.double_container_bg_accent
+        self.iconsDir = menuConfig.icons_dir
+        self.useBGColor = menuConfig.use_bg_color
+
+    # Container style (+ shared button style, built once per theme revision)
+    def RestyleButtons(self):
+        containerStyle = styleCache.Get(
+            "powerMenu", BuildPowerMenuStyle,
+            self.buttonColor, self.buttonBorder, self.radius, self.hoverColor, self.pressedColor
+        )
+        styleCache.Apply(self.container, containerStyle)
+
+    def RebuildMenu(self):
         while self.containerLayoutForButtons.count():
             item = self.containerLayoutForButtons.takeAt(0)
             widget = item.widget()
             if widget:
                 widget.deleteLater()
 
-        self.screen = QApplication.primaryScreen().geometry()
-        self.buttonSize = configurator.theme.GetInt(self.section, "button_size", fallback = 80)
-        self.hoverColor = configurator.theme.Get(self.section, "hover_color", fallback = "#FFFFFF20")
-        self.pressedColor = configurator.theme.Get(self.section, "pressed_color", fallback = "#FFFFFF40")
-        self.spacing = configurator.theme.GetInt(self.section, "spacing", fallback = 50)
-        self.buttonColor = configurator.theme.Get(self.section, "button_color", fallback = "transparent")
-        self.isFullscreen = configurator.theme.GetBool(self.section, "fullscreen", fallback = True)
-        self.blurEnabled = configurator.theme.GetBool(self.section, "blur_enabled", fallback = True)
-        self.blurMode = configurator.theme.GetInt(self.section, "blur_mode", fallback = 0)
-        self.radius = 0 if self.blurEnabled and self.isFullscreen == False else configurator.theme.GetInt("PowerMenu", "border_radius", fallback = 10)
-        self.bgColor = configurator.theme.Get(self.section, "argb_background_color", fallback = "#00000080")
-        self.containerColor = configurator.theme.Get(self.section, "argb_container_color", fallback = "#00000080")
-        self.borderWidth = configurator.theme.GetInt(self.section, "border_width_px", fallback = 1)
-        self.borderColor = configurator.theme.Get(self.section, "argb_border_color", fallback = "#00000080")
-        self.buttonBorder = configurator.theme.GetInt(self.section, "button_border", fallback = 0)
-        self.containerWidth = configurator.theme.GetInt(self.section, "width", fallback = 600)
-        self.containerHeight = configurator.theme.GetInt(self.section, "height", fallback = 200)
-        self.containerMargins = configurator.theme.GetInt(self.section, "margins", fallback = 0)
-        self.containerPaddings = configurator.theme.GetInt(self.section, "paddings", fallback = 10)
-        self.doubleContainerBackground = configurator.theme.GetBool(self.section, "double_container_bg", fallback = False)
-        self.doubleContainerBackgroundAccent = configurator.theme.Get(self.section, "double_container_bg_accent", fallback = "bg")
-        self.iconsDir = configurator.theme.Get(self.section, "icons_dir", fallback = "")
-        self.useBGColor = configurator.theme.GetBool(self.section, "use_bg_color", fallback = False)
-
         self.LayoutPicker()
         self.ColorPicker(True)
 
@@ -124,22 +181,11 @@ class PowerMenu(QWidget):
                     self.RunCommand(type, act)
             )
             
-            buttonStyle = f"""
-                QPushButton {{
-                    background-color: {self.buttonColor};
-                    border: {self.buttonBorder}px solid white;
-                    border-radius: {self.radius}px;
-                    color: white;
-                    font-size: 20px;
-                    font-family: "Arial";
-                    font-weight: bold;
-                    margin: 0;
-                }}
-                QPushButton:hover {{ background-color: {self.hoverColor}; }}
-                QPushButton:pressed {{ background-color: {self.pressedColor}; }}
-            """ + buttonPreference.get("overrideStyles", "")
-
-            button.setStyleSheet(buttonStyle)
+            # Base style comes from the container, only overrides are set per button
+            overrideStyles = buttonPreference.get("overrideStyles", "")
+            if overrideStyles:
+                button.setStyleSheet(overrideStyles)
+
             button.setFixedSize(self.buttonSize, self.buttonSize)
             
             icon = buttonPreference.get("icon")
@@ -149,7 +195,15 @@ class PowerMenu(QWidget):
             else:
                 icon = configurator.theme.GetPath(f"{self.iconsDir}\\{buttonID}.svg")
             
-            if os.path.exists(icon):
+            # Rendered by the theme bundle preloader if possible
+            bundle = configurator.theme.bundle
+            preloadedIcon = bundle.GetIcon(icon) if bundle is not None else None
+
+            if preloadedIcon is not None:
+                iconSize = self.buttonSize // 2
+                button.setIcon(QIcon(QPixmap.fromImage(preloadedIcon)))
+                button.setIconSize(QSize(iconSize, iconSize))
+            elif os.path.exists(icon):
                 iconSize = self.buttonSize // 2
                 button.setIcon(QIcon(icon))
                 button.setIconSize(QSize(iconSize, iconSize))
@@ -159,12 +213,7 @@ class PowerMenu(QWidget):
             self.containerLayoutForButtons.addWidget(button)
             self.buttons[buttonID] = button
 
-        # Container style
-        self.container.setStyleSheet(f"""
-            QFrame#PowerMenuContainer {{
-                background-color: transparent;
-            }}
-        """)
+        self.RestyleButtons()
 
         self.containerLayoutForButtons.setContentsMargins(0, 0, 0, 0)
         self.containerLayoutForButtons.setSpacing(self.spacing)
@@ -204,7 +253,7 @@ class PowerMenu(QWidget):
         self.update()
 
     def LayoutPicker(self):
-        configLayout = configurator.theme.Get(self.section, "menu_layout", fallback = "horizontal")
+        configLayout = configurator.theme.snapshot.PowerMenu.menu_layout
 
         if configLayout != self.menuLayout:
             # v/h orientation picker 2000
@@ -243,7 +292,7 @@ class PowerMenu(QWidget):
             return self.containerColor
 
     def LoadUserPreferences(self):
-        print("[Log] [PowerMenu] [UserPreferences] | Changes detected. Reloading.")
+        log.Debug("Changes detected. Reloading.")
         # Deleting buttons 
         self.buttons.clear()
 
@@ -254,6 +303,7 @@ class PowerMenu(QWidget):
         self.UpdateStyles("manual", ["ALL"])
 
     def paintEvent(self, event):
+        frameStart = profiler.StartFrame()
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
@@ -272,7 +322,7 @@ class PowerMenu(QWidget):
 
         buttonLen = len(self.buttons)
         if buttonLen == 0:
-            print("[Log] [PowerMenu] | Seems like list of buttons is empty.")
+            log.Warning("Seems like list of buttons is empty.", every = 5.0)
             return
 
         currentMargins = self.containerMargins * 2 if self.doubleContainerBackground else 0
@@ -319,6 +369,14 @@ class PowerMenu(QWidget):
         painter.setBrush(QBrush(QColor(self.containerColor)))
         painter.drawRoundedRect(innerRect, self.RadiusSelector("inner"), self.RadiusSelector("inner"))
 
+        if self.repaintPending:
+            self.repaintPending = False
+            latency = configurator.SinceLastChange()
+            if latency is not None:
+                log.Info(f"Theme edit -> repaint: {latency:.2f} ms", every = 1.0)
+
+        profiler.EndFrame("powermenu", frameStart)
+
     def RadiusSelector(self, type):
         menuSize = self.containerHeightMax if self.menuLayout == "horizontal" else self.containerWidthMax
         if type == "inner":
@@ -354,7 +412,7 @@ class PowerMenu(QWidget):
                 os.system(action)
                 self.close()
             except Exception as e:
-                print(f"[Log] [PowerMenu] [RunCommand] | CMD failed: {e}")
+                log.Warning(f"CMD failed: {e}")
 
         # Programs
         elif type == "program":
@@ -362,4 +420,4 @@ class PowerMenu(QWidget):
                 subprocess.Popen(action, shell=True)
                 self.close()
             except Exception as e:
-                print(f"[Log] [PowerMenu] [RunCommand] | Exec failed: {e}")
\ No newline at end of file
+                log.Warning(f"Exec failed: {e}")
\ No newline at end of file
@@ -0,0 +1,90 @@
+from PyQt6.QtWidgets import QWidget, QApplication
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QPainter, QColor, QFont, QFontMetrics
+from core.profiler import profiler
+
+OVERLAY_REFRESH_MS = 500
+OVERLAY_MARGIN = 12
+# Slowest spans shown (by total time)
+OVERLAY_MAX_SPANS = 12
+
+# ***info***
+# Profiler numbers on top of everything (profiler_overlay hotkey)
+# Text only, mouse events go through. Showing the overlay turns the profiler on.
+# **********
+class ProfilerOverlay(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+        self.setWindowFlags(
+            Qt.WindowType.FramelessWindowHint |
+            Qt.WindowType.Tool |
+            Qt.WindowType.WindowStaysOnTopHint |
+            Qt.WindowType.WindowTransparentForInput
+        )
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+
+        self.textFont = QFont("Consolas")
+        self.textFont.setFamilies(["Consolas", "Courier New", "monospace"])
+        self.textFont.setPixelSize(12)
+        self.lineHeight = QFontMetrics(self.textFont).height()
+
+        self.refreshTimer = QTimer(self)
+        self.refreshTimer.setInterval(OVERLAY_REFRESH_MS)
+        self.refreshTimer.timeout.connect(self.Refresh)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        profiler.SetEnabled(True)
+        self.Refresh()
+        self.refreshTimer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refreshTimer.stop()
+
+    def Refresh(self):
+        snapshot = profiler.Snapshot()
+
+        lines = [f"Ninawe profiler  {snapshot['uptime_s']:.0f} s"]
+        for source, stats in snapshot["frames"].items():
+            if stats is not None:
+                lines.append(f"{source:<20} avg {stats['avg_ms']:6.2f}  p95 {stats['p95_ms']:6.2f}  max {stats['max_ms']:6.2f} ms")
+
+        lines.append("")
+        spans = sorted(snapshot["spans"].items(), key = lambda item: item[1]["total_ms"], reverse = True)
+        for name, stats in spans[:OVERLAY_MAX_SPANS]:
+            lines.append(f"{name:<32} {stats['calls']:>5}x  {stats['total_ms']:9.1f} ms  max {stats['max_ms']:7.2f}")
+
+        if snapshot["counters"]:
+            lines.append("")
+            for name, value in sorted(snapshot["counters"].items()):
+                lines.append(f"{name:<32} {value}")
+
+        self.lines = lines
+        self.UpdateGeometry()
+        self.update()
+
+    def UpdateGeometry(self):
+        metrics = QFontMetrics(self.textFont)
+        width = max((metrics.horizontalAdvance(line) for line in self.lines), default = 0) + OVERLAY_MARGIN * 2
+        height = self.lineHeight * len(self.lines) + OVERLAY_MARGIN * 2
+
+        screen = QApplication.primaryScreen().availableGeometry()
+        self.setGeometry(screen.right() - width - OVERLAY_MARGIN, screen.top() + OVERLAY_MARGIN, width, height)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(0, 0, 0, 180))
+        painter.drawRoundedRect(self.rect(), 6, 6)
+
+        painter.setFont(self.textFont)
+        painter.setPen(QColor("white"))
+        y = OVERLAY_MARGIN + QFontMetrics(self.textFont).ascent()
+        for line in self.lines:
+            painter.drawText(OVERLAY_MARGIN, y, line)
+            y += self.lineHeight
@@ -1,20 +1,38 @@
 from PyQt6.QtWidgets import QWidget, QApplication, QLabel, QHBoxLayout, QGraphicsDropShadowEffect
-from PyQt6.QtCore import Qt, QRect, QTime, QTimer, QRectF
+from PyQt6.QtCore import Qt, QRect, QTime, QTimer, QRectF, pyqtSignal
 from PyQt6.QtGui import QPainter, QColor, QBrush, QFont
 from core.config import config as themeConfig
 from core.utils import LoadFont, MakeBlur
 from core.widgetManager import WidgetManager
+from core.profiler import profiler
+from core.logger import GetLogger
+
+log = GetLogger("Taskbar")
+
+# Keys that only need a repaint (everything else changes geometry / widgets)
+TASKBAR_PAINT_KEYS = frozenset(("argb_color", "argb_border_color", "border_width_px", "border_radius_px"))
+# Keys that need the window blur to be applied again
+TASKBAR_BLUR_KEYS = frozenset(("blur_enabled", "blur_mode"))
+
 class Taskbar(QWidget):
+    # Emitted once, after the panel was drawn for the first time (startup stages / time-to-first-paint)
+    firstPainted = pyqtSignal()
+
     def __init__(self):
         super().__init__()
-        # =[> Connecting to theme config update event
+        # =[> Connecting to theme config update event (full reloads + widgets)
         themeConfig.configUpdated.connect(self.UpdateStyles)
+        # =[> [Taskbar] keys (only the affected part is updated)
+        themeConfig.Subscribe("theme", "Taskbar", None, self.OnTaskbarConfigChanged, owner = self)
         self.panelBackgroundColor = self.enableBlur = self.radius = self.borderColor = self.borderWidth = self.blurMode = None
         self.sw = self.sh = None
         self.anchorX = self.anchorY = None
         self.panelWidth = self.panelHeight = None
         self.rawPanelXPositionData = self.rawPanelYPositionData = None
         self.themeUpdatedState = True
+        # Logging theme edit -> repaint latency on the next paint
+        self.repaintPending = False
+        self.painted = False
 
         self.widgetsManager = WidgetManager(self, "taskbar")
 
@@ -33,88 +51,93 @@ class Taskbar(QWidget):
         self.InitPanelComponents()
 
     def UpdateStyles(self, source, changedSections = None):
-        # If initial run or data update required
-        if "ALL" in changedSections or "Init" in source:
-            pass
-        # If section is changed
-        elif "Taskbar" in changedSections:
-            pass
-        # if update for taskbar not required
-        else:
+        # [Taskbar] keys are handled by OnTaskbarConfigChanged, here only full reloads and widgets
+        if "ALL" not in changedSections and "init" not in source:
             if self.widgetsManager.widgets:
                 self.widgetsManager.ReloadStyles(changedSections)
             return
 
-        # =[> Data from config
-        rawBGColor = themeConfig.theme.Get("Taskbar", "argb_color", fallback = "#000000")
-        self.enableBlur = themeConfig.theme.GetBool("Taskbar", "blur_enabled", fallback = False)
-        self.blurMode = themeConfig.theme.GetInt("Taskbar", "blur_mode", fallback = 4)
+        self.ReadConfig()
+
+        # Loading widgets on start, on theme switch only if the widget list is different
+        if "init" in source:
+            self.widgetsManager.LoadWidgets()
+        elif "ALL" in changedSections:
+            self.widgetsManager.SyncWidgets()
+
+        self.UpdateWidgets(changedSections)
+
+        # Flag for blur redrawing
+        self.themeUpdatedState = True
+        
+        # "configOnly" flag
+        if source != "init":
+            self.InitPanelComponents()
+
+    # ***info***
+    # Called with the changed [Taskbar] keys (ConfigChange list)
+    # Colors/border -> repaint only, blur -> blur reapply + repaint, other keys -> geometry + widgets
+    # **********
+    def OnTaskbarConfigChanged(self, changes):
+        # Theme switch: the configUpdated ["ALL"] that follows rebuilds the whole panel once (UpdateStyles)
+        if themeConfig.switchingTheme:
+            return
+
+        changedKeys = {change.key for change in changes}
+        self.ReadConfig()
+        self.repaintPending = True
+
+        if changedKeys <= TASKBAR_PAINT_KEYS | TASKBAR_BLUR_KEYS:
+            if changedKeys & TASKBAR_BLUR_KEYS:
+                self.themeUpdatedState = True
+            self.update()
+            return
+
+        self.UpdateWidgets(["ALL"])
+        self.InitPanelComponents()
+
+    def UpdateWidgets(self, changedSections):
+        if self.widgetsManager.widgets:
+            self.widgetsManager.panelWidth = self.panelWidth
+            self.widgetsManager.panelHeight = self.panelHeight
+            self.widgetsManager.ReloadStyles(changedSections)
+
+    def ReadConfig(self):
+        # =[> Data from config (typed snapshot, parsed once per theme load)
+        taskbarConfig = themeConfig.theme.snapshot.Taskbar
+        self.enableBlur = taskbarConfig.blur_enabled
+        self.blurMode = taskbarConfig.blur_mode
         
         # =[> Panel color
         if self.enableBlur and self.blurMode == 1:
             # config blur mode: 1 (4 - acrylic)
             self.qtBgColor = QColor(0, 0, 0, 0)
-            self.winBlurColor = rawBGColor
+            self.winBlurColor = taskbarConfig.argb_color.raw
         else:
             # config blur mode: 0 (3 - default) / enable_blur = False
-            self.qtBgColor = QColor(rawBGColor)
+            self.qtBgColor = taskbarConfig.argb_color.qcolor
             self.winBlurColor = "#00000000"
 
         # Calculation the width and height of the panel
         screen = QApplication.primaryScreen().geometry()
         self.sw, self.sh = screen.width(), screen.height()
 
-        # =[> Panel width
-        rawPanelWidthData = themeConfig.theme.Get("Taskbar", "width", fallback = 90)
-        try:
-            if "%" in str(rawPanelWidthData):
-                value = int(str(rawPanelWidthData).replace("%", ""))
-                self.panelWidth = round(self.sw * (value / 100))
-            else:
-                self.panelWidth = int(str(rawPanelWidthData).replace("px", ""))
-        except ValueError:
-            self.panelWidth = self.sw
-
-        # =[> Panel height
-        rawPanelHeightData = themeConfig.theme.Get("Taskbar", "height", fallback = 30)
-        try:
-            if "%" in str(rawPanelHeightData):
-                value = int(str(rawPanelHeightData).replace("%", ""))
-                self.panelHeight = round(self.sh * (value / 100))
-            else:
-                self.panelHeight = int(str(rawPanelHeightData).replace("px", ""))
-        except ValueError:
-            self.panelHeight = round(self.sh * (2 / 100))
+        # =[> Panel size (px or % of the screen)
+        self.panelWidth = taskbarConfig.width.Resolve(self.sw)
+        self.panelHeight = taskbarConfig.height.Resolve(self.sh)
 
         # =[> Anchors getting
-        self.anchorX = themeConfig.theme.GetInt("Taskbar", "anchor_x", fallback = 50)
-        self.anchorY = themeConfig.theme.GetInt("Taskbar", "anchor_y", fallback = 100)
+        self.anchorX = taskbarConfig.anchor_x
+        self.anchorY = taskbarConfig.anchor_y
 
         # =[> Panel position
-        self.rawPanelXPositionData = themeConfig.theme.GetInt("Taskbar", "position_x", fallback = 98)
-        self.rawPanelYPositionData = themeConfig.theme.GetInt("Taskbar", "position_y", fallback = 2)
+        self.rawPanelXPositionData = taskbarConfig.position_x
+        self.rawPanelYPositionData = taskbarConfig.position_y
 
         # =[> Other props
-        self.radius = 0 if self.enableBlur else themeConfig.theme.GetInt("Taskbar", "border_radius_px", fallback = 10)
-        self.borderColor = themeConfig.theme.Get("Taskbar", "argb_border_color", fallback = "#FFFFFF33")
-        self.borderWidth = themeConfig.theme.GetInt("Taskbar", "border_width_px", fallback = 1)
-        
-        # Reloading widgets if full update
-        if "ALL" in changedSections:
-            self.widgetsManager.LoadWidgets()
-        
-        # Updating widget styles
-        if self.widgetsManager.widgets:
-            self.widgetsManager.panelWidth = self.panelWidth
-            self.widgetsManager.panelHeight = self.panelHeight
-            self.widgetsManager.ReloadStyles(changedSections)
-
-        # Flag for blur redrawing
-        self.themeUpdatedState = True
-        
-        # "configOnly" flag
-        if source != "init":
-            self.InitPanelComponents()
+        self.radius = 0 if self.enableBlur else taskbarConfig.border_radius_px
+        self.borderColor = taskbarConfig.argb_border_color.qcolor
+        self.borderWidth = taskbarConfig.border_width_px
 
     def Init(self):
         # Panel position
@@ -141,6 +164,7 @@ class Taskbar(QWidget):
 
     # qwidget automatically call this btw
     def paintEvent(self, event):
+        frameStart = profiler.StartFrame()
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
@@ -157,7 +181,7 @@ class Taskbar(QWidget):
         # Border maker 2000
         if self.borderWidth > 0:
             pen = painter.pen()
-            pen.setColor(QColor(self.borderColor))
+            pen.setColor(self.borderColor)
             pen.setWidth(self.borderWidth)
             pen.setJoinStyle(Qt.PenJoinStyle.MiterJoin)
             painter.setPen(pen)
@@ -170,4 +194,16 @@ class Taskbar(QWidget):
 
         # Drawing background & border
         painter.setBrush(QBrush(self.qtBgColor))
-        painter.drawRoundedRect(drawRect, self.radius, self.radius)
\ No newline at end of file
+        painter.drawRoundedRect(drawRect, self.radius, self.radius)
+
+        if self.repaintPending:
+            self.repaintPending = False
+            latency = themeConfig.SinceLastChange()
+            if latency is not None:
+                log.Info(f"Theme edit -> repaint: {latency:.2f} ms", every = 1.0)
+
+        profiler.EndFrame("taskbar", frameStart)
+
+        if not self.painted:
+            self.painted = True
+            self.firstPainted.emit()
\ No newline at end of file
@@ -0,0 +1,156 @@
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtGui import QPainter, QColor, QGuiApplication, QSurfaceFormat
+from PyQt6.QtCore import Qt, QTimer
+from core.profiler import profiler
+from core.logger import GetLogger
+import time
+
+log = GetLogger("WallpaperLayer")
+
+# OpenGL widget is optional (missing GL libs, offscreen runs, etc.)
+try:
+    from PyQt6.QtOpenGLWidgets import QOpenGLWidget
+except ImportError:
+    QOpenGLWidget = None
+
+# Platforms without a real GL surface
+NO_GL_PLATFORMS = ("offscreen", "minimal", "vnc")
+
+# Wallpaper drawing + cross-fade, shared by raster and OpenGL layers
+class WallpaperLayerBase:
+    def SetupLayer(self, targetFps):
+        self.backgroundBitmap = None
+        self.nextBackgroundBitmap = None
+        self.fadeAlpha = 0.0
+        self.paintedAlpha = None
+
+        # Paint cost stats for the current transition
+        self.lastPaintMs = 0.0
+        self.maxPaintMs = 0.0
+        self.totalPaintMs = 0.0
+        self.paintedFrames = 0
+
+        # Animation values are only stored, repaints are driven by this timer (target_fps cap)
+        self.frameTimer = QTimer(self)
+        self.frameTimer.setInterval(max(1, round(1000 / max(1, targetFps))))
+        self.frameTimer.timeout.connect(self.OnFrameTick)
+
+    def SetBackground(self, pixmap):
+        self.backgroundBitmap = pixmap
+        self.update()
+
+    def StartFade(self, pixmap):
+        self.nextBackgroundBitmap = pixmap
+        self.fadeAlpha = 0.0
+        self.paintedAlpha = None
+        self.ResetFrameStats()
+        self.frameTimer.start()
+
+    def SetFadeAlpha(self, value):
+        self.fadeAlpha = value
+
+    def FinishFade(self):
+        self.frameTimer.stop()
+        self.backgroundBitmap = self.nextBackgroundBitmap
+        self.nextBackgroundBitmap = None
+        self.fadeAlpha = 0.0
+        self.update()
+
+    def OnFrameTick(self):
+        # Nothing changed since the last painted frame
+        if self.fadeAlpha == self.paintedAlpha:
+            return
+        self.update()
+
+    def ResetFrameStats(self):
+        self.lastPaintMs = self.maxPaintMs = self.totalPaintMs = 0.0
+        self.paintedFrames = 0
+
+    def FrameStats(self):
+        return {
+            "frames": self.paintedFrames,
+            "last_ms": round(self.lastPaintMs, 3),
+            "max_ms": round(self.maxPaintMs, 3),
+            "avg_ms": round(self.totalPaintMs / self.paintedFrames, 3) if self.paintedFrames else 0.0,
+        }
+
+    def IsCovering(self, pixmap):
+        return pixmap.width() >= self.width() and pixmap.height() >= self.height()
+
+    def PaintLayer(self):
+        paintStart = time.perf_counter()
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+
+        hasBackground = self.backgroundBitmap is not None and not self.backgroundBitmap.isNull()
+        hasNext = self.nextBackgroundBitmap is not None and not self.nextBackgroundBitmap.isNull() and self.fadeAlpha > 0
+
+        # Black fill is only needed around "contain" wallpapers
+        if not hasBackground or not self.IsCovering(self.backgroundBitmap):
+            painter.fillRect(self.rect(), QColor("black"))
+
+        if hasBackground:
+            self.DrawCenteredPixmap(painter, self.backgroundBitmap, 1.0)
+
+        if hasNext:
+            self.DrawCenteredPixmap(painter, self.nextBackgroundBitmap, self.fadeAlpha)
+
+        painter.end()
+        self.paintedAlpha = self.fadeAlpha
+
+        self.lastPaintMs = (time.perf_counter() - paintStart) * 1000
+        self.maxPaintMs = max(self.maxPaintMs, self.lastPaintMs)
+        self.totalPaintMs += self.lastPaintMs
+        self.paintedFrames += 1
+        profiler.EndFrame("desktop.wallpaper", paintStart if profiler.enabled else None)
+
+    def DrawCenteredPixmap(self, painter, pixmap, opacity):
+        painter.setOpacity(opacity)
+
+        x = (self.width() - pixmap.width()) // 2
+        y = (self.height() - pixmap.height()) // 2
+
+        painter.drawPixmap(x, y, pixmap)
+        painter.setOpacity(1.0)
+
+# QPainter raster path (default / fallback)
+class RasterWallpaperLayer(WallpaperLayerBase, QWidget):
+    def __init__(self, parent = None, targetFps = 60):
+        super().__init__(parent)
+        self.SetupLayer(targetFps)
+        # Wallpaper is opaque, Qt doesn't need to clear the background before painting
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+
+    def paintEvent(self, event):
+        self.PaintLayer()
+
+if QOpenGLWidget is not None:
+    # OpenGL path, composition of the two pixmaps is done on the GPU
+    class GLWallpaperLayer(WallpaperLayerBase, QOpenGLWidget):
+        def __init__(self, parent = None, targetFps = 60, msaaSamples = 0):
+            super().__init__(parent)
+            self.SetupLayer(targetFps)
+
+            surfaceFormat = QSurfaceFormat()
+            surfaceFormat.setSamples(max(0, msaaSamples))
+            self.setFormat(surfaceFormat)
+
+        def paintGL(self):
+            self.PaintLayer()
+
+# ***info***
+# Picks the wallpaper layer for the [Performance] settings
+# useGpu - use_gpu key
+# msaaSamples - msaa_samples key
+# targetFps - target_fps key (fade frame rate cap)
+# **********
+def CreateWallpaperLayer(parent, useGpu = True, msaaSamples = 0, targetFps = 60):
+    platform = QGuiApplication.platformName()
+
+    if useGpu and QOpenGLWidget is not None and platform not in NO_GL_PLATFORMS:
+        log.Info(f"Using OpenGL renderer (MSAA: {msaaSamples}, FPS cap: {targetFps})")
+        return GLWallpaperLayer(parent, targetFps, msaaSamples)
+
+    log.Info(f"Using raster renderer (FPS cap: {targetFps}, platform: {platform})")
+    return RasterWallpaperLayer(parent, targetFps)
@@ -0,0 +1 @@
+from .spectrum import Widget
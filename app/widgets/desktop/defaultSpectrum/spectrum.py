@@ -0,0 +1,254 @@
+from PyQt6.QtCore import Qt, QRectF
+from PyQt6.QtGui import QPainter
+from core.visualizer import AudioVisualizer
+from core.profiler import profiler
+from core.logger import GetLogger
+import numpy as np
+
+log = GetLogger("Desktop.Spectrum")
+
+# Typed spectrum settings
+SPECTRUM_SCHEMA = {
+	"Desktop.Spectrum": {
+		"visible": ("bool", True),
+		"x": ("int", 100),
+		"y": ("int", 100),
+		"width": ("int", 800),
+		"height": ("int", 200),
+		"bands": ("int", 128),
+		"scale": ("str", "log"),
+		"min_freq": ("float", 30),
+		"max_freq": ("float", 16000),
+		"db_floor": ("float", -70),
+		"attack": ("float", 0.6),
+		"decay": ("float", 0.15),
+		"peak_hold_ms": ("int", 500),
+		"peak_fall": ("float", 0.6),
+		"bar_gap": ("int", 2),
+		"peak_height": ("int", 2),
+		"bar_color": ("color", "#CCAAFF00"),
+		"peak_color": ("color", "#FFFFFFFF"),
+	},
+}
+
+# Level changes below this are not repainted (quiet input = no repaints)
+REPAINT_THRESHOLD = 1 / 512
+
+def HzToMel(hz):
+	return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+def MelToHz(mel):
+	return 700.0 * (10.0 ** (mel / 2595.0) - 1.0)
+
+# ***info***
+# Band math of the analyzer, NumPy only (no Qt, no per-bin Python loops)
+# - bin -> band maps are built once per FFT grid: bands with bins take their loudest bin (maximum.reduceat),
+#   narrow low bands without bins are interpolated between the two nearest bins
+# - dB scaling, attack/decay smoothing and peak hold/fall run in place on preallocated arrays
+# Levels and peaks are 0..1 (db_floor..0 dBFS)
+# **********
+class SpectrumEngine:
+	def __init__(self, bands = 128, scale = "log", minFreq = 30.0, maxFreq = 16000.0, dbFloor = -70.0, attack = 0.6, decay = 0.15, peakHoldMs = 500, peakFall = 0.6):
+		self.bands = max(1, bands)
+		self.scale = scale
+		self.minFreq = max(1.0, minFreq)
+		self.maxFreq = max(self.minFreq * 1.01, maxFreq)
+		self.dbFloor = min(-1.0, dbFloor)
+		self.attack = attack
+		self.decay = decay
+		self.peakHold = peakHoldMs / 1000
+		self.peakFall = peakFall
+
+		self.edges = self.BandEdges()
+		self.centers = np.sqrt(self.edges[:-1] * self.edges[1:])
+		# FFT grid the maps were built for: (bins, sample rate)
+		self.grid = None
+
+		# Per-frame buffers
+		self.values = np.zeros(self.bands, np.float32)
+		self.target = np.zeros(self.bands, np.float32)
+		self.coefficients = np.zeros(self.bands, np.float32)
+		self.levels = np.zeros(self.bands, np.float32)
+		self.peaks = np.zeros(self.bands, np.float32)
+		self.peakAge = np.zeros(self.bands, np.float32)
+		self.rising = np.zeros(self.bands, bool)
+		self.falling = np.zeros(self.bands, bool)
+
+	def BandEdges(self):
+		if self.scale == "mel":
+			return MelToHz(np.linspace(HzToMel(self.minFreq), HzToMel(self.maxFreq), self.bands + 1))
+		if self.scale != "log":
+			log.Warning(f"Unknown scale \"{self.scale}\", using log")
+		return np.geomspace(self.minFreq, self.maxFreq, self.bands + 1)
+
+	def BuildMaps(self, frequencies):
+		bandOfBin = np.searchsorted(self.edges, frequencies, side = "right") - 1
+		inRange = (bandOfBin >= 0) & (bandOfBin < self.bands)
+		self.binStart = int(np.argmax(inRange)) if inRange.any() else 0
+		self.binEnd = self.binStart + int(inRange.sum())
+		bandOfBin = bandOfBin[self.binStart:self.binEnd]
+
+		# First bin of every band inside the in-range bins, bands without bins are interpolated
+		starts = np.searchsorted(bandOfBin, np.arange(self.bands))
+		ends = np.searchsorted(bandOfBin, np.arange(self.bands), side = "right")
+		self.filledBands = ends > starts
+		self.filledStarts = starts[self.filledBands]
+		self.emptyBands = ~self.filledBands
+
+		centers = self.centers[self.emptyBands]
+		step = frequencies[1] - frequencies[0] if len(frequencies) > 1 else 1.0
+		position = np.clip(centers / step, 0, len(frequencies) - 1.001)
+		self.emptyLow = position.astype(np.intp)
+		self.emptyWeight = (position - self.emptyLow).astype(np.float32)
+
+		self.grid = (len(frequencies), float(frequencies[-1]))
+
+	def Process(self, spectrum, frequencies, dt):
+		if self.grid != (len(frequencies), float(frequencies[-1])):
+			self.BuildMaps(frequencies)
+
+		values = self.values
+		if len(self.filledStarts):
+			values[self.filledBands] = np.maximum.reduceat(spectrum[self.binStart:self.binEnd], self.filledStarts)
+		if len(self.emptyLow):
+			low = spectrum[self.emptyLow]
+			values[self.emptyBands] = low + (spectrum[self.emptyLow + 1] - low) * self.emptyWeight
+
+		# Magnitude -> 0..1 over db_floor..0 dBFS
+		np.maximum(values, 1e-9, out = values)
+		np.log10(values, out = values)
+		values *= 20.0 / -self.dbFloor
+		values += 1.0
+		np.clip(values, 0.0, 1.0, out = self.target)
+
+		# Attack/decay per 60 FPS frame, scaled to the real frame time
+		frames = dt * 60.0
+		np.greater(self.target, self.levels, out = self.rising)
+		self.coefficients[:] = 1.0 - (1.0 - self.decay) ** frames
+		self.coefficients[self.rising] = 1.0 - (1.0 - self.attack) ** frames
+		self.levels += (self.target - self.levels) * self.coefficients
+
+		# Peak hold: new maximum resets the hold time, after it the peak falls at peak_fall per second
+		self.peakAge += dt
+		np.greater_equal(self.levels, self.peaks, out = self.rising)
+		self.peaks[self.rising] = self.levels[self.rising]
+		self.peakAge[self.rising] = 0.0
+		np.greater(self.peakAge, self.peakHold, out = self.falling)
+		self.peaks[self.falling] -= self.peakFall * dt
+		np.maximum(self.peaks, self.levels, out = self.peaks)
+
+		return self.levels, self.peaks
+
+# ***info***
+# Desktop spectrum analyzer (defaultSpectrum)
+# Audio comes from the shared AudioService, SpectrumEngine turns it into bar levels
+# Bars and peaks are two drawRects calls over QRectF lists that are built on resize and only get new tops per frame
+# **********
+class Widget(AudioVisualizer):
+	def __init__(self, parent = None):
+		super().__init__(parent, "Desktop.Spectrum", SPECTRUM_SCHEMA, __file__)
+		self.setObjectName("SpectrumWidget")
+
+		self.engine = None
+		self.lastFrameTime = None
+		# Levels of the last painted frame
+		self.paintedLevels = None
+		self.paintedPeaks = None
+		# Bar geometry (rebuilt on resize / band count change)
+		self.barRects = []
+		self.peakRects = []
+		self.barBottom = 0.0
+		self.barScale = 0.0
+		self.peakHeight = 2
+
+		self.Updater()
+
+	def ApplySettings(self, settings):
+		self.engine = SpectrumEngine(
+			bands = settings.bands,
+			scale = settings.scale.strip().lower(),
+			minFreq = settings.min_freq,
+			maxFreq = settings.max_freq,
+			dbFloor = settings.db_floor,
+			attack = settings.attack,
+			decay = settings.decay,
+			peakHoldMs = settings.peak_hold_ms,
+			peakFall = settings.peak_fall
+		)
+		self.paintedLevels = np.full(self.engine.bands, -1.0, np.float32)
+		self.paintedPeaks = np.full(self.engine.bands, -1.0, np.float32)
+		self.lastFrameTime = None
+
+		self.setGeometry(settings.x, settings.y, settings.width, settings.height)
+		self.BuildRects()
+
+	# ==========[> Geometry
+
+	def resizeEvent(self, event):
+		super().resizeEvent(event)
+		self.BuildRects()
+
+	def BuildRects(self):
+		if self.engine is None:
+			return
+		bands = self.engine.bands
+		gap = max(0, self.settings.bar_gap)
+		barWidth = max(1.0, (self.width() - gap * (bands - 1)) / bands)
+		lefts = np.arange(bands) * (barWidth + gap)
+
+		self.peakHeight = max(0, self.settings.peak_height)
+		# Peaks get their own row on top, bars use the rest of the height
+		self.barBottom = float(self.height())
+		self.barScale = float(max(1, self.height() - self.peakHeight))
+		self.barRects = [QRectF(left, self.barBottom, barWidth, 0.0) for left in lefts.tolist()]
+		self.peakRects = [QRectF(left, self.barBottom, barWidth, self.peakHeight) for left in lefts.tolist()]
+		self.barTops = np.zeros(bands, np.float64)
+		self.peakTops = np.zeros(bands, np.float64)
+		self.paintedLevels.fill(-1.0)
+
+	# ==========[> Frames
+
+	def OnAudioFrame(self, frame):
+		if self.engine is None or not self.isVisible():
+			return
+
+		dt = 1 / 60 if self.lastFrameTime is None else min(0.25, frame.time - self.lastFrameTime)
+		self.lastFrameTime = frame.time
+
+		with profiler.Span("desktop.spectrum.process"):
+			levels, peaks = self.engine.Process(frame.spectrum, frame.frequencies, dt)
+
+		# Nothing visible changed -> no repaint
+		if np.abs(levels - self.paintedLevels).max() < REPAINT_THRESHOLD and np.abs(peaks - self.paintedPeaks).max() < REPAINT_THRESHOLD:
+			return
+		self.update()
+
+	def paintEvent(self, event):
+		if self.engine is None:
+			return
+		frameStart = profiler.StartFrame()
+
+		levels, peaks = self.engine.levels, self.engine.peaks
+		self.paintedLevels[:] = levels
+		self.paintedPeaks[:] = peaks
+
+		# New tops for the prebuilt rects (bottoms stay where they are)
+		np.multiply(levels, -self.barScale, out = self.barTops)
+		self.barTops += self.barBottom
+		np.multiply(peaks, -self.barScale, out = self.peakTops)
+		self.peakTops += self.barBottom - self.peakHeight
+		for rect, top in zip(self.barRects, self.barTops.tolist()):
+			rect.setTop(top)
+		for rect, top in zip(self.peakRects, self.peakTops.tolist()):
+			rect.moveTop(top)
+
+		painter = QPainter(self)
+		painter.setPen(Qt.PenStyle.NoPen)
+		painter.setBrush(self.settings.bar_color.qcolor)
+		painter.drawRects(self.barRects)
+		if self.peakHeight:
+			painter.setBrush(self.settings.peak_color.qcolor)
+			painter.drawRects(self.peakRects)
+		painter.end()
+
+		profiler.EndFrame("desktop.spectrum", frameStart)
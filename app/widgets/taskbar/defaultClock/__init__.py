@@ -1,11 +1,42 @@
-from PyQt6.QtWidgets import QLabel, QGraphicsDropShadowEffect
-from PyQt6.QtCore import Qt, QTime, QTimer, QFileSystemWatcher
-from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QLabel
+from PyQt6.QtCore import Qt, QTime, QTimer
+from PyQt6.QtGui import QColor, QFont
 from core.config import config as selectedThemeConfig
 from core.utils import LoadFont, MakeBlur
 from core.config import ConfigWrapper
+from core.styles import styleCache, RenderShadowedText
+from core.configSnapshot import BuildSnapshot
+from core.fileWatcher import GetFileWatchService
+from core.logger import GetLogger
 import os
 
+log = GetLogger("Taskbar.Clock")
+
+# Typed clock settings (None -> theme [Global] value)
+CLOCK_SCHEMA = {
+	"Taskbar.Clock": {
+		"visible": ("bool", True),
+		"font_family": ("str", None),
+		"font_color": ("str", None),
+		"font_size": ("int", None),
+		"font_shadow": ("bool", None),
+		"width": ("int", 50),
+		"margin_left": ("int", 10),
+		"margin_right": ("int", 10),
+		"position": ("int", 50),
+		"align": ("int", 50),
+		"time_format": ("str", "HH:mm"),
+	},
+}
+
+def BuildClockStyle(fontColor, fontFamily, fontSize):
+	return f"""
+		color: {fontColor};
+		font-family: '{fontFamily}';
+		font-size: {fontSize}pt;
+		background-color: transparent;
+	"""
+
 class Widget(QLabel):
 	def __init__(self, parent = None):
 		super().__init__(parent)
@@ -21,6 +52,7 @@ class Widget(QLabel):
 		self.fontFamily = self.fontSize = self.fontColor = self.fontShadow = None
 		# Props
 		self.clockWidth = self.clockPosition = self.clockLeftMargin = self.clockRightMargin = self.clockAlign = None
+		self.timeFormat = "HH:mm"
 		# Used config
 		self.selectedConfig = None
 		# Config path
@@ -36,22 +68,16 @@ class Widget(QLabel):
 		# Connecting to config updating state
 		# Theme config
 		selectedThemeConfig.configUpdated.connect(self.Updater)
-		# Clock config
-		self.clockConfigWatcher = QFileSystemWatcher()
+		# Clock config (shared debounced watcher, unwatched when the widget is deleted)
 		if os.path.exists(self.configPath):
-			self.clockConfigWatcher.addPath(self.configPath)
-			self.clockConfigWatcher.fileChanged.connect(self.ClockConfigFileChanged)
+			GetFileWatchService().Watch(self.configPath, self.ClockConfigFileChanged, owner = self)
 		
 		#  [> Clock timer
 		self.timer = QTimer(self)
 		self.timer.timeout.connect(self.UpdateTime)
 
-	def ClockConfigFileChanged(self, path): # why the fuck did I even do that? lol
-		print(f"[Log] [Taskbar.Clock] | Local config changed: {path}. Updates will not be applied if there is already a section for this widget in the themeconfig.ini file.")
-		
-		if path not in self.clockConfigWatcher.files() and os.path.exists(path):
-			self.clockConfigWatcher.addPath(path)
-
+	def ClockConfigFileChanged(self, paths): # why the fuck did I even do that? lol
+		log.Info(f"Local config changed: {paths[0]}. Updates will not be applied if there is already a section for this widget in the themeconfig.ini file.")
 		self.Updater()
 
 	def Updater(self, changedSections = None):
@@ -70,8 +96,12 @@ class Widget(QLabel):
 		else: # build-in widget config
 			self.selectedConfig = self.clockConfig
 
+		# Parsing all clock keys once (UpdateTime runs every second)
+		clockSettings = BuildSnapshot(self.selectedConfig.parser, CLOCK_SCHEMA, self.selectedConfig.revision).Section(self.defaultSection)
+		themeGlobals = selectedThemeConfig.theme.globals
+
 		# Enable/disable clock switch
-		self.visibility = self.selectedConfig.GetBool(self.defaultSection, "visible", fallback = True)
+		self.visibility = clockSettings.visible
 		if self.visibility:
 			self.show()
 			if not self.timer.isActive():
@@ -82,37 +112,43 @@ class Widget(QLabel):
 			return
 
 		# font data
-		self.fontFamily = self.selectedConfig.Get(self.defaultSection, "font_family", fallback = selectedThemeConfig.theme.globals.fontFamily)
-		self.fontFamily = LoadFont(self.fontFamily, self.widgetPath)
-		self.fontSize = self.selectedConfig.GetInt(self.defaultSection, "font_size", fallback = selectedThemeConfig.theme.globals.fontSize)
-		self.fontColor = self.selectedConfig.Get(self.defaultSection, "font_color", fallback = selectedThemeConfig.theme.globals.fontColor)
-		self.fontShadow = self.selectedConfig.Get(self.defaultSection, "font_shadow", fallback = selectedThemeConfig.theme.globals.fontShadow)
+		# Theme fonts belong to the theme (unloaded after a theme switch), own fonts stay
+		if clockSettings.font_family:
+			self.fontFamily = LoadFont(clockSettings.font_family, self.widgetPath)
+		else:
+			self.fontFamily = LoadFont(themeGlobals.fontFamily, owner = selectedThemeConfig.theme.currentThemePath)
+		self.fontSize = clockSettings.font_size if clockSettings.font_size is not None else themeGlobals.fontSize
+		self.fontColor = clockSettings.font_color or themeGlobals.fontColor
+		self.fontShadow = clockSettings.font_shadow if clockSettings.font_shadow is not None else themeGlobals.fontShadow
 		
 		# clock data
-		self.clockWidth = self.selectedConfig.GetInt(self.defaultSection, "width", fallback = 50)
-		self.clockPosition = self.selectedConfig.GetInt(self.defaultSection, "position", fallback = 50)
-		self.clockLeftMargin = self.selectedConfig.GetInt(self.defaultSection, "margin_left", fallback = 10)
-		self.clockRightMargin = self.selectedConfig.GetInt(self.defaultSection, "margin_right", fallback = 10)
-		self.clockAlign = self.selectedConfig.GetInt(self.defaultSection, "align", fallback = 50)
+		self.clockWidth = clockSettings.width
+		self.clockPosition = clockSettings.position
+		self.clockLeftMargin = clockSettings.margin_left
+		self.clockRightMargin = clockSettings.margin_right
+		self.clockAlign = clockSettings.align
+		self.timeFormat = clockSettings.time_format
 
 		self.Init()
 
 	def UpdateTime(self):
-		currentTime = QTime.currentTime()
-		timeFormat = self.selectedConfig.Get(self.defaultSection, "time_format", fallback = "HH:mm")
-		self.setText(currentTime.toString(timeFormat))
+		self.SetClockText(QTime.currentTime().toString(self.timeFormat))
+
+	def SetClockText(self, text):
+		# Shadow is pre-rendered into a pixmap (cached per text) instead of a graphics effect
+		if self.fontShadow:
+			font = QFont(self.fontFamily)
+			font.setPointSize(self.fontSize)
+			self.setPixmap(RenderShadowedText(text, font, self.fontColor, QColor(0, 0, 0, 150), 5, 1, 1))
+		else:
+			self.setText(text)
 
 	def Init(self):
 		# If values in taskbar constructor is not updated (for first init)
 		if self.panelWidth == None or self.panelHeight == None:
 			return
 
-		self.setStyleSheet(f"""
-			color: {self.fontColor};
-			font-family: '{self.fontFamily}';
-			font-size: {self.fontSize}pt;
-			background-color: transparent;
-		""")
+		styleCache.Apply(self, styleCache.Get("taskbarClock", BuildClockStyle, self.fontColor, self.fontFamily, self.fontSize))
 
 		if self.visibility:
 			self.UpdateTime()
@@ -122,17 +158,7 @@ class Widget(QLabel):
 		widgetWidth = self.width()
 		self.clockWidth = max(widgetWidth, self.clockWidth)
 
-		shadowPadding = 0
-		if self.fontShadow:
-			shadowPadding = 4
-			shadow = QGraphicsDropShadowEffect(self)
-			shadow.setBlurRadius(5)
-			shadow.setXOffset(1)
-			shadow.setYOffset(1)
-			shadow.setColor(QColor(0, 0, 0, 150))
-			self.setGraphicsEffect(shadow)
-		else:
-			self.setGraphicsEffect(None)
+		shadowPadding = 4 if self.fontShadow else 0
 
 		#  [> Clock position
 		clockX = round(self.panelWidth * (self.clockPosition / 100) - (self.clockWidth * (self.clockAlign / 100)) + self.clockLeftMargin - self.clockRightMargin)
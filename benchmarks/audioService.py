@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from PyQt6.QtCore import QCoreApplication, QTimer
+from core.audio import AudioService
+from core.profiler import profiler
+
+# ***info***
+# AudioService cost per subscriber count (python benchmarks/audioService.py [seconds per run])
+# SyntheticBackend feeds the real capture thread, 1..8 subscribers read the shared frame like the visualizers do
+# audio.analyse (one FFT per frame) should stay flat, audio.publish only grows by the callbacks themselves
+# **********
+
+AUDIO_CONFIG = SimpleNamespace(backend = "synthetic", wav_path = "", sample_rate = 48000, fft_size = 2048, analysis_fps = 60, buffer_ms = 1000)
+MAX_SUBSCRIBERS = 8
+
+# Subscriber doing what a widget does with a frame before it repaints (reads the shared arrays, no copies)
+def MakeSubscriber(stats):
+    def OnAudioFrame(frame):
+        stats["frames"] += 1
+        stats["level"] = max(float(frame.spectrum.max()), frame.peak)
+    return OnAudioFrame
+
+def Run(application, subscribers, seconds):
+    profiler.Reset()
+    service = AudioService(AUDIO_CONFIG)
+    stats = [{"frames": 0, "level": 0.0} for index in range(subscribers)]
+    callbacks = [MakeSubscriber(subscriberStats) for subscriberStats in stats]
+    for callback in callbacks:
+        service.Subscribe(callback)
+
+    cpuStart = time.process_time()
+    QTimer.singleShot(round(seconds * 1000), application.quit)
+    application.exec()
+    cpuTime = time.process_time() - cpuStart
+
+    for callback in callbacks:
+        service.Unsubscribe(callback)
+
+    spans = profiler.Snapshot()["spans"]
+    analyse = spans.get("audio.analyse", {"calls": 0, "avg_ms": 0.0})
+    publish = spans.get("audio.publish", {"calls": 0, "avg_ms": 0.0})
+    return {
+        "subscribers": subscribers,
+        "frames": analyse["calls"],
+        "analyse_ms": analyse["avg_ms"],
+        "publish_ms": publish["avg_ms"],
+        "cpu_percent": 100 * cpuTime / seconds,
+        "delivered": min(subscriberStats["frames"] for subscriberStats in stats),
+    }
+
+def Main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    application = QCoreApplication(sys.argv[:1])
+    profiler.SetEnabled(True)
+
+    print(f"{'subscribers':>11} {'frames':>7} {'analyse ms':>11} {'publish ms':>11} {'process CPU':>12}")
+    results = [Run(application, subscribers, seconds) for subscribers in range(1, MAX_SUBSCRIBERS + 1)]
+    for result in results:
+        print(f"{result['subscribers']:>11} {result['frames']:>7} {result['analyse_ms']:>11.3f} {result['publish_ms']:>11.3f} {result['cpu_percent']:>11.1f}%")
+
+    # Every subscriber gets every frame, analysis is shared
+    assert all(result["delivered"] == result["frames"] for result in results)
+    print(f"analyse cost, {MAX_SUBSCRIBERS} vs 1 subscriber: x{results[-1]['analyse_ms'] / max(1e-6, results[0]['analyse_ms']):.2f}")
+
+if __name__ == "__main__":
+    Main()
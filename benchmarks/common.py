@@ -0,0 +1,152 @@
+from types import SimpleNamespace
+import sys
+import os
+import time
+
+# Benchmarks import the shell modules like Ninawe.py does (app/ is the import root)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "app"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QTimer, QEventLoop
+from core.audio import SyntheticBackend, AudioAnalyzer
+from core.profiler import profiler
+import numpy as np
+
+FFT_SIZE = 2048
+SAMPLE_RATE = 48000
+
+# Synthetic signal as fast as it can be generated (the real backend is paced to real time)
+class UnpacedSyntheticBackend(SyntheticBackend):
+    def WaitFor(self, frames):
+        self.produced += frames
+
+def SyntheticSignal(seconds, sampleRate = SAMPLE_RATE):
+    backend = UnpacedSyntheticBackend(sampleRate)
+    backend.Open()
+    return backend.Read(int(seconds * sampleRate))
+
+# AudioFrames like AudioService publishes them at fps (frame.time advances by 1 / fps)
+def SyntheticFrames(count, fps = 60, sampleRate = SAMPLE_RATE, fftSize = FFT_SIZE):
+    signal = SyntheticSignal(count / fps + fftSize / sampleRate + 0.1, sampleRate)
+    analyzer = AudioAnalyzer(fftSize, sampleRate)
+    frames = []
+    for sequence in range(count):
+        end = fftSize + round(sequence * sampleRate / fps)
+        frame = analyzer.Analyse(signal[end - fftSize:end], sequence)
+        frame.time = sequence / fps
+        frames.append(frame)
+    return frames
+
+# Kept here, an unreferenced QApplication is deleted right away
+application = None
+
+def GetApplication():
+    global application
+    if application is None:
+        application = QApplication.instance() or QApplication(sys.argv[:1])
+    return application
+
+# Desktop window like Ninawe.py creates it (wallpaper only, icons are left to the benchmark) at a fixed size
+def CreateDesktop(width = 1920, height = 1080):
+    GetApplication()
+    from ui.desktop import DesktopWindow
+    desktop = DesktopWindow(deferIcons = True)
+    desktop.setGeometry(0, 0, width, height)
+    return desktop
+
+def LoadUserWidget(name, script):
+    from core.widgetHost import LoadWidgetModule
+    return LoadWidgetModule(os.path.join(ROOT_DIR, "userdata", "widgets", "desktop", name, script), f"userwidgets.desktop.{name}")
+
+# Calls function(index) count times, returns (avg, p95, max) in ms
+def Measure(function, count):
+    timings = np.empty(count)
+    for index in range(count):
+        startTime = time.perf_counter()
+        function(index)
+        timings[index] = time.perf_counter() - startTime
+    return Summarize(timings * 1000)
+
+# Timings in ms taken one by one (work between the calls is not counted) -> (avg, p95, max)
+def Summarize(timings):
+    timings = np.asarray(timings, dtype = float)
+    return float(timings.mean()), float(np.percentile(timings, 95)), float(timings.max())
+
+# Per-call log lines of the measured code would flood the output (set after the config is loaded)
+def Quiet(*names):
+    from core.logger import GetLogger, WARNING
+    for name in names:
+        GetLogger(name).level = WARNING
+
+# Resident memory of the process in MB (working set on Windows)
+def ProcessMemoryMb():
+    if os.name == "nt":
+        import ctypes
+        from ctypes import wintypes
+
+        class MemoryCounters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [(name, ctypes.c_size_t) for name in (
+                "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+
+        counters = MemoryCounters()
+        counters.cb = ctypes.sizeof(MemoryCounters)
+        kernel32 = ctypes.windll.kernel32
+        psapi = ctypes.windll.psapi
+        kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        psapi.GetProcessMemoryInfo.argtypes = [wintypes.HANDLE, ctypes.POINTER(MemoryCounters), wintypes.DWORD]
+        psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb)
+        return counters.WorkingSetSize / 2 ** 20
+
+    with open("/proc/self/statm") as file:
+        return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+# Share of the frame time (1000 / fps ms) one frame costs
+def BudgetShare(ms, fps):
+    return 100 * ms * fps / 1000
+
+# Runs the Qt events for a while (QApplication.quit() would close the windows)
+def ProcessEvents(seconds):
+    eventLoop = QEventLoop()
+    QTimer.singleShot(round(seconds * 1000), eventLoop.quit)
+    eventLoop.exec()
+
+# ***info***
+# Real-time run: AudioService with the synthetic backend (real capture thread and analysis timer at fps),
+# the widgets created by createWidgets(parent) are shown and painted by Qt as on the desktop
+# Returns (process CPU %, profiler spans)
+# **********
+def RunLive(createWidgets, seconds = 3.0, fps = 60):
+    from PyQt6.QtWidgets import QWidget
+    from core.audio import GetAudioService
+
+    GetApplication()
+    GetAudioService().Configure(SimpleNamespace(backend = "synthetic", wav_path = "", sample_rate = SAMPLE_RATE, fft_size = FFT_SIZE, analysis_fps = fps, buffer_ms = 1000))
+    profiler.SetEnabled(True)
+
+    parent = QWidget()
+    parent.resize(1920, 1080)
+    widgets = createWidgets(parent)
+    parent.show()
+    # Startup frames (construction, first paints) are not counted
+    ProcessEvents(0.5)
+    profiler.Reset()
+
+    cpuStart = time.process_time()
+    ProcessEvents(seconds)
+    cpuPercent = 100 * (time.process_time() - cpuStart) / seconds
+    spans = profiler.Snapshot()["spans"]
+
+    for widget in widgets:
+        widget.deleteLater()
+    parent.deleteLater()
+    profiler.SetEnabled(False)
+    return cpuPercent, spans
+
+def PrintSpans(spans, names):
+    for name in names:
+        span = spans.get(name)
+        if span:
+            print(f"  {name:<32} {span['calls']:>6} calls  avg {span['avg_ms'] * 1000:>7.1f} us  max {span['max_ms'] * 1000:>8.1f} us")
@@ -0,0 +1,91 @@
+from common import CreateDesktop, Measure, Quiet
+from PyQt6.QtCore import QRect, QPoint
+import random
+import math
+import sys
+
+# ***info***
+# Rubber band selection cost per mouse move (python benchmarks/desktopSelection.py [moves])
+# - grid index: DesktopWindow.ProcessSelection, only cells under the old + new rect are checked
+# - full scan: the old loop over every desktop item (selected items kept in a list)
+# Synthetic items (geometry + SetSelected only) in a dense grid and scattered over a 4x larger one,
+# the drag grows from the top left corner to a quarter of the grid
+# **********
+
+ITEM_COUNTS = (1000, 2000, 5000)
+
+class SyntheticItem:
+    def __init__(self, grid_x, grid_y, rect):
+        self.grid_x = grid_x
+        self.grid_y = grid_y
+        self.rect = rect
+        self.selected = False
+
+    def geometry(self):
+        return self.rect
+
+    def SetSelected(self, is_selected):
+        self.selected = is_selected
+
+def MakeItems(desktop, count, spread):
+    from ui.desktop import GRID_ITEM_WIDTH, GRID_ITEM_HEIGHT
+    columns = math.ceil(math.sqrt(count * spread))
+    cells = [(x, y) for x in range(columns) for y in range(columns)]
+    cells = random.Random(1).sample(cells, count) if spread > 1 else cells[:count]
+
+    items = []
+    for grid_x, grid_y in cells:
+        x, y = desktop.GetItemPosition(grid_x, grid_y)
+        items.append(SyntheticItem(grid_x, grid_y, QRect(x, y, GRID_ITEM_WIDTH, GRID_ITEM_HEIGHT)))
+    return items, columns
+
+def ResetDesktop(desktop, items):
+    desktop.desktop_items = items
+    desktop.grid_index = {}
+    for item in items:
+        desktop.AddToGridIndex(item)
+        item.selected = False
+    desktop.selected_items = set()
+    desktop.previously_selected = set()
+    desktop.last_selection_rect = None
+
+# ProcessSelection before the grid index
+def FullScanSelection(items, selected, previouslySelected, selection_rect):
+    for item in items:
+        if selection_rect.intersects(item.geometry()):
+            if item not in selected:
+                item.SetSelected(True)
+                selected.append(item)
+        else:
+            if item in selected and item not in previouslySelected:
+                item.SetSelected(False)
+                selected.remove(item)
+
+def Main():
+    moves = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    desktop = CreateDesktop()
+    Quiet("Desktop")
+
+    print(f"Rubber band drag, {moves} mouse moves")
+    print(f"{'items':>6} {'layout':>9} {'selected':>9} {'index us':>9} {'p95 us':>8} {'scan us':>9} {'p95 us':>8} {'speedup':>8}")
+    for count in ITEM_COUNTS:
+        for layout, spread in (("dense", 1), ("scattered", 4)):
+            items, columns = MakeItems(desktop, count, spread)
+            end = QPoint(*desktop.GetItemPosition(columns // 2, columns // 2))
+            start = QPoint(10, 10)
+            rects = [QRect(start, start + (end - start) * (index + 1) / moves).normalized() for index in range(moves)]
+
+            ResetDesktop(desktop, items)
+            indexMs, indexP95, _ = Measure(lambda index: desktop.ProcessSelection(rects[index]), moves)
+            selectedCount = len(desktop.selected_items)
+
+            selected = []
+            scanMs, scanP95, _ = Measure(lambda index: FullScanSelection(items, selected, set(), rects[index]), moves)
+            assert len(selected) == selectedCount
+
+            print(f"{count:>6} {layout:>9} {selectedCount:>9} {indexMs * 1000:>9.1f} {indexP95 * 1000:>8.1f} {scanMs * 1000:>9.1f} {scanP95 * 1000:>8.1f} {scanMs / indexMs:>7.1f}x")
+
+    desktop.deleteLater()
+
+if __name__ == "__main__":
+    Main()
@@ -0,0 +1,110 @@
+from common import CreateDesktop, Measure, ProcessEvents, ProcessMemoryMb, Quiet
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtGui import QImage, QRegion
+from PyQt6.QtCore import QPoint
+import tempfile
+import time
+import sys
+import os
+
+# ***info***
+# Desktop icons as one QWidget tree per icon vs one painted layer (python benchmarks/iconRenderModes.py [repeats])
+# - build: RenderGrid of N items (icons already in the IconService memory cache)
+# - memory: process memory after the grid minus before it, QWidget count of the window
+# - repaint: whole window rendered into an image, one item selected + its rect rendered (wallpaper included in both modes)
+# **********
+
+ITEM_COUNTS = (100, 300, 600)
+SCREEN_SIZE = (3840, 2160)
+REPAINTS = 30
+
+# Same setup Init does for icon_render_mode
+def SetIconMode(desktop, mode):
+    from ui.desktop import BuildDesktopIconStyle
+    from ui.desktopIcons import DesktopIconLayer
+    from core.styles import styleCache
+
+    if mode == "painted":
+        desktop.iconLayer = DesktopIconLayer(desktop)
+        desktop.iconLayer.setGeometry(desktop.rect())
+        desktop.iconLayer.show()
+    else:
+        desktop.iconLayer = None
+        styleCache.Apply(desktop, styleCache.Get("desktopIcons", BuildDesktopIconStyle))
+
+def MakeItemsData(desktop, paths):
+    maxRows = desktop.GetMaxRows()
+    return [desktop.MakeItemData(path, [index // maxRows, index % maxRows]) for index, path in enumerate(paths)]
+
+def WaitForIcons():
+    from core.iconProvider import GetIconService
+    service = GetIconService()
+    while service.tasks or service.providerQueue or service.waiting:
+        ProcessEvents(0.005)
+
+def Main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for index in range(max(ITEM_COUNTS)):
+            path = os.path.join(directory, f"Document {index} with a longer name.txt")
+            with open(path, "w") as file:
+                file.write("x")
+            paths.append(path)
+
+        Quiet("Desktop", "IconProvider")
+        # Icons and label pixmaps resolved once, both modes get the same warm caches
+        warmup = CreateDesktop(*SCREEN_SIZE)
+        SetIconMode(warmup, "widgets")
+        warmup.RenderGrid(MakeItemsData(warmup, paths))
+        WaitForIcons()
+        warmup.RenderGrid([])
+        warmup.deleteLater()
+        ProcessEvents(0.1)
+
+        print(f"{SCREEN_SIZE[0]}x{SCREEN_SIZE[1]} desktop, best of {repeats} builds, {REPAINTS} repaints")
+        print(f"{'items':>6} {'mode':>8} {'build ms':>9} {'per item':>9} {'memory MB':>10} {'widgets':>8} {'repaint ms':>11} {'select ms':>10}")
+        # Every grid stays alive until the end, freed memory of one would be reused by the next
+        desktops = []
+        for count in ITEM_COUNTS:
+            for mode in ("widgets", "painted"):
+                desktop = CreateDesktop(*SCREEN_SIZE)
+                SetIconMode(desktop, mode)
+                desktop.show()
+                desktops.append(desktop)
+                itemsData = MakeItemsData(desktop, paths[:count])
+                image = QImage(desktop.size(), QImage.Format.Format_ARGB32_Premultiplied)
+                ProcessEvents(0.05)
+
+                memoryBefore = ProcessMemoryMb()
+                desktop.RenderGrid(itemsData)
+                ProcessEvents(0.05)
+                memoryMb = ProcessMemoryMb() - memoryBefore
+                widgetCount = len(desktop.findChildren(QWidget))
+
+                buildTimes = []
+                for repeat in range(repeats):
+                    startTime = time.perf_counter()
+                    desktop.RenderGrid(itemsData)
+                    buildTimes.append((time.perf_counter() - startTime) * 1000)
+                    ProcessEvents(0.05)
+                buildMs = min(buildTimes)
+
+                repaintMs = Measure(lambda index: desktop.render(image), REPAINTS)[0]
+                item = desktop.desktop_items[count // 2]
+                itemRegion = QRegion(item.geometry())
+                def Select(index):
+                    item.SetSelected(index % 2 == 0)
+                    desktop.render(image, QPoint(), itemRegion)
+                selectMs = Measure(Select, REPAINTS)[0]
+
+                print(f"{count:>6} {mode:>8} {buildMs:>9.1f} {buildMs / count:>9.3f} {memoryMb:>10.1f} {widgetCount:>8} {repaintMs:>11.2f} {selectMs:>10.3f}")
+
+        for desktop in desktops:
+            desktop.RenderGrid([])
+            desktop.deleteLater()
+        ProcessEvents(0.1)
+
+if __name__ == "__main__":
+    Main()
@@ -0,0 +1,109 @@
+from common import GetApplication, Measure, ProcessEvents, Quiet
+from PyQt6.QtWidgets import QWidget, QFileIconProvider
+from PyQt6.QtCore import QFileInfo
+import tempfile
+import time
+import sys
+import os
+
+# ***info***
+# Per-item DesktopItem construction cost, icons resolved before / after IconService (python benchmarks/iconService.py [items])
+# - sync: the old Init path, shortcut resolved + new QFileIconProvider per item, all on the GUI thread
+# - async cold: placeholder right away, empty memory and disk caches, icons come from the worker pool
+# - async warm: the same files again, icons from the memory cache
+# - async disk: memory cache dropped (next start), icons loaded from the disk cache on the pool
+# Shortcuts go through the stub resolver (SetShortcutResolver), so the numbers don't depend on COM
+# **********
+
+# Mix of a typical desktop: shortcuts, documents, images, executables, folders
+EXTENSIONS = (".lnk", ".lnk", ".lnk", ".txt", ".pdf", ".png", ".jpg", ".exe", ".docx", "")
+ICON_SIZE = 48
+READY_TIMEOUT_S = 30
+
+def WriteDesktop(directory, count):
+    paths = []
+    for index in range(count):
+        extension = EXTENSIONS[index % len(EXTENSIONS)]
+        path = os.path.join(directory, f"item{index}{extension}")
+        if extension:
+            with open(path, "w") as file:
+                file.write("x")
+        else:
+            os.mkdir(path)
+        paths.append(path)
+    return paths
+
+# Icon lookup of the old DesktopItem.Init
+def LoadIconSync(item):
+    from core import iconProvider
+    iconPath = item.filepath
+    if iconPath.lower().endswith(".lnk"):
+        target = iconProvider.shortcutResolver(iconPath)
+        if target and os.path.exists(target):
+            iconPath = target
+    return QFileIconProvider().icon(QFileInfo(iconPath)).pixmap(ICON_SIZE, ICON_SIZE)
+
+def WaitForIcons(service):
+    deadline = time.perf_counter() + READY_TIMEOUT_S
+    while (service.tasks or service.providerQueue or service.waiting) and time.perf_counter() < deadline:
+        ProcessEvents(0.001)
+
+def BuildItems(paths, parent):
+    from ui.desktop import DesktopItem
+    items = []
+    avgMs, p95Ms, _ = Measure(lambda index: items.append(DesktopItem(paths[index], parent = parent)), len(paths))
+    return items, avgMs, p95Ms
+
+def Main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    GetApplication()
+    from ui.desktop import DesktopItem
+    from core.iconProvider import GetIconService, SetShortcutResolver, ResolveShortcutStub
+
+    SetShortcutResolver(ResolveShortcutStub)
+    service = GetIconService()
+    Quiet("IconProvider", "Desktop")
+
+    with tempfile.TemporaryDirectory() as directory:
+        desktopDir = os.path.join(directory, "Desktop")
+        os.mkdir(desktopDir)
+        paths = WriteDesktop(desktopDir, count)
+        service.cacheDir = os.path.join(directory, "icons")
+
+        print(f"{count} DesktopItems ({', '.join(sorted(set(extension or 'folder' for extension in EXTENSIONS)))})")
+        print(f"{'mode':>11} {'avg ms':>8} {'p95 ms':>8} {'total ms':>9} {'icons ready ms':>15}")
+        parent = QWidget()
+
+        # Before: icons resolved while the item is constructed
+        asyncLoadIcon = DesktopItem.LoadIcon
+        DesktopItem.LoadIcon = LoadIconSync
+        startTime = time.perf_counter()
+        items, avgMs, p95Ms = BuildItems(paths, parent)
+        totalMs = (time.perf_counter() - startTime) * 1000
+        print(f"{'sync':>11} {avgMs:>8.3f} {p95Ms:>8.3f} {totalMs:>9.1f} {totalMs:>15.1f}")
+        DesktopItem.LoadIcon = asyncLoadIcon
+        for item in items:
+            item.deleteLater()
+        ProcessEvents(0.1)
+
+        # After: placeholder first, icons from the pool (cold), the memory cache (warm) or the disk cache (restart)
+        for mode in ("async cold", "async warm", "async disk"):
+            if mode == "async disk":
+                service.icons.clear()
+                service.keys.clear()
+
+            startTime = time.perf_counter()
+            items, avgMs, p95Ms = BuildItems(paths, parent)
+            totalMs = (time.perf_counter() - startTime) * 1000
+            WaitForIcons(service)
+            readyMs = (time.perf_counter() - startTime) * 1000
+            print(f"{mode:>11} {avgMs:>8.3f} {p95Ms:>8.3f} {totalMs:>9.1f} {readyMs:>15.1f}")
+            for item in items:
+                item.deleteLater()
+            ProcessEvents(0.1)
+
+        print(f"\nIcon cache: {len(service.icons)} pixmaps in memory, {len(os.listdir(service.cacheDir)) if os.path.isdir(service.cacheDir) else 0} files on disk")
+        service.pool.waitForDone()
+
+if __name__ == "__main__":
+    Main()
@@ -0,0 +1,60 @@
+from common import SyntheticSignal, GetApplication, LoadUserWidget, Measure, BudgetShare, RunLive, PrintSpans
+from PyQt6.QtGui import QImage, QPainter, QPen, QColor
+import sys
+
+# ***info***
+# Oscilloscope frame cost per sample rate x widget width (python benchmarks/oscilloscope.py [live seconds])
+# - ScopeEngine.Resize: buffers + QPolygonF for a new (sample rate, width), only paid on changes
+# - ScopeEngine.Process: trigger search + decimation of a 20 ms window per frame
+# - drawPolyline of the points with the default 1 px cosmetic pen
+# - live: the widget on the real AudioService timer, profiler spans + process CPU
+# **********
+
+FPS = 60
+FRAMES = 300
+HEIGHT = 150
+SAMPLE_RATES = (44100, 48000, 96000, 192000)
+WIDTHS = (200, 600, 1200, 2400)
+
+def Main():
+    liveSeconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    GetApplication()
+    oscilloscope = LoadUserWidget("oscilloscope", "oscilloscope.py")
+
+    pen = QPen(QColor("#FF40FFE0"), 1)
+    pen.setCosmetic(True)
+
+    print(f"ScopeEngine per frame at {FPS} FPS ({FRAMES} frames, 20 ms window, height {HEIGHT})")
+    print(f"{'rate':>7} {'width':>6} {'points':>7} {'resize us':>10} {'process us':>11} {'p95 us':>8} {'paint us':>9} {'budget':>8}")
+    for sampleRate in SAMPLE_RATES:
+        signal = SyntheticSignal(FRAMES / FPS + 0.2, sampleRate)
+        hop = sampleRate // FPS
+        for width in WIDTHS:
+            engine = oscilloscope.ScopeEngine()
+            # Resize on alternating sizes, the same size again is a no-op
+            resizeMs = Measure(lambda index: engine.Resize(sampleRate, width + index % 2), 20)[0]
+            engine.Resize(sampleRate, width)
+            bufferSize = len(engine.samples)
+
+            def Process(index):
+                engine.samples[:] = signal[index * hop:index * hop + bufferSize]
+                engine.Process(HEIGHT, 1.0)
+            processMs, processP95, processMax = Measure(Process, FRAMES)
+
+            image = QImage(width, HEIGHT, QImage.Format.Format_ARGB32_Premultiplied)
+            def Paint(index):
+                image.fill(0)
+                painter = QPainter(image)
+                painter.setPen(pen)
+                painter.drawPolyline(engine.polygon)
+                painter.end()
+            paintMs = Measure(Paint, FRAMES)[0]
+
+            print(f"{sampleRate:>7} {width:>6} {len(engine.points):>7} {resizeMs * 1000:>10.1f} {processMs * 1000:>11.1f} {processP95 * 1000:>8.1f} {paintMs * 1000:>9.1f} {BudgetShare(processMs + paintMs, FPS):>7.2f}%")
+
+    cpuPercent, spans = RunLive(lambda parent: [oscilloscope.Widget(parent)], liveSeconds, FPS)
+    print(f"\nLive {liveSeconds:.0f} s at {FPS} FPS: {cpuPercent:.1f}% process CPU (capture + analysis + widget)")
+    PrintSpans(spans, ("audio.analyse", "desktop.oscilloscope.process", "paint.desktop.oscilloscope"))
+
+if __name__ == "__main__":
+    Main()
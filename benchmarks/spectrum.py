@@ -0,0 +1,53 @@
+from common import SyntheticFrames, GetApplication, Measure, BudgetShare, RunLive, PrintSpans
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtGui import QImage
+from PyQt6.QtCore import QPoint
+import sys
+
+# ***info***
+# defaultSpectrum frame cost at 60 FPS with synthetic audio (python benchmarks/spectrum.py [live seconds])
+# - SpectrumEngine.Process per band count (log and mel scale)
+# - widget frame: OnAudioFrame + paintEvent rendered into an image, 128 bands at the default 800x200
+# - live: the widget on the real AudioService timer, profiler spans + process CPU
+# **********
+
+FPS = 60
+FRAMES = 600
+BAND_COUNTS = (32, 64, 128, 256)
+
+def Main():
+    liveSeconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    GetApplication()
+    from widgets.desktop.defaultSpectrum.spectrum import SpectrumEngine, Widget
+
+    frames = SyntheticFrames(FRAMES, FPS)
+
+    print(f"SpectrumEngine.Process, {FRAMES} frames at {FPS} FPS (FFT {len(frames[0].samples)})")
+    print(f"{'bands':>6} {'scale':>6} {'avg us':>8} {'p95 us':>8} {'max us':>8} {'budget':>8}")
+    for bands in BAND_COUNTS:
+        for scale in ("log", "mel"):
+            engine = SpectrumEngine(bands = bands, scale = scale)
+            engine.Process(frames[0].spectrum, frames[0].frequencies, 1 / FPS)
+            avgMs, p95Ms, maxMs = Measure(lambda index: engine.Process(frames[index].spectrum, frames[index].frequencies, 1 / FPS), FRAMES)
+            print(f"{bands:>6} {scale:>6} {avgMs * 1000:>8.1f} {p95Ms * 1000:>8.1f} {maxMs * 1000:>8.1f} {BudgetShare(avgMs, FPS):>7.2f}%")
+
+    # Whole widget frame (the widget follows its own config.ini, 128 bands by default)
+    parent = QWidget()
+    parent.resize(1920, 1080)
+    widget = Widget(parent)
+    image = QImage(widget.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    def WidgetFrame(index):
+        widget.OnAudioFrame(frames[index])
+        image.fill(0)
+        widget.render(image, QPoint())
+    avgMs, p95Ms, maxMs = Measure(WidgetFrame, FRAMES)
+    print(f"\nWidget frame ({widget.engine.bands} bands, {widget.width()}x{widget.height()}): avg {avgMs * 1000:.1f} us, p95 {p95Ms * 1000:.1f} us, max {maxMs * 1000:.1f} us ({BudgetShare(avgMs, FPS):.2f}% of a {FPS} FPS frame)")
+    widget.deleteLater()
+    parent.deleteLater()
+
+    cpuPercent, spans = RunLive(lambda parent: [Widget(parent)], liveSeconds, FPS)
+    print(f"\nLive {liveSeconds:.0f} s at {FPS} FPS: {cpuPercent:.1f}% process CPU (capture + analysis + widget)")
+    PrintSpans(spans, ("audio.analyse", "desktop.spectrum.process", "paint.desktop.spectrum"))
+
+if __name__ == "__main__":
+    Main()
@@ -0,0 +1,181 @@
+from common import GetApplication, CreateDesktop, ProcessEvents, Quiet
+from PyQt6.QtWidgets import QWidget, QFrame, QLabel, QVBoxLayout, QProxyStyle, QApplication, QGraphicsDropShadowEffect
+from PyQt6.QtGui import QImage, QPixmap, QColor
+from PyQt6.QtCore import Qt
+import tempfile
+import time
+import sys
+import os
+
+# ***info***
+# Desktop icon styling: shared stylesheet + pre-rendered label shadows vs the old per-item stylesheets + shadow effects
+# (python benchmarks/styleCache.py [items])
+# - build: N icon widgets created, shown and rendered once
+# - theme reload: icon stylesheet applied again (old: setStyleSheet per item, new: StyleCache.Get + Apply on the desktop)
+# - re-render: whole window rendered after the reload
+# - select all twice: the second pass changes nothing (old items repolished anyway)
+# Polish calls are counted by a proxy style on the application, icons are the same placeholder in both
+# **********
+
+ITEM_COUNTS = (100, 300)
+SCREEN_SIZE = (3840, 2160)
+ICON_SIZE = 48
+
+ICON_STYLE = """
+    QFrame#IconFrame {
+        background: transparent;
+        border: 1px solid transparent;
+        border-radius: 4px;
+    }
+    QFrame#IconFrame:hover {
+        background: rgba(255, 255, 255, 30);
+        border: 1px solid rgba(255, 255, 255, 60);
+    }
+    QFrame#IconFrame[selected = "true"] {
+        background: rgba(255, 255, 255, 60);
+        border: 1px solid rgba(255, 255, 255, 100);
+    }
+    QFrame#IconFrame[selected = "true"]:hover {
+        background: rgba(255, 255, 255, 80);
+        border: 1px solid rgba(255, 255, 255, 120);
+    }
+"""
+
+LABEL_STYLE = """
+    color: white;
+    font-size: 11px;
+    font-family: 'Segoe UI', Arial;
+    background: transparent;
+"""
+
+class PolishCounter(QProxyStyle):
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def polish(self, target):
+        if isinstance(target, QWidget):
+            self.count += 1
+        return super().polish(target)
+
+# DesktopItem before the style cache: own stylesheets and a QGraphicsDropShadowEffect per label
+class LegacyDesktopItem(QWidget):
+    def __init__(self, filepath, icon, parent = None):
+        super().__init__(parent)
+        self.setFixedSize(85, 110)
+
+        mainLayout = QVBoxLayout(self)
+        mainLayout.setContentsMargins(0, 0, 0, 0)
+        mainLayout.setAlignment(Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignHCenter)
+
+        self.innerFrame = QFrame()
+        self.innerFrame.setObjectName("IconFrame")
+        frameLayout = QVBoxLayout(self.innerFrame)
+        frameLayout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        self.iconLabel = QLabel()
+        self.iconLabel.setPixmap(icon)
+        self.iconLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        self.textLabel = QLabel(os.path.basename(filepath))
+        self.textLabel.setAlignment(Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignHCenter)
+        self.textLabel.setWordWrap(True)
+        self.textLabel.setMaximumWidth(85)
+        self.textLabel.setStyleSheet(LABEL_STYLE)
+
+        shadow = QGraphicsDropShadowEffect(self.textLabel)
+        shadow.setBlurRadius(5)
+        shadow.setOffset(0, 0)
+        shadow.setColor(QColor(0, 0, 0, 255))
+        self.textLabel.setGraphicsEffect(shadow)
+
+        frameLayout.addWidget(self.iconLabel)
+        frameLayout.addWidget(self.textLabel)
+        mainLayout.addWidget(self.innerFrame)
+        self.ApplyStyle()
+
+    def ApplyStyle(self):
+        self.setStyleSheet(ICON_STYLE)
+
+    def SetSelected(self, is_selected):
+        self.innerFrame.setProperty("selected", is_selected)
+        self.innerFrame.style().unpolish(self.innerFrame)
+        self.innerFrame.style().polish(self.innerFrame)
+
+# Runs step(), returns (ms, polish calls)
+def Step(counter, step):
+    counter.count = 0
+    startTime = time.perf_counter()
+    step()
+    ProcessEvents(0)
+    return (time.perf_counter() - startTime) * 1000, counter.count
+
+def Main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    itemCounts = (count,) if count else ITEM_COUNTS
+
+    GetApplication()
+    counter = PolishCounter()
+    QApplication.setStyle(counter)
+
+    from ui.desktop import DesktopItem, BuildDesktopIconStyle
+    from core.config import config as themeConfig
+    from core.styles import styleCache
+    from core.iconProvider import GetIconService
+
+    icon = QPixmap(ICON_SIZE, ICON_SIZE)
+    icon.fill(QColor("#808080"))
+    # Placeholder for every file, no icon lookups in either path
+    GetIconService().Request = lambda filepath, callback: icon
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [os.path.join(directory, f"Document {index} with a longer name.txt") for index in range(max(itemCounts))]
+
+        print(f"{SCREEN_SIZE[0]}x{SCREEN_SIZE[1]} desktop, times in ms (polish calls)")
+        print(f"{'items':>6} {'path':>7} {'build':>16} {'theme reload':>16} {'re-render':>16} {'select all x2':>16}")
+        for itemCount in itemCounts:
+            for path in ("old", "new"):
+                desktop = CreateDesktop(*SCREEN_SIZE)
+                Quiet("Desktop")
+                desktop.show()
+                image = QImage(desktop.size(), QImage.Format.Format_ARGB32_Premultiplied)
+                maxRows = desktop.GetMaxRows()
+                ProcessEvents(0.05)
+
+                items = []
+                def Build():
+                    if path == "new":
+                        styleCache.Apply(desktop, styleCache.Get("desktopIcons", BuildDesktopIconStyle))
+                    for index, filepath in enumerate(paths[:itemCount]):
+                        item = LegacyDesktopItem(filepath, icon, desktop) if path == "old" else DesktopItem(filepath, parent = desktop)
+                        item.move(*desktop.GetItemPosition(index // maxRows, index % maxRows))
+                        item.show()
+                        items.append(item)
+                    desktop.render(image)
+
+                def ThemeReload():
+                    if path == "old":
+                        for item in items:
+                            item.ApplyStyle()
+                    else:
+                        themeConfig.theme.revision += 1
+                        styleCache.Apply(desktop, styleCache.Get("desktopIcons", BuildDesktopIconStyle))
+
+                def SelectAllTwice():
+                    for selected in (True, True):
+                        for item in items:
+                            item.SetSelected(selected)
+
+                results = [Step(counter, step) for step in (Build, ThemeReload, lambda: desktop.render(image), SelectAllTwice)]
+                cells = " ".join(f"{f'{ms:.1f} ({polishes})':>16}" for ms, polishes in results)
+                print(f"{itemCount:>6} {path:>7} {cells}")
+
+                for item in items:
+                    item.deleteLater()
+                desktop.deleteLater()
+                ProcessEvents(0.1)
+
+        print(f"\nStyleCache: {styleCache.Stats()}")
+
+if __name__ == "__main__":
+    Main()
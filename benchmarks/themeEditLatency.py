@@ -0,0 +1,115 @@
+from common import GetApplication, Summarize, ProcessEvents, Quiet
+import tempfile
+import shutil
+import time
+import sys
+import os
+
+# ***info***
+# Theme edit -> taskbar repaint latency (python benchmarks/themeEditLatency.py [edits per key])
+# The current theme is copied into a temp folder and the ConfigManager is pointed at it,
+# then [Taskbar] keys are written into its themeconfig.ini like an editor save
+# - paint only: argb_color (OnTaskbarConfigChanged -> update())
+# - full restyle: height (widgets reloaded + InitPanelComponents)
+# - from save: file write -> first paint with the change (file watcher + debounce included)
+# - from reload: change detected (ConfigManager.OnFilesChanged) -> first paint with the change
+# **********
+
+EDITS = {
+    "paint only": ("argb_color", ("#55FFFFFF", "#66FFFFFF")),
+    "full restyle": ("height", ("30px", "32px")),
+}
+# Longest wait for one repaint, and a pause between edits (the next save is not merged into this one)
+REPAINT_TIMEOUT_S = 3
+SETTLE_S = 0.3
+
+def CreateTaskbar():
+    from ui.taskbar import Taskbar
+
+    # Paint with repaintPending set = the first paint after a [Taskbar] change
+    class MeasuredTaskbar(Taskbar):
+        def __init__(self):
+            self.repaints = []
+            super().__init__()
+
+        def paintEvent(self, event):
+            pending = self.repaintPending
+            super().paintEvent(event)
+            if pending:
+                self.repaints.append(time.perf_counter())
+
+    return MeasuredTaskbar()
+
+# Writes key = value into the [Taskbar] section, everything else as is
+def WriteTaskbarKey(path, key, value):
+    with open(path, "r", encoding = "utf-8") as file:
+        lines = file.read().splitlines()
+
+    section = None
+    for index, line in enumerate(lines):
+        stripped = line.strip()
+        if stripped.startswith("["):
+            section = stripped
+        elif section == "[Taskbar]" and stripped.split("=")[0].strip() == key:
+            lines[index] = f"{key} = {value}"
+
+    with open(path, "w", encoding = "utf-8") as file:
+        file.write("\n".join(lines) + "\n")
+
+def WaitForRepaint(taskbar, count):
+    deadline = time.perf_counter() + REPAINT_TIMEOUT_S
+    while len(taskbar.repaints) == count and time.perf_counter() < deadline:
+        ProcessEvents(0.001)
+    return len(taskbar.repaints) > count
+
+def Main():
+    edits = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    GetApplication()
+    from core.config import config as themeConfig
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Copy of the current theme, the real one is never written
+        themeName = themeConfig.currentTheme
+        themePath = os.path.join(directory, themeName)
+        shutil.copytree(themeConfig.theme.currentThemePath, themePath)
+        themeConfig.theme.GetThemePath = lambda name: themePath
+        themeConfig.theme.Load(themeName)
+        themeConfig.UpdateWatchList()
+        themeFile = themeConfig.theme.themeInitFile
+
+        taskbar = CreateTaskbar()
+        taskbar.show()
+        ProcessEvents(0.5)
+        Quiet("Taskbar", "ConfigManager", "ThemeConfig", "FileWatcher", "WidgetManager")
+
+        print(f"{edits} edits per key, {themeFile}")
+        print(f"{'edit':>13} {'key':>11} {'save avg':>9} {'p95':>7} {'reload avg':>11} {'p95':>7} {'missed':>7}")
+        for name, (key, values) in EDITS.items():
+            fromSave = []
+            fromReload = []
+            missed = 0
+            for index in range(edits):
+                count = len(taskbar.repaints)
+                saveTime = time.perf_counter()
+                # values[0] is the default theme value, the first edit writes the other one
+                WriteTaskbarKey(themeFile, key, values[(index + 1) % 2])
+                if WaitForRepaint(taskbar, count):
+                    paintTime = taskbar.repaints[count]
+                    fromSave.append((paintTime - saveTime) * 1000)
+                    fromReload.append((paintTime - themeConfig.lastChangeTime) * 1000)
+                else:
+                    missed += 1
+                ProcessEvents(SETTLE_S)
+
+            if fromSave:
+                saveAvg, saveP95, _ = Summarize(fromSave)
+                reloadAvg, reloadP95, _ = Summarize(fromReload)
+                print(f"{name:>13} {key:>11} {saveAvg:>9.1f} {saveP95:>7.1f} {reloadAvg:>11.2f} {reloadP95:>7.2f} {missed:>7}")
+            else:
+                print(f"{name:>13} {key:>11} no repaint within {REPAINT_TIMEOUT_S} s")
+
+        taskbar.deleteLater()
+        ProcessEvents(0.1)
+
+if __name__ == "__main__":
+    Main()
@@ -0,0 +1,74 @@
+from common import SyntheticSignal, GetApplication, LoadUserWidget, Measure, BudgetShare, RunLive, PrintSpans, SAMPLE_RATE
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtGui import QImage
+from PyQt6.QtCore import QPoint
+import sys
+
+# ***info***
+# VFD VU meter frame cost at 60 and 144 FPS (python benchmarks/vuMeter.py [live seconds])
+# - MeterBallistics.Process + Segments on the samples of one frame (48000 / fps)
+# - paintEvent with the cached sprites rendered into an image, only frames that change a segment count repaint
+# - live: the widget on the real AudioService timer at both rates, profiler spans + process CPU
+# **********
+
+FRAME_RATES = (60, 144)
+SECONDS = 5
+
+def Main():
+    liveSeconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    GetApplication()
+    vuMeter = LoadUserWidget("VFDVUMeter", "VFDVUmeter.py")
+    signal = SyntheticSignal(SECONDS + 0.1)
+
+    parent = QWidget()
+    parent.resize(1920, 1080)
+    widget = vuMeter.Widget(parent)
+    image = QImage(widget.size(), QImage.Format.Format_ARGB32_Premultiplied)
+
+    print(f"{SECONDS} s of synthetic audio, {widget.settings.segments} segments, {widget.width()}x{widget.height()}")
+    print(f"{'fps':>4} {'process us':>11} {'p95 us':>8} {'paint us':>9} {'repaints':>9} {'frame us':>9} {'budget':>8}")
+    for fps in FRAME_RATES:
+        frames = SECONDS * fps
+        hop = SAMPLE_RATE // fps
+        ballistics = widget.ballistics = vuMeter.MeterBallistics(
+            riseMs = (widget.settings.vu_rise_ms, widget.settings.peak_rise_ms),
+            fallMs = (widget.settings.vu_fall_ms, widget.settings.peak_fall_ms),
+            peakHoldMs = widget.settings.peak_hold_ms,
+            minDb = widget.settings.min_db,
+            maxDb = widget.settings.max_db,
+            segments = widget.settings.segments
+        )
+
+        # Ballistics + the state check OnAudioFrame does, the changed frames are painted afterwards
+        states = []
+        snapshots = []
+        def Process(index):
+            ballistics.Process(signal[index * hop:(index + 1) * hop], 1 / fps)
+            vuSegments, peakSegments = ballistics.Segments()
+            states.append((vuSegments, peakSegments, ballistics.holdSegment))
+            snapshots.append((ballistics.levels.copy(), ballistics.holdSegment))
+        processMs, processP95, processMax = Measure(Process, frames)
+        changed = [index for index in range(frames) if index == 0 or states[index] != states[index - 1]]
+
+        # Changed frames are replayed from their ballistics state
+        def Paint(index):
+            levels, ballistics.holdSegment = snapshots[changed[index]]
+            ballistics.levels[:] = levels
+            image.fill(0)
+            widget.render(image, QPoint())
+        paintMs = Measure(Paint, len(changed))[0]
+
+        # Average frame: every frame processes, only the changed ones paint
+        frameMs = processMs + paintMs * len(changed) / frames
+        print(f"{fps:>4} {processMs * 1000:>11.1f} {processP95 * 1000:>8.1f} {paintMs * 1000:>9.1f} {100 * len(changed) / frames:>8.0f}% {frameMs * 1000:>9.1f} {BudgetShare(frameMs, fps):>7.2f}%")
+
+    widget.deleteLater()
+    parent.deleteLater()
+
+    for fps in FRAME_RATES:
+        cpuPercent, spans = RunLive(lambda parent: [vuMeter.Widget(parent)], liveSeconds, fps)
+        print(f"\nLive {liveSeconds:.0f} s at {fps} FPS: {cpuPercent:.1f}% process CPU (capture + analysis + widget)")
+        PrintSpans(spans, ("audio.analyse", "desktop.vumeter.process", "paint.desktop.vumeter"))
+
+if __name__ == "__main__":
+    Main()
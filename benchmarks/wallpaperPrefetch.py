@@ -0,0 +1,105 @@
+from common import GetApplication, CreateDesktop, Summarize, ProcessEvents, Quiet
+from PyQt6.QtGui import QImage
+from PyQt6.QtCore import QVariantAnimation
+import numpy as np
+import tempfile
+import time
+import sys
+import os
+
+# ***info***
+# GUI thread blocking per carousel transition (python benchmarks/wallpaperPrefetch.py [transitions])
+# - sync: no prefetch, StartTransition decodes + scales the next wallpaper itself (GetScaledPixmap)
+# - prefetch: the next wallpaper is decoded on the pool while the current one is shown (PrefetchNextWallpaper)
+# Memory and disk caches are off in both runs, every transition gets a not yet decoded frame
+# **********
+
+IMAGE_COUNT = 4
+IMAGE_SIZE = (3840, 2160)
+SCREEN_SIZES = ((1920, 1080), (3840, 2160))
+# Longest wait for a prefetch between two transitions (the carousel interval is minutes)
+PREFETCH_TIMEOUT_S = 10
+
+# Noisy gradients, so JPEG decoding costs what a photo would
+def WriteWallpapers(directory):
+    width, height = IMAGE_SIZE
+    random = np.random.default_rng(1)
+    paths = []
+    for index in range(IMAGE_COUNT):
+        x = np.linspace(0, 255, width, dtype = np.float32)
+        y = np.linspace(0, 255, height, dtype = np.float32)[:, None]
+        pixels = np.empty((height, width, 4), dtype = np.uint8)
+        pixels[..., 0] = (x * (index + 1) / IMAGE_COUNT + random.integers(0, 40, (height, width))) % 256
+        pixels[..., 1] = (y + random.integers(0, 40, (height, width))) % 256
+        pixels[..., 2] = (x + y) / 2 % 256
+        pixels[..., 3] = 255
+        image = QImage(pixels.data, width, height, width * 4, QImage.Format.Format_RGB32)
+        path = os.path.join(directory, f"wallpaper{index}.jpg")
+        image.save(path, "JPG", 90)
+        paths.append(path)
+    return paths
+
+# Fade is finished right away, EndTransition starts the next prefetch like after a real fade
+def FinishFade(desktop):
+    if desktop.fadeAnimation.state() == QVariantAnimation.State.Running:
+        desktop.fadeAnimation.stop()
+        desktop.EndTransition()
+
+def WaitForPrefetch(desktop):
+    deadline = time.perf_counter() + PREFETCH_TIMEOUT_S
+    while desktop.wallpaperLoader.pending and time.perf_counter() < deadline:
+        ProcessEvents(0.01)
+
+def DropPrefetch(desktop):
+    desktop.wallpaperLoader.pool.waitForDone()
+    desktop.wallpaperLoader.Clear()
+
+def RunTransitions(desktop, count, prefetch):
+    DropPrefetch(desktop)
+    desktop.PrefetchNextWallpaper()
+    timings = []
+    for index in range(count):
+        if prefetch:
+            WaitForPrefetch(desktop)
+        else:
+            # Prefetch started by the previous EndTransition is dropped (after it ends, its signals object goes with it)
+            DropPrefetch(desktop)
+
+        startTime = time.perf_counter()
+        desktop.StartTransition()
+        timings.append((time.perf_counter() - startTime) * 1000)
+        FinishFade(desktop)
+    return Summarize(timings)
+
+def Main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    GetApplication()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = WriteWallpapers(directory)
+        print(f"{count} transitions per run, {IMAGE_COUNT} JPEG wallpapers {IMAGE_SIZE[0]}x{IMAGE_SIZE[1]}")
+        print(f"{'screen':>10} {'mode':>9} {'avg ms':>8} {'p95 ms':>8} {'max ms':>8}")
+
+        for width, height in SCREEN_SIZES:
+            desktop = CreateDesktop(width, height)
+            Quiet("Desktop", "WallpaperLayer")
+            desktop.carouselTimer.stop()
+            DropPrefetch(desktop)
+
+            # Caches off: every transition needs a decode (sync) or a finished prefetch
+            desktop.wallpaperCache = desktop.wallpaperLoader.cache = None
+            desktop.wallpaperMemoryCache.maxBytes = 0
+            desktop.wallpaperMemoryCache.Clear()
+            desktop.wallpaperList = paths
+            desktop.currentWallpaperIndex = 0
+
+            for prefetch in (False, True):
+                avgMs, p95Ms, maxMs = RunTransitions(desktop, count, prefetch)
+                print(f"{f'{width}x{height}':>10} {'prefetch' if prefetch else 'sync':>9} {avgMs:>8.2f} {p95Ms:>8.2f} {maxMs:>8.2f}")
+
+            DropPrefetch(desktop)
+            desktop.deleteLater()
+            ProcessEvents(0.1)
+
+if __name__ == "__main__":
+    Main()
@@ -0,0 +1,68 @@
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtCore import Qt, QPoint
+from PyQt6.QtTest import QTest
+import pytest
+
+# Desktop widget stand-in: loaded before the icons, so it is stacked under the icon layer
+class ClickTarget(QWidget):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.clicks = []
+
+    def mousePressEvent(self, event):
+        self.clicks.append(event.pos())
+
+@pytest.fixture
+def desktop(qtApp, tmp_path):
+    from ui.desktop import DesktopWindow
+    from ui.desktopIcons import DesktopIconLayer
+
+    desktop = DesktopWindow(deferIcons = True)
+    desktop.setGeometry(0, 0, 1280, 720)
+    desktop.widget = ClickTarget(desktop)
+    desktop.widget.setGeometry(600, 300, 200, 150)
+
+    # Painted mode the way Init sets it up
+    desktop.iconLayer = DesktopIconLayer(desktop)
+    desktop.iconLayer.setGeometry(desktop.rect())
+    desktop.iconLayer.show()
+    for index in range(3):
+        path = tmp_path / f"item{index}.txt"
+        path.write_text("x")
+        desktop.CreateItem(desktop.MakeItemData(str(path), [0, index]))
+
+    desktop.show()
+    QTest.qWaitForWindowExposed(desktop)
+    QTest.qWait(50)
+    yield desktop
+    desktop.close()
+    desktop.deleteLater()
+
+def Click(desktop, pos):
+    QTest.mouseClick(desktop.windowHandle(), Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier, pos)
+    QTest.qWait(10)
+
+def test_desktop_widget_under_the_layer_gets_clicks(desktop):
+    Click(desktop, QPoint(700, 375))
+
+    assert desktop.widget.clicks == [QPoint(100, 75)]
+    assert desktop.childAt(QPoint(700, 375)) is desktop.widget
+
+def test_icon_clicks_still_reach_the_layer(desktop):
+    item = desktop.items_by_path[next(iter(desktop.items_by_path))]
+    Click(desktop, item.geometry().center())
+
+    assert desktop.selected_items == {item}
+    assert desktop.widget.clicks == []
+
+def test_mask_follows_the_items(desktop):
+    layer = desktop.iconLayer
+    item = layer.items[0]
+    assert layer.mask().contains(item.geometry())
+
+    # Dropped over the desktop widget: the icon takes the clicks there, the rest of the widget keeps them
+    item.move(600, 300)
+    QTest.qWait(10)
+    assert layer.mask().contains(QPoint(640, 350))
+    assert desktop.childAt(QPoint(640, 350)) is layer
+    assert desktop.childAt(QPoint(780, 430)) is desktop.widget
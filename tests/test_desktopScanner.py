@@ -0,0 +1,100 @@
+from core.desktopScanner import ScanDirectory, DiffEntries
+import os
+
+def Touch(path, text = "x"):
+    with open(path, "w") as file:
+        file.write(text)
+
+def Rescan(directory, entries):
+    newEntries = ScanDirectory(directory)
+    return newEntries, DiffEntries(entries, newEntries)
+
+def test_scan_skips_hidden_and_ignored(tmp_path):
+    Touch(tmp_path / "notes.txt")
+    Touch(tmp_path / "desktop.ini")
+    Touch(tmp_path / ".hidden")
+    os.mkdir(tmp_path / "Folder")
+
+    entries = ScanDirectory(str(tmp_path))
+
+    assert sorted(os.path.basename(path) for path in entries) == ["Folder", "notes.txt"]
+    assert entries[str(tmp_path / "Folder")][2] is True
+    assert entries[str(tmp_path / "notes.txt")][2] is False
+
+def test_missing_directory_is_empty(tmp_path):
+    assert ScanDirectory(str(tmp_path / "missing")) == {}
+
+def test_add_delete_rename(tmp_path):
+    directory = str(tmp_path)
+    Touch(tmp_path / "keep.txt")
+    Touch(tmp_path / "old.txt")
+    Touch(tmp_path / "gone.txt")
+    entries = ScanDirectory(directory)
+
+    # Nothing changed
+    entries, (added, removed, renamed, modified) = Rescan(directory, entries)
+    assert (added, removed, renamed, modified) == ([], [], [], [])
+
+    # Add
+    Touch(tmp_path / "new.txt")
+    entries, (added, removed, renamed, modified) = Rescan(directory, entries)
+    assert added == [str(tmp_path / "new.txt")]
+    assert removed == [] and renamed == []
+
+    # Delete
+    os.remove(tmp_path / "gone.txt")
+    entries, (added, removed, renamed, modified) = Rescan(directory, entries)
+    assert removed == [str(tmp_path / "gone.txt")]
+    assert added == [] and renamed == []
+
+    # Rename keeps the file id and mtime -> one rename instead of remove + add
+    os.rename(tmp_path / "old.txt", tmp_path / "renamed.txt")
+    entries, (added, removed, renamed, modified) = Rescan(directory, entries)
+    assert renamed == [(str(tmp_path / "old.txt"), str(tmp_path / "renamed.txt"))]
+    assert added == [] and removed == []
+
+def test_rename_and_other_changes_in_one_scan(tmp_path):
+    directory = str(tmp_path)
+    Touch(tmp_path / "a.txt")
+    Touch(tmp_path / "b.txt")
+    entries = ScanDirectory(directory)
+
+    os.rename(tmp_path / "a.txt", tmp_path / "c.txt")
+    os.remove(tmp_path / "b.txt")
+    Touch(tmp_path / "d.txt")
+    entries, (added, removed, renamed, modified) = Rescan(directory, entries)
+
+    assert renamed == [(str(tmp_path / "a.txt"), str(tmp_path / "c.txt"))]
+    assert removed == [str(tmp_path / "b.txt")]
+    assert added == [str(tmp_path / "d.txt")]
+
+def test_same_id_with_new_mtime_is_not_a_rename():
+    # File id reused by a new file right after a delete: mtime differs -> remove + add
+    oldEntries = {"C:\\Desktop\\old.txt": (42, 1000, False)}
+    newEntries = {"C:\\Desktop\\new.txt": (42, 2000, False)}
+
+    added, removed, renamed, modified = DiffEntries(oldEntries, newEntries)
+
+    assert added == ["C:\\Desktop\\new.txt"]
+    assert removed == ["C:\\Desktop\\old.txt"]
+    assert renamed == [] and modified == []
+
+def test_modified_in_place(tmp_path):
+    directory = str(tmp_path)
+    Touch(tmp_path / "app.exe")
+    Touch(tmp_path / "other.txt")
+    entries = ScanDirectory(directory)
+
+    # Same path, new mtime -> modified (the icon is resolved again)
+    path = str(tmp_path / "app.exe")
+    os.utime(path, ns = (entries[path][1] + 10 ** 9, entries[path][1] + 10 ** 9))
+    entries, (added, removed, renamed, modified) = Rescan(directory, entries)
+    assert modified == [path]
+    assert (added, removed, renamed) == ([], [], [])
+
+def test_replaced_under_the_same_name():
+    # Another file moved over the old one: same path, different file id
+    oldEntries = {"C:\\Desktop\\app.lnk": (42, 1000, False)}
+    newEntries = {"C:\\Desktop\\app.lnk": (43, 1000, False)}
+
+    assert DiffEntries(oldEntries, newEntries) == ([], [], [], ["C:\\Desktop\\app.lnk"])
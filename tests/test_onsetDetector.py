@@ -0,0 +1,53 @@
+from core.audio import WriteClickTrack, DecodePcm, AudioAnalyzer
+from core.widgetHost import LoadWidgetModule
+import numpy as np
+import pytest
+import wave
+import os
+
+OSU_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "userdata", "widgets", "desktop", "OSUSpectrum", "osu.py")
+# Analysis like AudioService: 2048 point FFT every 1/60 s
+FFT_SIZE = 2048
+ANALYSIS_FPS = 60
+# Click -> first beat after it, later beats are misses
+MATCH_WINDOW_S = 0.06
+
+@pytest.fixture(scope = "module")
+def osu():
+    return LoadWidgetModule(OSU_PATH, "userwidgets.desktop.OSUSpectrum")
+
+# Click track WAV -> detector frame by frame, returns (click times, beat times, detector)
+def DetectBeats(osu, path, bpm, noise = 0.0):
+    clickTimes = WriteClickTrack(path, bpm = bpm, seconds = 30.0, noise = noise)
+    with wave.open(path) as wavFile:
+        sampleRate = wavFile.getframerate()
+        samples = DecodePcm(wavFile.readframes(wavFile.getnframes()), wavFile.getsampwidth(), wavFile.getnchannels())
+
+    analyzer = AudioAnalyzer(FFT_SIZE, sampleRate)
+    detector = osu.OnsetDetector()
+    beatTimes = []
+    for sequence, end in enumerate(np.arange(FFT_SIZE, len(samples), sampleRate / ANALYSIS_FPS).astype(int)):
+        frame = analyzer.Analyse(samples[end - FFT_SIZE:end], sequence)
+        if detector.Process(frame.spectrum, end / sampleRate):
+            beatTimes.append(end / sampleRate)
+    return clickTimes, np.array(beatTimes), detector
+
+def MatchBeats(clickTimes, beatTimes):
+    latencies = []
+    for clickTime in clickTimes:
+        delays = beatTimes - clickTime
+        delays = delays[(delays >= 0) & (delays < MATCH_WINDOW_S)]
+        if len(delays):
+            latencies.append(delays.min())
+    return np.array(latencies)
+
+@pytest.mark.parametrize("bpm, noise", [(90, 0.0), (120, 0.0), (150, 0.0), (120, 0.05)])
+def test_click_track(osu, tmp_path, bpm, noise):
+    clickTimes, beatTimes, detector = DetectBeats(osu, str(tmp_path / f"click-{bpm}.wav"), bpm, noise)
+    latencies = MatchBeats(clickTimes, beatTimes)
+
+    assert len(latencies) >= 0.95 * len(clickTimes)
+    assert len(beatTimes) - len(latencies) <= 1
+    assert latencies.mean() <= 0.025
+    assert latencies.max() <= 0.05
+    assert abs(detector.bpm - bpm) <= 1.5
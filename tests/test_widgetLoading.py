@@ -0,0 +1,112 @@
+from PyQt6.QtWidgets import QWidget
+from core.widgetManager import WidgetManager
+import textwrap
+import time
+import pytest
+
+# Synthetic widget: Prepare() runs on the load pool and sleeps like a slow import/asset load
+FAKE_WIDGET = textwrap.dedent("""
+    from PyQt6.QtWidgets import QWidget
+    import time
+
+    def Prepare():
+        time.sleep({delay})
+        return {delay}
+
+    class Widget(QWidget):
+        def __init__(self, parent = None, prepared = None):
+            super().__init__(parent)
+            self.prepared = prepared
+            self.updates = []
+
+        def Updater(self, changedSections = None):
+            self.updates.append(changedSections)
+""")
+
+# name -> Prepare() seconds
+FAKE_WIDGETS = {"fastOne": 0.01, "fastTwo": 0.02, "slowOne": 0.4, "slowTwo": 0.6}
+
+@pytest.fixture
+def manager(qtApp, tmp_path, monkeypatch):
+    for name, delay in FAKE_WIDGETS.items():
+        folder = tmp_path / name
+        folder.mkdir()
+        (folder / f"{name}.py").write_text(FAKE_WIDGET.format(delay = delay))
+
+    parent = QWidget()
+    manager = WidgetManager(parent, "desktop")
+    manager.pool.setMaxThreadCount(len(FAKE_WIDGETS))
+    # Fake widgets live in the temp folder (loaded like userdata widgets)
+    monkeypatch.setattr(manager, "FindWidget", lambda name: (str(tmp_path / name), str(tmp_path / name / f"{name}.py")) if name in FAKE_WIDGETS else (None, None))
+    monkeypatch.setattr(manager, "ReadWidgetLists", lambda: (", ".join(FAKE_WIDGETS), ""))
+    yield manager
+
+    manager.pool.waitForDone()
+    manager.UnloadWidgets()
+    parent.deleteLater()
+
+def LoadedNames(manager):
+    return [manager.widgetNames[widget] for widget in manager.widgets]
+
+def WaitForDeferred(qtApp, manager, timeout = 5.0):
+    deadline = time.perf_counter() + timeout
+    while manager.deferredTasks and time.perf_counter() < deadline:
+        qtApp.processEvents()
+        time.sleep(0.01)
+
+def test_slow_widgets_are_deferred(qtApp, manager):
+    manager.loadBudgetMs = 150
+    manager.deferSlowWidgets = True
+
+    startTime = time.perf_counter()
+    manager.LoadWidgets()
+    loadMs = (time.perf_counter() - startTime) * 1000
+
+    # LoadWidgets returned at the budget with the fast widgets only
+    assert loadMs < 350
+    assert LoadedNames(manager) == ["fastOne", "fastTwo"]
+    assert set(manager.deferredTasks) == {"slowOne", "slowTwo"}
+
+    # OnTaskFinished creates the slow ones when their tasks finish, with a full style update
+    WaitForDeferred(qtApp, manager)
+    assert not manager.deferredTasks
+    assert sorted(LoadedNames(manager)) == sorted(FAKE_WIDGETS)
+    for widget in manager.widgets:
+        assert widget.prepared == FAKE_WIDGETS[manager.widgetNames[widget]]
+        if manager.widgetNames[widget].startswith("slow"):
+            assert widget.updates == [["ALL"]]
+
+def test_without_defer_load_waits_for_all(qtApp, manager):
+    manager.loadBudgetMs = 150
+    manager.deferSlowWidgets = False
+
+    manager.LoadWidgets()
+
+    # Config order, nothing left for OnTaskFinished
+    assert LoadedNames(manager) == list(FAKE_WIDGETS)
+    assert not manager.deferredTasks
+
+def test_widgets_load_in_parallel(qtApp, manager):
+    manager.loadBudgetMs = 0
+
+    startTime = time.perf_counter()
+    manager.LoadWidgets()
+    loadMs = (time.perf_counter() - startTime) * 1000
+
+    # Slowest Prepare() + overhead, not the sum of all of them
+    assert LoadedNames(manager) == list(FAKE_WIDGETS)
+    assert loadMs < sum(FAKE_WIDGETS.values()) * 1000 * 0.8
+
+def test_reload_drops_pending_deferred_widgets(qtApp, manager):
+    manager.loadBudgetMs = 150
+    manager.deferSlowWidgets = True
+
+    manager.LoadWidgets()
+    firstTasks = dict(manager.deferredTasks)
+    manager.pool.waitForDone()
+    manager.LoadWidgets()
+
+    # Tasks of the first load finish (their signals are still queued) but are not created anymore
+    WaitForDeferred(qtApp, manager)
+    assert all(task not in manager.deferredTasks.values() for task in firstTasks.values())
+    assert sorted(LoadedNames(manager)) == sorted(FAKE_WIDGETS)
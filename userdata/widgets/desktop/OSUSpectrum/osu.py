@@ -0,0 +1,321 @@
+from PyQt6.QtCore import Qt, QPointF
+from PyQt6.QtGui import QPainter, QPen, QPolygonF
+from core.visualizer import AudioVisualizer
+from core.profiler import profiler
+from widgets.desktop.defaultSpectrum.spectrum import SpectrumEngine
+import numpy as np
+
+# Typed widget settings
+OSU_SCHEMA = {
+	"Desktop.OSUSpectrum": {
+		"visible": ("bool", True),
+		"x": ("int", 800),
+		"y": ("int", 300),
+		"width": ("int", 400),
+		"height": ("int", 400),
+		"bars": ("int", 96),
+		"min_freq": ("float", 40),
+		"max_freq": ("float", 12000),
+		"db_floor": ("float", -60),
+		"attack": ("float", 0.7),
+		"decay": ("float", 0.2),
+		"inner_radius": ("int", 45),
+		"bar_width": ("float", 4),
+		"pulse_scale": ("float", 0.12),
+		"pulse_decay_ms": ("int", 180),
+		"sensitivity": ("float", 1.5),
+		"min_beat_interval_ms": ("int", 120),
+		"min_bpm": ("float", 70),
+		"max_bpm": ("float", 180),
+		"bar_color": ("color", "#DDFFFFFF"),
+		"circle_color": ("color", "#55FF66AA"),
+		"antialiasing": ("bool", False),
+	},
+}
+
+# Flux history for the adaptive threshold (a bit longer than the slowest beat) and for the tempo
+THRESHOLD_S = 1.5
+TEMPO_S = 8.0
+# History buffers are sized for this analysis frame rate, lower rates use a part of them
+MAX_FRAME_RATE = 240
+# Seconds between tempo estimates
+TEMPO_INTERVAL_S = 0.5
+# Octave errors: autocorrelation is weighted by a log-normal around this tempo
+PREFERRED_BPM = 120.0
+# Pulse/levels below this are not repainted
+IDLE_LEVEL = 1 / 512
+
+# ***info***
+# Streaming onset/beat detector over the shared AudioFrame spectra, fixed-size buffers only
+# - spectral flux: sum of the positive changes of the log-compressed magnitudes between two frames
+# - onset: flux rises above mean + sensitivity * std of the fluxes of the last THRESHOLD_S (and min_interval passed)
+# - tempo: autocorrelation of the onset strengths of the last TEMPO_S every TEMPO_INTERVAL_S,
+#   windows and lags follow the measured frame rate (the analysis timer isn't exact)
+# - beat: onset that isn't closer than 60% of the beat period to the previous beat (any onset without a tempo)
+# **********
+class OnsetDetector:
+	def __init__(self, sensitivity = 1.5, minIntervalMs = 120, minBpm = 70.0, maxBpm = 180.0, compression = 100.0):
+		self.sensitivity = sensitivity
+		self.minInterval = minIntervalMs / 1000
+		self.minBpm = max(1.0, minBpm)
+		self.maxBpm = max(self.minBpm + 1, maxBpm)
+		self.compression = compression
+
+		# Log spectra of the last two frames (allocated for the first spectrum size)
+		self.previous = self.current = self.difference = None
+		self.fluxHistory = np.zeros(int(THRESHOLD_S * MAX_FRAME_RATE), np.float64)
+		self.strengths = np.zeros(int(TEMPO_S * MAX_FRAME_RATE), np.float64)
+		self.frameCount = 0
+		self.lastTempoTime = None
+		self.lastTime = None
+		self.frameRate = 60.0
+
+		self.above = False
+		self.lastOnset = self.lastBeat = -1e9
+		# Results of the last Process()
+		self.flux = self.threshold = 0.0
+		self.onset = self.beat = False
+		self.bpm = 0.0
+		self.confidence = 0.0
+
+	def Reset(self, size):
+		self.previous = np.zeros(size, np.float32)
+		self.current = np.zeros(size, np.float32)
+		self.difference = np.zeros(size, np.float32)
+		self.fluxHistory.fill(0.0)
+		self.strengths.fill(0.0)
+		self.frameCount = 0
+		self.lastTempoTime = None
+
+	def Process(self, spectrum, frameTime):
+		if self.previous is None or len(self.previous) != len(spectrum):
+			self.Reset(len(spectrum))
+
+		if self.lastTime is not None and frameTime > self.lastTime:
+			# Frame rate for the tempo lags (slow average, timer jitter is smoothed out)
+			self.frameRate += (1.0 / (frameTime - self.lastTime) - self.frameRate) * 0.02
+		self.lastTime = frameTime
+
+		np.multiply(spectrum, self.compression, out = self.current)
+		np.log1p(self.current, out = self.current)
+		np.subtract(self.current, self.previous, out = self.difference)
+		np.maximum(self.difference, 0.0, out = self.difference)
+		self.previous, self.current = self.current, self.previous
+		flux = self.flux = float(self.difference.sum())
+
+		# Threshold of the frames before this one (newest THRESHOLD_S of the history)
+		filled = min(self.frameCount, round(THRESHOLD_S * self.frameRate), len(self.fluxHistory))
+		history = self.History(self.fluxHistory, filled)
+		mean = float(history.mean()) if filled else flux
+		self.threshold = mean + self.sensitivity * (float(history.std()) if filled else 0.0)
+
+		# Rising edge over the threshold (first frames only fill the history)
+		wasAbove = self.above
+		self.above = flux > self.threshold and filled >= 8
+		self.onset = self.above and not wasAbove and frameTime - self.lastOnset >= self.minInterval
+		if self.onset:
+			self.lastOnset = frameTime
+
+		self.beat = False
+		if self.onset:
+			period = 60.0 / self.bpm if self.bpm else 0.0
+			if frameTime - self.lastBeat >= period * 0.6:
+				self.beat = True
+				self.lastBeat = frameTime
+
+		self.fluxHistory[self.frameCount % len(self.fluxHistory)] = flux
+		self.strengths[self.frameCount % len(self.strengths)] = max(0.0, flux - mean)
+		self.frameCount += 1
+
+		if self.lastTempoTime is None:
+			self.lastTempoTime = frameTime
+		elif frameTime - self.lastTempoTime >= TEMPO_INTERVAL_S:
+			self.lastTempoTime = frameTime
+			self.EstimateTempo()
+		return self.beat
+
+	# Newest count values of a ring buffer, oldest first (a view when they don't wrap)
+	def History(self, ring, count):
+		end = self.frameCount % len(ring)
+		if count <= end:
+			return ring[end - count:end]
+		return np.concatenate((ring[len(ring) - (count - end):], ring[:end]))
+
+	def EstimateTempo(self):
+		count = min(self.frameCount, round(TEMPO_S * self.frameRate), len(self.strengths))
+		# At least two periods of the slowest tempo
+		if count < 2 * 60.0 / self.minBpm * self.frameRate:
+			return
+		strengths = self.History(self.strengths, count)
+		strengths = strengths - strengths.mean()
+
+		spectrum = np.fft.rfft(strengths, count * 2)
+		correlation = np.fft.irfft(spectrum * np.conj(spectrum))[:count]
+		if correlation[0] <= 0:
+			self.confidence = 0.0
+			return
+
+		lags = np.arange(count, dtype = np.float64)
+		lags[0] = 1.0
+		bpms = 60.0 * self.frameRate / lags
+		valid = (bpms >= self.minBpm) & (bpms <= self.maxBpm)
+		if not valid.any():
+			return
+		weights = np.exp(-0.5 * (np.log2(bpms / PREFERRED_BPM) / 0.9) ** 2)
+		scores = np.where(valid, correlation * weights, -np.inf)
+		lag = int(np.argmax(scores))
+
+		# Parabolic interpolation between the neighbour lags (only around a real maximum)
+		offset = 0.0
+		if 0 < lag < count - 1:
+			left, middle, right = correlation[lag - 1], correlation[lag], correlation[lag + 1]
+			denominator = left - 2 * middle + right
+			if denominator < 0:
+				offset = min(0.5, max(-0.5, 0.5 * (left - right) / denominator))
+		self.bpm = 60.0 * self.frameRate / (lag + offset)
+		self.confidence = float(max(0.0, correlation[lag] / correlation[0]))
+
+# ***info***
+# osu!-style circular spectrum: bars around a circle that pulses on detected beats
+# Bar angles are precomputed per bar count/size (cos/sin tables), a frame only scales them by the radii;
+# the bar end points are written straight into a QPolygonF that is drawn with one drawLines call
+# **********
+class Widget(AudioVisualizer):
+	def __init__(self, parent = None):
+		super().__init__(parent, "Desktop.OSUSpectrum", OSU_SCHEMA, __file__)
+		self.setObjectName("OSUSpectrumWidget")
+
+		self.engine = None
+		self.detector = None
+		self.pulse = 0.0
+		self.lastFrameTime = None
+		self.paintedLevels = None
+		self.paintedPulse = None
+
+		# Polar geometry (BuildGeometry)
+		self.cosTable = self.sinTable = None
+		self.polygon = QPolygonF()
+		self.points = np.zeros((0, 2))
+		self.centerX = self.centerY = 0.0
+		self.baseRadius = self.barLength = 0.0
+		self.innerRadius = 0.0
+		self.barPen = None
+
+		self.Updater()
+
+	def ApplySettings(self, settings):
+		self.engine = SpectrumEngine(
+			bands = settings.bars,
+			minFreq = settings.min_freq,
+			maxFreq = settings.max_freq,
+			dbFloor = settings.db_floor,
+			attack = settings.attack,
+			decay = settings.decay,
+			peakHoldMs = 0
+		)
+		self.detector = OnsetDetector(
+			sensitivity = settings.sensitivity,
+			minIntervalMs = settings.min_beat_interval_ms,
+			minBpm = settings.min_bpm,
+			maxBpm = settings.max_bpm
+		)
+		self.pulse = 0.0
+		self.lastFrameTime = None
+		self.paintedLevels = np.full(self.engine.bands, -1.0, np.float32)
+
+		self.barPen = QPen(settings.bar_color.qcolor, settings.bar_width)
+		self.barPen.setCapStyle(Qt.PenCapStyle.FlatCap)
+
+		self.setGeometry(settings.x, settings.y, settings.width, settings.height)
+		self.BuildGeometry()
+
+	# ==========[> Geometry
+
+	def resizeEvent(self, event):
+		super().resizeEvent(event)
+		self.BuildGeometry()
+
+	def BuildGeometry(self):
+		if self.engine is None:
+			return
+		bars = self.engine.bands
+
+		# Bars start at the top and go clockwise
+		angles = np.linspace(0.0, 2 * np.pi, bars, endpoint = False) - np.pi / 2
+		self.cosTable = np.cos(angles)
+		self.sinTable = np.sin(angles)
+
+		self.centerX = self.width() / 2
+		self.centerY = self.height() / 2
+		halfSize = min(self.width(), self.height()) / 2
+		self.baseRadius = halfSize * min(95, max(5, self.settings.inner_radius)) / 100
+		# Room for the pulse and the longest bar
+		self.barLength = max(1.0, halfSize - self.baseRadius * (1 + self.settings.pulse_scale) - 2)
+
+		# Start/end point pairs of the bars viewed as float64 (x, y) rows of the polygon
+		self.polygon = QPolygonF([QPointF()] * (bars * 2))
+		pointer = self.polygon.data()
+		pointer.setsize(bars * 2 * 2 * 8)
+		self.points = np.frombuffer(pointer, np.float64).reshape(bars * 2, 2)
+		self.radii = np.zeros(bars, np.float64)
+		self.paintedPulse = None
+		self.UpdatePoints()
+
+	# Polar -> points for the current levels and pulse
+	def UpdatePoints(self):
+		self.innerRadius = self.baseRadius * (1 + self.pulse * self.settings.pulse_scale)
+		starts = self.points[0::2]
+		ends = self.points[1::2]
+
+		np.multiply(self.cosTable, self.innerRadius, out = starts[:, 0])
+		starts[:, 0] += self.centerX
+		np.multiply(self.sinTable, self.innerRadius, out = starts[:, 1])
+		starts[:, 1] += self.centerY
+
+		np.multiply(self.engine.levels, self.barLength, out = self.radii)
+		self.radii += self.innerRadius + 1
+		np.multiply(self.cosTable, self.radii, out = ends[:, 0])
+		ends[:, 0] += self.centerX
+		np.multiply(self.sinTable, self.radii, out = ends[:, 1])
+		ends[:, 1] += self.centerY
+
+	# ==========[> Frames
+
+	def OnAudioFrame(self, frame):
+		if self.engine is None or not self.isVisible():
+			return
+
+		dt = 1 / 60 if self.lastFrameTime is None else min(0.25, frame.time - self.lastFrameTime)
+		self.lastFrameTime = frame.time
+
+		with profiler.Span("desktop.osu.process"):
+			self.engine.Process(frame.spectrum, frame.frequencies, dt)
+			beat = self.detector.Process(frame.spectrum, frame.time)
+			self.pulse = 1.0 if beat else self.pulse * np.exp(-dt * 1000 / max(1, self.settings.pulse_decay_ms))
+
+		# Idle: no visible change of the bars and no pulse
+		if self.paintedPulse is not None and abs(self.pulse - self.paintedPulse) < IDLE_LEVEL and np.abs(self.engine.levels - self.paintedLevels).max() < IDLE_LEVEL:
+			return
+		self.UpdatePoints()
+		self.update()
+
+	def paintEvent(self, event):
+		if self.engine is None or not len(self.points):
+			return
+		frameStart = profiler.StartFrame()
+
+		self.paintedLevels[:] = self.engine.levels
+		self.paintedPulse = self.pulse
+
+		painter = QPainter(self)
+		painter.setRenderHint(QPainter.RenderHint.Antialiasing, self.settings.antialiasing)
+		painter.setPen(Qt.PenStyle.NoPen)
+		painter.setBrush(self.settings.circle_color.qcolor)
+		radius = self.innerRadius - 2
+		painter.drawEllipse(QPointF(self.centerX, self.centerY), radius, radius)
+
+		painter.setPen(self.barPen)
+		painter.drawLines(self.polygon)
+		painter.end()
+
+		profiler.EndFrame("desktop.osu", frameStart)
@@ -0,0 +1,233 @@
+from PyQt6.QtCore import Qt, QRectF, QSize
+from PyQt6.QtGui import QPainter, QPixmap, QColor
+from core.audio import GetAudioService
+from core.visualizer import AudioVisualizer
+from core.profiler import profiler
+import numpy as np
+
+# Typed meter settings
+VU_METER_SCHEMA = {
+	"Desktop.VUMeter": {
+		"visible": ("bool", True),
+		"x": ("int", 100),
+		"y": ("int", 520),
+		"width": ("int", 400),
+		"height": ("int", 50),
+		"segments": ("int", 40),
+		"segment_gap": ("int", 2),
+		"row_gap": ("int", 6),
+		"min_db": ("float", -48),
+		"max_db": ("float", 0),
+		"warn_db": ("float", -9),
+		"clip_db": ("float", -3),
+		"vu_rise_ms": ("int", 300),
+		"vu_fall_ms": ("int", 300),
+		"peak_rise_ms": ("int", 10),
+		"peak_fall_ms": ("int", 1500),
+		"peak_hold_ms": ("int", 1000),
+		"color": ("color", "#40FFE0"),
+		"warn_color": ("color", "#FFC040"),
+		"clip_color": ("color", "#FF4040"),
+		"unlit_alpha": ("int", 24),
+		"glow": ("bool", True),
+	},
+}
+
+# Longest block integrated at once (stalled frames don't read the whole ring buffer)
+MAX_BLOCK_S = 0.25
+# Time constants are "time to reach 99%" like on meter data sheets, tau = time / ln(100)
+RISE_TO_TAU = 1 / np.log(100)
+
+# ***info***
+# Meter ballistics for both rows at once: [VU, PPM]
+# - every frame integrates the samples that came in since the last one: mean square (VU) and max |x| (PPM)
+# - levels follow the block values with separate rise/fall time constants (exact exponential over dt)
+# - PPM keeps a peak-hold segment for peak_hold_ms
+# Levels are in dBFS, the widget only needs lit segment counts (Segments)
+# **********
+class MeterBallistics:
+	def __init__(self, riseMs = (300, 10), fallMs = (300, 1500), peakHoldMs = 1000, minDb = -48.0, maxDb = 0.0, segments = 40):
+		self.riseTau = np.maximum(np.array(riseMs, np.float64), 1.0) / 1000 * RISE_TO_TAU
+		self.fallTau = np.maximum(np.array(fallMs, np.float64), 1.0) / 1000 * RISE_TO_TAU
+		self.peakHold = peakHoldMs / 1000
+		self.minDb = minDb
+		self.dbRange = max(1.0, maxDb - minDb)
+		self.segments = max(1, segments)
+
+		# Linear levels: VU as RMS, PPM as peak amplitude
+		self.levels = np.zeros(2, np.float64)
+		self.block = np.zeros(2, np.float64)
+		self.holdSegment = 0
+		self.holdAge = 0.0
+
+	def Process(self, samples, dt):
+		if len(samples):
+			self.block[0] = np.sqrt(np.dot(samples, samples) / len(samples))
+			self.block[1] = np.abs(samples).max()
+		else:
+			self.block.fill(0.0)
+
+		tau = np.where(self.block > self.levels, self.riseTau, self.fallTau)
+		self.levels += (self.block - self.levels) * -np.expm1(-dt / tau)
+
+		# Peak hold on the PPM row
+		peakSegment = self.Segments()[1]
+		self.holdAge += dt
+		if peakSegment >= self.holdSegment or self.holdAge > self.peakHold:
+			self.holdSegment = peakSegment
+			self.holdAge = 0.0
+
+	# Lit segments of [VU, PPM]
+	def Segments(self):
+		db = 20 * np.log10(np.maximum(self.levels, 1e-9))
+		return np.clip(np.ceil((db - self.minDb) / self.dbRange * self.segments), 0, self.segments).astype(int).tolist()
+
+# ***info***
+# Desktop VFD VU meter: VU row (RMS, 300 ms) and PPM row (fast peak + hold)
+# The lit and unlit looks of a row (segment colors, glow) are painted once per settings into two sprites,
+# a frame draws the unlit sprite and the lit part of the lit sprite per row.
+# Frames that don't change a lit segment count are not repainted (silence = no repaints at all).
+# **********
+class Widget(AudioVisualizer):
+	def __init__(self, parent = None):
+		super().__init__(parent, "Desktop.VUMeter", VU_METER_SCHEMA, __file__)
+		self.setObjectName("VUMeterWidget")
+
+		self.ballistics = None
+		self.blockBuffer = np.zeros(0, np.float32)
+		self.lastFrameTime = None
+		# (VU, PPM, hold) segments of the painted frame
+		self.paintedState = None
+
+		# Sprites + segment geometry (BuildSprites)
+		self.litSprite = self.unlitSprite = None
+		self.segmentRights = []
+		self.rowHeight = 0
+
+		self.Updater()
+
+	def ApplySettings(self, settings):
+		self.ballistics = MeterBallistics(
+			riseMs = (settings.vu_rise_ms, settings.peak_rise_ms),
+			fallMs = (settings.vu_fall_ms, settings.peak_fall_ms),
+			peakHoldMs = settings.peak_hold_ms,
+			minDb = settings.min_db,
+			maxDb = settings.max_db,
+			segments = settings.segments
+		)
+		self.lastFrameTime = None
+		self.paintedState = None
+
+		self.setGeometry(settings.x, settings.y, settings.width, settings.height)
+		self.BuildSprites()
+
+	# ==========[> Sprites
+
+	def resizeEvent(self, event):
+		super().resizeEvent(event)
+		if self.settings is not None and self.litSprite is not None and self.litSprite.size() != self.RowSize():
+			self.BuildSprites()
+
+	def RowSize(self):
+		return QSize(max(1, self.width()), max(1, (self.height() - self.settings.row_gap) // 2))
+
+	def SegmentColor(self, segment):
+		settings = self.settings
+		db = settings.min_db + (segment + 1) / settings.segments * (settings.max_db - settings.min_db)
+		if db > settings.clip_db:
+			return settings.clip_color.qcolor
+		if db > settings.warn_db:
+			return settings.warn_color.qcolor
+		return settings.color.qcolor
+
+	# Lit and unlit look of one row (both rows look the same)
+	def BuildSprites(self):
+		settings = self.settings
+		size = self.RowSize()
+		self.rowHeight = size.height()
+		segments = max(1, settings.segments)
+		gap = max(0, settings.segment_gap)
+		segmentWidth = max(1.0, (size.width() - gap * (segments - 1)) / segments)
+		# Glow needs a margin around the segments
+		glowMargin = min(2.0, self.rowHeight / 6) if settings.glow else 0.0
+
+		self.litSprite = QPixmap(size)
+		self.unlitSprite = QPixmap(size)
+		self.segmentRights = []
+		for sprite, lit in ((self.litSprite, True), (self.unlitSprite, False)):
+			sprite.fill(Qt.GlobalColor.transparent)
+			painter = QPainter(sprite)
+			painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+			painter.setPen(Qt.PenStyle.NoPen)
+			for segment in range(segments):
+				left = segment * (segmentWidth + gap)
+				rect = QRectF(left, glowMargin, segmentWidth, self.rowHeight - glowMargin * 2)
+				color = QColor(self.SegmentColor(segment))
+				if lit:
+					# Phosphor glow: wider, fainter copies under the segment
+					if glowMargin:
+						for spread, alpha in ((glowMargin, 40), (glowMargin / 2, 80)):
+							glowColor = QColor(color)
+							glowColor.setAlpha(alpha)
+							painter.setBrush(glowColor)
+							painter.drawRoundedRect(rect.adjusted(-spread, -spread, spread, spread), spread, spread)
+				else:
+					color.setAlpha(max(0, min(255, settings.unlit_alpha)))
+				painter.setBrush(color)
+				painter.drawRect(rect)
+				if lit:
+					self.segmentRights.append(min(size.width(), round(left + segmentWidth + min(gap, glowMargin))))
+			painter.end()
+
+		self.paintedState = None
+		self.update()
+
+	# ==========[> Frames
+
+	def OnAudioFrame(self, frame):
+		if self.ballistics is None or not self.isVisible():
+			return
+
+		dt = 1 / 60 if self.lastFrameTime is None else min(MAX_BLOCK_S, max(0.0, frame.time - self.lastFrameTime))
+		self.lastFrameTime = frame.time
+
+		with profiler.Span("desktop.vumeter.process"):
+			# Samples that came in since the last frame
+			blockSize = int(MAX_BLOCK_S * frame.sampleRate)
+			if len(self.blockBuffer) != blockSize:
+				self.blockBuffer = np.zeros(blockSize, np.float32)
+			GetAudioService().ReadSamples(self.blockBuffer)
+			count = min(blockSize, max(1, round(dt * frame.sampleRate)))
+			self.ballistics.Process(self.blockBuffer[-count:], dt)
+
+		vuSegments, peakSegments = self.ballistics.Segments()
+		state = (vuSegments, peakSegments, self.ballistics.holdSegment)
+		if state == self.paintedState:
+			return
+		self.update()
+
+	def paintEvent(self, event):
+		if self.ballistics is None or self.litSprite is None:
+			return
+		frameStart = profiler.StartFrame()
+
+		vuSegments, peakSegments = self.ballistics.Segments()
+		holdSegment = self.ballistics.holdSegment
+		self.paintedState = (vuSegments, peakSegments, holdSegment)
+
+		painter = QPainter(self)
+		rowTop = 0
+		for litSegments, hold in ((vuSegments, 0), (peakSegments, holdSegment)):
+			painter.drawPixmap(0, rowTop, self.unlitSprite)
+			if litSegments:
+				right = self.segmentRights[litSegments - 1]
+				painter.drawPixmap(0, rowTop, self.litSprite, 0, 0, right, self.rowHeight)
+			# Peak-hold segment above the lit range
+			if hold > litSegments:
+				left = self.segmentRights[hold - 2] if hold > 1 else 0
+				right = self.segmentRights[hold - 1]
+				painter.drawPixmap(left, rowTop, self.litSprite, left, 0, right - left, self.rowHeight)
+			rowTop += self.rowHeight + self.settings.row_gap
+		painter.end()
+
+		profiler.EndFrame("desktop.vumeter", frameStart)
@@ -0,0 +1,193 @@
+from PyQt6.QtCore import QPointF
+from PyQt6.QtGui import QPainter, QPen, QPolygonF
+from core.audio import GetAudioService
+from core.visualizer import AudioVisualizer
+from core.profiler import profiler
+import numpy as np
+
+# Typed oscilloscope settings
+OSCILLOSCOPE_SCHEMA = {
+	"Desktop.Oscilloscope": {
+		"visible": ("bool", True),
+		"x": ("int", 100),
+		"y": ("int", 350),
+		"width": ("int", 600),
+		"height": ("int", 150),
+		"window_ms": ("float", 20),
+		"gain": ("float", 1.0),
+		"trigger": ("bool", True),
+		"trigger_level": ("float", 0.0),
+		"hysteresis": ("float", 0.02),
+		"trigger_position": ("int", 10),
+		"line_color": ("color", "#FF00FFAA"),
+		"line_width": ("float", 1.0),
+		"antialiasing": ("bool", True),
+	},
+}
+
+# Window quieter than this is drawn once and then not repainted
+SILENCE_LEVEL = 1e-4
+
+# ***info***
+# Trigger + decimation of the scope, NumPy only
+# - samples holds two windows: the trigger is searched in the older part so a full window always follows it
+# - Schmitt trigger: a rising crossing of the level counts only if the signal was below level - hysteresis
+#   after it was last above level + hysteresis (noise around the level doesn't retrigger), the latest one wins
+# - more than 2 samples per pixel: min/max per pixel column (peaks survive), 2 points per column
+# Points are written straight into the memory of a QPolygonF (no per-frame point objects)
+# **********
+class ScopeEngine:
+	def __init__(self, windowMs = 20.0, triggerLevel = 0.0, hysteresis = 0.02, triggerPosition = 10, trigger = True):
+		self.windowMs = max(0.1, windowMs)
+		self.triggerLevel = triggerLevel
+		self.hysteresis = max(0.0, hysteresis)
+		self.triggerPosition = min(100, max(0, triggerPosition)) / 100
+		self.trigger = trigger
+
+		self.sampleRate = None
+		self.width = 0
+		self.windowSamples = 0
+		self.samples = np.zeros(0, np.float32)
+		self.polygon = QPolygonF()
+		self.points = np.zeros((0, 2))
+		self.triggered = False
+
+	# Buffers for a sample rate / pixel width (rebuilt only when one of them changes)
+	def Resize(self, sampleRate, width):
+		if (sampleRate, width) == (self.sampleRate, self.width):
+			return
+		self.sampleRate = sampleRate
+		self.width = width = max(1, width)
+		windowSamples = self.windowSamples = max(2, round(sampleRate * self.windowMs / 1000))
+
+		self.samples = np.zeros(windowSamples * 2, np.float32)
+		self.indices = np.arange(windowSamples * 2)
+		self.lowMarks = np.empty(windowSamples * 2, np.intp)
+		self.highMarks = np.empty(windowSamples * 2, np.intp)
+
+		# Decimated: min/max pair per column, otherwise every sample is a point
+		self.decimated = windowSamples > width * 2
+		if self.decimated:
+			pointCount = width * 2
+			self.columnStarts = (np.arange(width) * windowSamples) // width
+			self.columnMax = np.empty(width, np.float32)
+			self.columnMin = np.empty(width, np.float32)
+			xs = np.repeat(np.arange(width) + 0.5, 2)
+		else:
+			pointCount = windowSamples
+			xs = np.linspace(0.0, width, windowSamples)
+
+		# QPolygonF memory viewed as (x, y) float64 pairs, x never changes
+		self.polygon = QPolygonF([QPointF()] * pointCount)
+		pointer = self.polygon.data()
+		pointer.setsize(pointCount * 2 * 8)
+		self.points = np.frombuffer(pointer, np.float64).reshape(pointCount, 2)
+		self.points[:, 0] = xs
+
+	def FindTrigger(self):
+		samples = self.samples
+		level = self.triggerLevel
+		windowSamples = self.windowSamples
+		pretrigger = int(windowSamples * self.triggerPosition)
+
+		# Index of the last sample below/above the hysteresis band, up to every sample
+		np.copyto(self.lowMarks, np.where(samples < level - self.hysteresis, self.indices, -1))
+		np.maximum.accumulate(self.lowMarks, out = self.lowMarks)
+		np.copyto(self.highMarks, np.where(samples > level + self.hysteresis, self.indices, -1))
+		np.maximum.accumulate(self.highMarks, out = self.highMarks)
+
+		# Crossing between i - 1 and i, searched where a whole window still follows
+		first = max(1, pretrigger)
+		last = windowSamples + pretrigger
+		before = samples[first - 1:last - 1]
+		crossings = (before < level) & (samples[first:last] >= level) & (self.lowMarks[first - 1:last - 1] > self.highMarks[first - 1:last - 1])
+		found = np.flatnonzero(crossings)
+		if not len(found):
+			return None
+		return int(found[-1]) + first - pretrigger
+
+	# New samples -> polygon points, height/gain map -1..1 to the widget height
+	# Returns the peak of the shown window
+	def Process(self, height, gain):
+		start = self.FindTrigger() if self.trigger else None
+		self.triggered = start is not None
+		if start is None:
+			# Free run: the latest window
+			start = self.windowSamples
+		window = self.samples[start:start + self.windowSamples]
+
+		ys = self.points[:, 1]
+		if self.decimated:
+			np.maximum.reduceat(window, self.columnStarts, out = self.columnMax)
+			np.minimum.reduceat(window, self.columnStarts, out = self.columnMin)
+			ys[0::2] = self.columnMax
+			ys[1::2] = self.columnMin
+		else:
+			ys[:] = window
+
+		# Sample -> y (up is positive)
+		halfHeight = height / 2
+		ys *= -gain * halfHeight
+		ys += halfHeight
+		return float(np.abs(window).max())
+
+# ***info***
+# Desktop oscilloscope
+# Raw samples come from the shared AudioService ring buffer on every analysis frame,
+# ScopeEngine triggers and decimates them, paintEvent is one drawPolyline call
+# **********
+class Widget(AudioVisualizer):
+	def __init__(self, parent = None):
+		super().__init__(parent, "Desktop.Oscilloscope", OSCILLOSCOPE_SCHEMA, __file__)
+		self.setObjectName("OscilloscopeWidget")
+
+		self.engine = None
+		self.pen = None
+		# Silence is painted once
+		self.silent = False
+
+		self.Updater()
+
+	def ApplySettings(self, settings):
+		self.engine = ScopeEngine(
+			windowMs = settings.window_ms,
+			triggerLevel = settings.trigger_level,
+			hysteresis = settings.hysteresis,
+			triggerPosition = settings.trigger_position,
+			trigger = settings.trigger
+		)
+		# Lines wider than 1 px are several times slower to rasterize
+		self.pen = QPen(settings.line_color.qcolor, settings.line_width)
+		self.pen.setCosmetic(settings.line_width <= 1)
+		self.silent = False
+
+		self.setGeometry(settings.x, settings.y, settings.width, settings.height)
+
+	def OnAudioFrame(self, frame):
+		if self.engine is None or not self.isVisible():
+			return
+
+		with profiler.Span("desktop.oscilloscope.process"):
+			self.engine.Resize(frame.sampleRate, self.width())
+			if GetAudioService().ReadSamples(self.engine.samples) is None:
+				return
+			peak = self.engine.Process(self.height(), self.settings.gain)
+
+		silent = peak < SILENCE_LEVEL
+		if silent and self.silent:
+			return
+		self.silent = silent
+		self.update()
+
+	def paintEvent(self, event):
+		if self.engine is None or not len(self.engine.points):
+			return
+		frameStart = profiler.StartFrame()
+
+		painter = QPainter(self)
+		painter.setRenderHint(QPainter.RenderHint.Antialiasing, self.settings.antialiasing)
+		painter.setPen(self.pen)
+		painter.drawPolyline(self.engine.polygon)
+		painter.end()
+
+		profiler.EndFrame("desktop.oscilloscope", frameStart)